@@ -9,6 +9,6 @@ Taiga Python API library
 __version__ = "1.3.4.dev1"
 __author__ = "Nephila"
 __license__ = "MIT"
-__all__ = ["TaigaAPI"]
+__all__ = ["AsyncTaigaAPI", "TaigaAPI"]
 
-from .client import TaigaAPI
+from .client import AsyncTaigaAPI, TaigaAPI
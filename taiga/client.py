@@ -1,5 +1,3 @@
-import json
-
 try:
     import requests
     from requests.exceptions import RequestException
@@ -9,6 +7,7 @@ except ImportError:  # pragma: no cover
 
 from . import exceptions, utils
 from .models import (
+    AsyncHistory,
     Epics,
     History,
     IssueAttachments,
@@ -36,7 +35,15 @@ from .models import (
     WikiLinks,
     WikiPages,
 )
-from .requestmaker import RequestMaker
+from .models.base import IdentityMap, async_resource
+from .requestmaker import (
+    AsyncRequestMaker,
+    Credentials,
+    RequestCache,
+    RequestMaker,
+    create_async_session,
+    create_session,
+)
 
 
 class SearchResult:
@@ -58,8 +65,33 @@ class TaigaAPI:
     :param tls_verify: verify server certificate
     :param auth_type: authentication type identifier
     :param proxies: a dictionary of proxies to use for requests
+    :param pool_connections: number of per-host connection pools to cache
+    :param pool_maxsize: maximum number of connections kept open per host
+    :param pool_block: block when the pool is exhausted instead of opening throw-away connections
+    :param keep_alive: reuse connections between requests
+    :param max_workers: number of pages fetched concurrently when listing resources
+    :param cache_reference_data: cache statuses, priorities, severities, points, roles and types
+    :param cache: the :class:`taiga.requestmaker.RequestCache` used for cached requests
+    :param retry: the :class:`taiga.requestmaker.RetryPolicy` of the requests (no retries by default)
+    :param rate_limiter: the :class:`taiga.requestmaker.RateLimiter` throttling the requests
+    :param identity_map: parse each object once, reusing and refreshing its instance
+                         (see :class:`taiga.models.base.IdentityMap`)
+
+    All the resources share a single pooled HTTP session and the credentials, which
+    are kept across authentication and token refresh; after :py:meth:`auth` an expired
+    token is refreshed automatically and the rejected request is sent again.
+    Call :py:meth:`close` (or use the client as a context manager) to release the
+    connections.
+
+    A client can be shared by many threads: the cache, the rate limiter and the
+    deduplication of in-flight requests are thread safe, and a token refresh swaps
+    the credentials of the existing resources at once instead of replacing them.
+    Raise ``pool_maxsize`` to the number of threads to keep all their connections alive.
     """
 
+    #: Class of the request maker shared by the resources
+    request_maker_class = RequestMaker
+
     def __init__(
         self,
         host="https://api.taiga.io",
@@ -68,49 +100,146 @@ class TaigaAPI:
         tls_verify=True,
         auth_type="normal",
         proxies=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        max_workers=1,
+        cache_reference_data=False,
+        cache=None,
+        retry=None,
+        rate_limiter=None,
+        identity_map=False,
+    ):
+        if not tls_verify:
+            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+        self._setup(
+            create_session(pool_connections, pool_maxsize, pool_block, keep_alive),
+            host,
+            token,
+            token_type,
+            tls_verify,
+            auth_type,
+            proxies,
+            max_workers,
+            cache_reference_data,
+            cache,
+            retry,
+            rate_limiter,
+            identity_map,
+        )
+
+    def _setup(
+        self,
+        session,
+        host,
+        token,
+        token_type,
+        tls_verify,
+        auth_type,
+        proxies,
+        max_workers,
+        cache_reference_data,
+        cache,
+        retry,
+        rate_limiter,
+        identity_map,
     ):
+        # settings shared by the sync and asyncio clients
+        self.session = session
         self.host = host
         self.token = token
         self.token_refresh = None
         self.token_type = token_type
+        self.credentials = Credentials(token, token_type, refresh=self._renew_token)
         self.tls_verify = tls_verify
         self.auth_type = auth_type
         self.proxies = proxies
-        if not self.tls_verify:
-            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+        self.max_workers = max_workers
+        self.cache_reference_data = cache_reference_data
+        self.cache = cache if cache is not None else RequestCache()
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.identity_map = IdentityMap() if identity_map else None
         if token:
-            self.raw_request = RequestMaker(
-                "/api/v1", self.host, self.token, self.token_type, self.tls_verify, proxies=proxies
-            )
+            self.raw_request = self._request_maker(self.token_type)
+            self._init_resources()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the HTTP session and release the pooled connections
+        """
+        if hasattr(self, "raw_request"):
+            self.raw_request.close()
+        self.session.close()
+
+    def _request_maker(self, token_type):
+        return self.request_maker_class(
+            "/api/v1",
+            self.host,
+            self.token,
+            token_type,
+            self.tls_verify,
+            proxies=self.proxies,
+            session=self.session,
+            max_workers=self.max_workers,
+            cache_reference_data=self.cache_reference_data,
+            cache=self.cache,
+            retry=self.retry,
+            rate_limiter=self.rate_limiter,
+            credentials=self.credentials,
+            identity_map=self.identity_map,
+        )
+
+    def _resource(self, resource_class):
+        return resource_class(self.raw_request)
+
+    def _set_credentials(self, token_type):
+        # the request maker is kept once created, so resources and models already
+        # handed out keep working and switch to the new token atomically
+        self.credentials.set(self.token, token_type)
+        if not hasattr(self, "raw_request"):
+            self.raw_request = self._request_maker(token_type)
             self._init_resources()
 
+    def _renew_token(self):
+        # called by the request makers when the token is rejected
+        if self.token_refresh:
+            self.refresh_token()
+
     def _init_resources(self):
-        self.projects = Projects(self.raw_request)
-        self.user_stories = UserStories(self.raw_request)
-        self.user_story_attachments = UserStoryAttachments(self.raw_request)
-        self.users = Users(self.raw_request)
-        self.swimlanes = SwimLanes(self.raw_request)
-        self.issues = Issues(self.raw_request)
-        self.issue_attachments = IssueAttachments(self.raw_request)
-        self.tasks = Tasks(self.raw_request)
-        self.task_attachments = TaskAttachments(self.raw_request)
-        self.milestones = Milestones(self.raw_request)
-        self.severities = Severities(self.raw_request)
-        self.roles = Roles(self.raw_request)
-        self.points = Points(self.raw_request)
-        self.issue_statuses = IssueStatuses(self.raw_request)
-        self.issue_types = IssueTypes(self.raw_request)
-        self.issue_attributes = IssueAttributes(self.raw_request)
-        self.task_attributes = TaskAttributes(self.raw_request)
-        self.user_story_attributes = UserStoryAttributes(self.raw_request)
-        self.task_statuses = TaskStatuses(self.raw_request)
-        self.priorities = Priorities(self.raw_request)
-        self.user_story_statuses = UserStoryStatuses(self.raw_request)
-        self.wikipages = WikiPages(self.raw_request)
-        self.wikilinks = WikiLinks(self.raw_request)
+        self.projects = self._resource(Projects)
+        self.user_stories = self._resource(UserStories)
+        self.user_story_attachments = self._resource(UserStoryAttachments)
+        self.users = self._resource(Users)
+        self.swimlanes = self._resource(SwimLanes)
+        self.issues = self._resource(Issues)
+        self.issue_attachments = self._resource(IssueAttachments)
+        self.tasks = self._resource(Tasks)
+        self.task_attachments = self._resource(TaskAttachments)
+        self.milestones = self._resource(Milestones)
+        self.severities = self._resource(Severities)
+        self.roles = self._resource(Roles)
+        self.points = self._resource(Points)
+        self.issue_statuses = self._resource(IssueStatuses)
+        self.issue_types = self._resource(IssueTypes)
+        self.issue_attributes = self._resource(IssueAttributes)
+        self.task_attributes = self._resource(TaskAttributes)
+        self.user_story_attributes = self._resource(UserStoryAttributes)
+        self.task_statuses = self._resource(TaskStatuses)
+        self.priorities = self._resource(Priorities)
+        self.user_story_statuses = self._resource(UserStoryStatuses)
+        self.wikipages = self._resource(WikiPages)
+        self.wikilinks = self._resource(WikiLinks)
         self.history = History(self.raw_request)
-        self.webhooks = Webhooks(self.raw_request)
-        self.epics = Epics(self.raw_request)
+        self.webhooks = self._resource(Webhooks)
+        self.epics = self._resource(Epics)
 
     def me(self):
         """
@@ -126,7 +255,7 @@ class TaigaAPI:
         :param text: the query of your search
         """
         result = self.raw_request.get("search", query={"project": project, "text": text})
-        result = result.json()
+        result = utils.json_response(result)
         search_result = SearchResult()
         search_result.count = result["count"]
         search_result.tasks = self.tasks.parse_list(result["tasks"])
@@ -143,23 +272,11 @@ class TaigaAPI:
         :param username: your username
         :param password: your password
         """
-        headers = {"Content-type": "application/json"}
         payload = {"type": self.auth_type, "username": username, "password": password}
-        try:
-            full_url = utils.urljoin(self.host, "/api/v1/auth")
-            response = requests.post(
-                full_url, data=json.dumps(payload), headers=headers, verify=self.tls_verify, proxies=self.proxies
-            )
-        except RequestException:
-            raise exceptions.TaigaRestException(full_url, 400, "NETWORK ERROR", "POST")
-        if response.status_code != 200:
-            raise exceptions.TaigaRestException(full_url, response.status_code, response.text, "POST")
-        self.token = response.json()["auth_token"]
-        self.token_refresh = response.json()["refresh"]
-        self.raw_request = RequestMaker(
-            "/api/v1", self.host, self.token, "Bearer", self.tls_verify, proxies=self.proxies
-        )
-        self._init_resources()
+        response = self._auth_request("/api/v1/auth", payload)
+        self.token = response["auth_token"]
+        self.token_refresh = response["refresh"]
+        self._set_credentials("Bearer")
 
     def auth_app(self, app_id, app_secret, auth_code, state=""):
         """
@@ -169,42 +286,46 @@ class TaigaAPI:
         :param app_secret: the app secret
         :param auth_code: the app auth code
         """
-        headers = {"Content-type": "application/json"}
+        path = "/api/v1/application-tokens/validate"
         payload = {"application": app_id, "auth_code": auth_code, "state": state}
+        self.token = self._app_token(self._auth_request(path, payload), app_secret)
+        if self.token is None:
+            raise exceptions.TaigaRestException(utils.urljoin(self.host, path), 400, "INVALID TOKEN", "POST")
+
+        self._set_credentials("Application")
+
+    def _auth_request(self, path, payload):
+        # authentication requests go through the pooled session, without the credentials
+        headers = {"Content-type": "application/json"}
         try:
-            full_url = utils.urljoin(self.host, "/api/v1/application-tokens/validate")
-            response = requests.post(
-                full_url, data=json.dumps(payload), headers=headers, verify=self.tls_verify, proxies=self.proxies
+            full_url = utils.urljoin(self.host, path)
+            response = self.session.post(
+                full_url, data=utils.json_dumps(payload), headers=headers, verify=self.tls_verify, proxies=self.proxies
             )
         except RequestException:
             raise exceptions.TaigaRestException(full_url, 400, "NETWORK ERROR", "POST")
         if response.status_code != 200:
             raise exceptions.TaigaRestException(full_url, response.status_code, response.text, "POST")
-        cyphered_token = response.json().get("cyphered_token", "")
-        if cyphered_token:
-            from jwkest.jwe import JWE
-            from jwkest.jwk import SYMKey
-
-            sym_key = SYMKey(key=app_secret, alg="A128KW")
-            data, success = JWE().decrypt(cyphered_token, keys=[sym_key]), True
-            if isinstance(data, tuple):
-                data, success = data
-            try:
-                self.token = json.loads(data.decode("utf-8")).get("token", None)
-            except ValueError:  # pragma: no cover
-                self.token = None
-            if not success:
-                self.token = None
-        else:
-            self.token = None
+        return utils.json_response(response)
 
-        if self.token is None:
-            raise exceptions.TaigaRestException(full_url, 400, "INVALID TOKEN", "POST")
+    @staticmethod
+    def _app_token(response, app_secret):
+        # decrypt the token of an application validation response (None if invalid)
+        cyphered_token = response.get("cyphered_token", "")
+        if not cyphered_token:
+            return None
+        from jwkest.jwe import JWE
+        from jwkest.jwk import SYMKey
 
-        self.raw_request = RequestMaker(
-            "/api/v1", self.host, self.token, "Application", self.tls_verify, proxies=self.proxies
-        )
-        self._init_resources()
+        sym_key = SYMKey(key=app_secret, alg="A128KW")
+        data, success = JWE().decrypt(cyphered_token, keys=[sym_key]), True
+        if isinstance(data, tuple):
+            data, success = data
+        try:
+            token = utils.json_loads(data).get("token", None)
+        except ValueError:  # pragma: no cover
+            token = None
+        return token if success else None
 
     def refresh_token(self, token_refresh=""):
         """
@@ -219,20 +340,176 @@ class TaigaAPI:
                 token_refresh = self.token_refresh
             else:
                 raise ValueError("Refresh token not set")
+        response = self._auth_request("/api/v1/auth/refresh", {"refresh": token_refresh})
+        self.token = response["auth_token"]
+        self.token_refresh = response["refresh"]
+        self._set_credentials("Bearer")
+
+
+class AsyncTaigaAPI(TaigaAPI):
+    """
+    Asyncio flavour of :class:`TaigaAPI`
+
+    Resources expose awaitable ``list``, ``get``, ``create``, ``update``, ``patch`` and ``delete``
+    methods, and :py:meth:`auth`, :py:meth:`refresh_token` and :py:meth:`search` are coroutines.
+    Requests are sent through a pooled :class:`httpx.AsyncClient`, so many of them can be in flight
+    at once on the same event loop.
+
+    Requires the optional ``httpx`` dependency (``pip install python-taiga[async]``).
+
+    :param host: the host of your Taiga.io instance
+    :param token: the token you may provide
+    :param token_type: the token type
+    :param tls_verify: verify server certificate
+    :param auth_type: authentication type identifier
+    :param proxies: a dictionary of proxies to use for requests
+    :param max_connections: maximum number of concurrent connections
+    :param max_keepalive_connections: maximum number of idle connections kept alive
+    :param max_workers: number of pages fetched concurrently when listing resources
+    :param cache_reference_data: cache statuses, priorities, severities, points, roles and types
+    :param cache: the :class:`taiga.requestmaker.RequestCache` used for cached requests
+    :param retry: the :class:`taiga.requestmaker.RetryPolicy` of the requests (no retries by default)
+    :param rate_limiter: the :class:`taiga.requestmaker.RateLimiter` throttling the requests
+    :param identity_map: parse each object once, reusing and refreshing its instance
+                         (see :class:`taiga.models.base.IdentityMap`)
+    """
+
+    request_maker_class = AsyncRequestMaker
+
+    def __init__(
+        self,
+        host="https://api.taiga.io",
+        token=None,
+        token_type="Bearer",
+        tls_verify=True,
+        auth_type="normal",
+        proxies=None,
+        max_connections=100,
+        max_keepalive_connections=20,
+        max_workers=1,
+        cache_reference_data=False,
+        cache=None,
+        retry=None,
+        rate_limiter=None,
+        identity_map=False,
+    ):
+        self._setup(
+            create_async_session(tls_verify, proxies, max_connections, max_keepalive_connections),
+            host,
+            token,
+            token_type,
+            tls_verify,
+            auth_type,
+            proxies,
+            max_workers,
+            cache_reference_data,
+            cache,
+            retry,
+            rate_limiter,
+            identity_map,
+        )
+
+    def __enter__(self):
+        raise TypeError("Use 'async with AsyncTaigaAPI()' instead")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the HTTP session and release the pooled connections
+        """
+        if hasattr(self, "raw_request"):
+            await self.raw_request.close()
+        await self.session.aclose()
+
+    def _resource(self, resource_class):
+        return async_resource(resource_class)(self.raw_request)
+
+    def _init_resources(self):
+        super()._init_resources()
+        self.history = AsyncHistory(self.raw_request)
+
+    async def _renew_token(self):
+        if self.token_refresh:
+            await self.refresh_token()
+
+    async def _auth_request(self, path, payload):
+        import httpx
+
         headers = {"Content-type": "application/json"}
-        payload = {"refresh": token_refresh}
         try:
-            full_url = utils.urljoin(self.host, "/api/v1/auth/refresh")
-            response = requests.post(
-                full_url, data=json.dumps(payload), headers=headers, verify=self.tls_verify, proxies=self.proxies
-            )
-        except RequestException:
+            full_url = utils.urljoin(self.host, path)
+            response = await self.session.post(full_url, content=utils.json_dumps(payload), headers=headers)
+        except httpx.RequestError:
             raise exceptions.TaigaRestException(full_url, 400, "NETWORK ERROR", "POST")
         if response.status_code != 200:
             raise exceptions.TaigaRestException(full_url, response.status_code, response.text, "POST")
-        self.token = response.json()["auth_token"]
-        self.token_refresh = response.json()["refresh"]
-        self.raw_request = RequestMaker(
-            "/api/v1", self.host, self.token, "Bearer", self.tls_verify, proxies=self.proxies
-        )
-        self._init_resources()
+        return utils.json_response(response)
+
+    async def search(self, project, text=""):
+        """
+        Search in your Taiga.io instance
+
+        :param project: the project id
+        :param text: the query of your search
+        """
+        result = await self.raw_request.get("search", query={"project": project, "text": text})
+        result = utils.json_response(result)
+        search_result = SearchResult()
+        search_result.count = result["count"]
+        search_result.tasks = self.tasks.parse_list(result["tasks"])
+        search_result.issues = self.issues.parse_list(result["issues"])
+        search_result.user_stories = self.user_stories.parse_list(result["userstories"])
+        search_result.wikipages = self.wikipages.parse_list(result["wikipages"])
+        search_result.epics = self.epics.parse_list(result["epics"])
+        return search_result
+
+    async def auth(self, username, password):
+        """
+        Authenticate you
+
+        :param username: your username
+        :param password: your password
+        """
+        payload = {"type": self.auth_type, "username": username, "password": password}
+        response = await self._auth_request("/api/v1/auth", payload)
+        self.token = response["auth_token"]
+        self.token_refresh = response["refresh"]
+        self._set_credentials("Bearer")
+
+    async def auth_app(self, app_id, app_secret, auth_code, state=""):
+        """
+        Authenticate an app
+
+        :param app_id: the app id
+        :param app_secret: the app secret
+        :param auth_code: the app auth code
+        """
+        path = "/api/v1/application-tokens/validate"
+        payload = {"application": app_id, "auth_code": auth_code, "state": state}
+        self.token = self._app_token(await self._auth_request(path, payload), app_secret)
+        if self.token is None:
+            raise exceptions.TaigaRestException(utils.urljoin(self.host, path), 400, "INVALID TOKEN", "POST")
+        self._set_credentials("Application")
+
+    async def refresh_token(self, token_refresh=""):
+        """
+        Refresh auth token.
+
+        Passing a token_refresh will use passed token, otherwise it will try to use self.token_refresh.
+
+        :param token_refresh: the refresh token to be used to refresh api token
+        """
+        if not token_refresh:
+            if self.token_refresh:
+                token_refresh = self.token_refresh
+            else:
+                raise ValueError("Refresh token not set")
+        response = await self._auth_request("/api/v1/auth/refresh", {"refresh": token_refresh})
+        self.token = response["auth_token"]
+        self.token_refresh = response["refresh"]
+        self._set_credentials("Bearer")
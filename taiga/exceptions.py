@@ -1,4 +1,4 @@
-import json
+from . import utils
 
 
 class TaigaException(Exception):  # noqa: N818
@@ -11,7 +11,7 @@ class TaigaRestException(TaigaException):  # noqa: N818
         self.status_code = status_code
         self.method = method
         try:
-            json_message = json.loads(message)
+            json_message = utils.json_loads(message)
             if "_error_message" in json_message:
                 message = json_message["_error_message"]
         except ValueError:
@@ -1,4 +1,5 @@
 from .models import (
+    AsyncHistory,
     Epic,
     EpicAttribute,
     EpicAttributes,
@@ -101,6 +102,7 @@ __all__ = [
     "WikiPages",
     "WikiLink",
     "WikiLinks",
+    "AsyncHistory",
     "History",
     "IssueAttribute",
     "IssueAttributes",
@@ -1,26 +1,334 @@
+import asyncio
+import datetime
+import functools
+import operator
 import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import utils
+
+_MISSING = object()
+
+
+def _contains(attr, value):
+    if attr is None or attr is _MISSING:
+        return False
+    if isinstance(attr, list):
+        # tags are lists of [name, color] pairs
+        return any(item == value or (isinstance(item, list) and item and item[0] == value) for item in attr)
+    return value in attr
+
+
+def _compare(compare):
+    def predicate(value):
+        if isinstance(value, str):
+            value = parse_date(value, date_only=_DATE_RE.match(value) is not None)
+        compare_dates = isinstance(value, datetime.date) and not isinstance(value, datetime.datetime)
+
+        def matches(attr):
+            if attr is None or attr is _MISSING:
+                return False
+            if compare_dates and isinstance(attr, datetime.datetime):
+                attr = attr.date()
+            try:
+                return compare(attr, value)
+            except TypeError:
+                return False
+
+        return matches
+
+    return predicate
+
+
+def _is_true(value):
+    if isinstance(value, str):
+        return value.lower() in ("true", "1")
+    return bool(value)
+
+
+def _in(values):
+    values = list(values)
+    try:
+        values = frozenset(values)
+    except TypeError:
+        pass
+
+    def predicate(attr):
+        try:
+            return attr in values
+        except TypeError:
+            return attr in list(values)
+
+    return predicate
+
+
+def _isnull(value):
+    if _is_true(value):
+        return lambda attr: attr is None or attr is _MISSING
+    return lambda attr: attr is not None and attr is not _MISSING
+
+
+#: Lookups of :py:meth:`SearchableList.filter`, returning a predicate on the attribute
+#: value (``_MISSING`` when the object doesn't have it) for the queried value
+LOOKUPS = {
+    "exact": lambda value: lambda attr: attr is not _MISSING and attr == value,
+    "in": _in,
+    "contains": lambda value: lambda attr: _contains(attr, value),
+    "icontains": lambda value: lambda attr: isinstance(attr, str) and value.lower() in attr.lower(),
+    "startswith": lambda value: lambda attr: isinstance(attr, str) and attr.startswith(value),
+    "gt": _compare(operator.gt),
+    "gte": _compare(operator.ge),
+    "lt": _compare(operator.lt),
+    "lte": _compare(operator.le),
+    "isnull": _isnull,
+}
+
+
+def split_lookup(key):
+    """
+    Split a query key into the attribute name and the lookup (``exact`` if not given)
+
+    :param key: query key, e.g. ``status__in``
+    """
+    name, _, lookup = key.rpartition("__")
+    if name and lookup in LOOKUPS:
+        return name, lookup
+    return key, "exact"
+
+
+def _query_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return ",".join(str(item) for item in value)
+    return value
+
+
+def _dropping_indexes(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._indexes = None
+        return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class SearchableList(list):
+    """
+    List of model instances which can be searched by their attributes
+
+    Queries match the attributes by equality, or with the lookup appended to the attribute
+    name (as in ``status__in=[1, 2]``): ``exact``, ``in``, ``contains`` (substrings, list items
+    and tag names), ``icontains``, ``startswith``, ``gt``, ``gte``, ``lt``, ``lte`` (``None``
+    never matches) and ``isnull``.
+
+    Hash indexes of the attributes used in :py:meth:`get` and :py:meth:`filter` queries are built
+    on first use and reused by the following queries; they are updated by :py:meth:`append` and
+    :py:meth:`extend` and dropped by the other changes of the list. Changes of the attributes of the
+    objects already in the list are not tracked: call :py:meth:`reindex` after them.
+    """
+
+    _indexes = None
+
+    def _index(self, key):
+        """
+        Get the index of ``key`` (``None`` if values can't be hashed), building it if missing
+        """
+        if self._indexes is None:
+            self._indexes = {}
+        try:
+            return self._indexes[key]
+        except KeyError:
+            pass
+        index = {}
+        try:
+            for obj in self:
+                value = getattr(obj, key, _MISSING)
+                if value is not _MISSING:
+                    index.setdefault(value, []).append(obj)
+        except TypeError:
+            index = None
+        self._indexes[key] = index
+        return index
+
+    def _add_to_indexes(self, objs):
+        for key, index in list(self._indexes.items()):
+            if index is None:
+                continue
+            try:
+                for obj in objs:
+                    value = getattr(obj, key, _MISSING)
+                    if value is not _MISSING:
+                        index.setdefault(value, []).append(obj)
+            except TypeError:
+                self._indexes[key] = None
+
+    def _candidates(self, query):
+        """
+        Get the smallest bucket of indexed objects matching one of the exact query values
+        (the whole list when the query can't use an index)
+        """
+        candidates = self
+        for key, value in query.items():
+            index = self._index(key)
+            if index is None:
+                continue
+            try:
+                bucket = index.get(value, ())
+            except TypeError:
+                continue
+            if len(bucket) < len(candidates):
+                candidates = bucket
+                if not candidates:
+                    break
+        return candidates
+
+    @staticmethod
+    def _compile(query):
+        """
+        Turn a query into the exact values to look up in the indexes and the
+        predicates to check on the attributes
+        """
+        exact = {}
+        predicates = []
+        for key, value in query.items():
+            name, lookup = split_lookup(key)
+            if lookup == "exact":
+                exact[name] = value
+            predicates.append((name, LOOKUPS[lookup](value)))
+        return exact, predicates
+
+    def _search(self, query):
+        exact, predicates = self._compile(query)
+        for obj in self._candidates(exact) if exact else self:
+            # objects in the index are checked again, as their attributes may have changed
+            for name, predicate in predicates:
+                if not predicate(getattr(obj, name, _MISSING)):
+                    break
+            else:
+                yield obj
+
     def get(self, **query):
-        for obj in self:
-            ok_obj = True
-            for key, value in query.items():
-                if key not in obj.__dict__ or obj.__dict__[key] != value:
-                    ok_obj = False
-            if ok_obj:
-                return obj
+        """
+        Get the first object matching the query (``None`` if there's none)
+        """
+        return next(self._search(query), None)
 
     def filter(self, **query):  # noqa: A003
-        result_objs = []
-        for obj in self:
-            ok_obj = True
-            for key, value in query.items():
-                if key not in obj.__dict__ or obj.__dict__[key] != value:
-                    ok_obj = False
-            if ok_obj:
-                result_objs.append(obj)
-        return result_objs
+        """
+        Get the objects matching the query
+        """
+        return SearchableList(self._search(query))
+
+    def exists(self, **query):
+        """
+        Check if any object matches the query
+        """
+        return next(self._search(query), _MISSING) is not _MISSING
+
+    def count(self, *value, **query):
+        """
+        Count the objects matching the query
+
+        As for lists, ``count(value)`` counts the occurrences of ``value``.
+        """
+        if value:
+            return super().count(*value)
+        if not query:
+            return len(self)
+        return sum(1 for obj in self._search(query))
+
+    def first(self):
+        """
+        Get the first object (``None`` if the list is empty)
+        """
+        return self[0] if self else None
+
+    def order_by(self, *keys):
+        """
+        Get the objects sorted by the given attributes
+
+        Prefix an attribute with ``-`` to sort in descending order. Objects where the
+        attribute is ``None`` or missing come last.
+
+        :param keys: attribute names
+        """
+        objs = list(self)
+        for key in reversed(keys):
+            descending = key.startswith("-")
+            name = key.lstrip("-")
+
+            def sort_key(obj, name=name, descending=descending):
+                value = getattr(obj, name, None)
+                if value is None:
+                    return (not descending,)
+                return (descending, value)
+
+            objs.sort(key=sort_key, reverse=descending)
+        return SearchableList(objs)
+
+    def index_by(self, key):
+        """
+        Get a dictionary of the objects by the value of their ``key`` attribute
+
+        The first object is kept when more objects have the same value; objects without
+        the attribute are left out.
+        """
+        index = self._index(key)
+        if index is None:
+            raise TypeError("Values of {} can't be indexed".format(key))
+        return {value: objs[0] for value, objs in index.items()}
+
+    def group_by(self, key):
+        """
+        Get a dictionary of the lists of objects by the value of their ``key`` attribute
+
+        Objects without the attribute are left out.
+        """
+        index = self._index(key)
+        if index is None:
+            raise TypeError("Values of {} can't be indexed".format(key))
+        return {value: SearchableList(objs) for value, objs in index.items()}
+
+    def reindex(self):
+        """
+        Drop the indexes, to have them built again from the current objects attributes
+        """
+        self._indexes = None
+
+    def append(self, obj):
+        super().append(obj)
+        if self._indexes:
+            self._add_to_indexes((obj,))
+
+    def extend(self, objs):
+        if self._indexes:
+            objs = list(objs)
+        super().extend(objs)
+        if self._indexes:
+            self._add_to_indexes(objs)
+
+    def __iadd__(self, objs):
+        self.extend(objs)
+        return self
+
+    insert = _dropping_indexes(list.insert)
+    remove = _dropping_indexes(list.remove)
+    pop = _dropping_indexes(list.pop)
+    clear = _dropping_indexes(list.clear)
+    sort = _dropping_indexes(list.sort)
+    reverse = _dropping_indexes(list.reverse)
+    __setitem__ = _dropping_indexes(list.__setitem__)
+    __delitem__ = _dropping_indexes(list.__delitem__)
+    __imul__ = _dropping_indexes(list.__imul__)
+
+    def __getstate__(self):
+        # indexes are not copied along with the objects
+        return None
 
 
 class Resource:
@@ -36,18 +344,39 @@ class ListResource(Resource):
     :param requester: :class:`Requester` instance
     """
 
-    def list(self, pagination=True, page_size=None, page=None, **queryparams):  # noqa: A003
+    #: Lookups of :py:meth:`list` (see :class:`SearchableList`) applied by the server, mapped to
+    #: their query parameter; the other lookups are applied on the retrieved objects
+    server_lookups = {}
+
+    #: Resources holding project configuration (statuses, priorities, ...) which
+    #: are cached when the requester has ``cache_reference_data`` enabled
+    reference_data = False
+
+    #: Bytes read at a time when streaming unpaginated lists
+    stream_chunk_size = 64 * 1024
+
+    #: Objects created by each request of the ``bulk_create`` methods
+    bulk_chunk_size = 100
+
+    def list(  # noqa: A003
+        self, pagination=True, page_size=None, page=None, max_workers=None, cache=None, **queryparams
+    ):
         """
         Retrieves a list of objects.
 
-        By default uses local cache and remote pagination
+        By default uses remote pagination
 
         If pagination is used and no page is requested (the default), all the
         remote objects are retrieved and appended in a single list.
 
+        If more than one worker is allowed, the first page is requested with
+        the total count of objects and the remaining pages are fetched
+        concurrently; if the server does not return the count, pages are
+        fetched one after another.
+
         If pagination is disabled, all the objects are fetched from the
         endpoint and returned. This may trigger some parsing error if the
-        result set is very large.
+        result set is very large: see :py:meth:`iter` to stream them instead.
 
         :param pagination: Use pagination (default: `True`)
         :param page_size: Size of the pagination page (default: `100`).
@@ -55,10 +384,184 @@ class ListResource(Resource):
                           default value
         :param page: Page number to retrieve (default: `None`). Ignored if
                      `pagination` is `False`
+        :param max_workers: Number of pages fetched concurrently (default:
+                            the requester ``max_workers``). Ignored if
+                            `pagination` is `False` or `page` is set
+        :param cache: Serve the pages from the requester cache (default:
+                      only for reference data, if enabled on the requester)
         :param queryparams: Additional filter parameters as accepted by the
-                            remote API
+                            remote API, and lookups on the objects attributes
+                            (e.g. ``status__in=[1, 2]``, see :class:`SearchableList`):
+                            those in :py:attr:`server_lookups` are sent to the server,
+                            the others filter the retrieved objects
         :return: <SearchableList>
         """
+        queryparams, lookups, max_workers, cache_kwargs, first_page = self._list_plan(
+            pagination, page_size, page, max_workers, cache, queryparams
+        )
+        result = self.requester.get(self.instance.endpoint, **first_page)
+        objects = self.parse_list(utils.json_response(result))
+        pages = self._remaining_pages(result, len(objects), max_workers)
+        if pages:
+            get_page = functools.partial(self._get_page, queryparams, cache_kwargs)
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pages))) as executor:
+                for entries in executor.map(get_page, pages):
+                    objects.extend(entries)
+        elif pages is None and not page:
+            next_page = 2
+            while self._has_next_page(result):
+                result = self.requester.get(
+                    self.instance.endpoint, query=self._page_query(queryparams, next_page), **cache_kwargs
+                )
+                objects.extend(self.parse_list(utils.json_response(result)))
+                next_page += 1
+        return objects.filter(**lookups) if lookups else objects
+
+    def iter(self, page_size=None, pagination=True, **queryparams):  # noqa: A003
+        """
+        Iterates over the objects, one page at a time.
+
+        Unlike :py:meth:`list`, objects are parsed and yielded as the pages
+        are consumed, so only one page (plus the next one, fetched in the
+        background while the current one is processed) is kept in memory.
+
+        If pagination is disabled, all the objects are fetched with a single
+        request and yielded while the response is being received, one array
+        item at a time.
+
+        :param page_size: Size of the pagination page (default: `100`).
+                          Any non numeric value will be casted to the
+                          default value
+        :param pagination: Use pagination (default: `True`)
+        :param queryparams: Additional filter parameters as accepted by the
+                            remote API
+        :return: generator of model instances
+        """
+        if not pagination:
+            with self.requester.stream(self.instance.endpoint, query=queryparams) as response:
+                for entry in utils.iter_json_array(response.iter_content(chunk_size=self.stream_chunk_size)):
+                    yield self.instance.parse(self.requester, entry)
+            return
+        queryparams = self._list_query(True, page_size, None, queryparams)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.requester.get, self.instance.endpoint, query=queryparams, paginate=True)
+            next_page = 2
+            while future:
+                result = future.result()
+                if self._has_next_page(result):
+                    pageparams = self._page_query(queryparams, next_page)
+                    future = executor.submit(self.requester.get, self.instance.endpoint, query=pageparams)
+                    next_page += 1
+                else:
+                    future = None
+                for entry in utils.json_response(result) or []:
+                    yield self.instance.parse(self.requester, entry)
+
+    def _list_workers(self, pagination, page, max_workers):
+        if not pagination or page:
+            return 1
+        if max_workers is None:
+            max_workers = self.requester.max_workers
+        return max_workers or 1
+
+    def _list_plan(self, pagination, page_size, page, max_workers, cache, queryparams):
+        # shared by the sync and asyncio lists: the query, the lookups applied on the retrieved
+        # objects, the pages fetched at once, the cache arguments and the request of the first page
+        queryparams, lookups = self._split_lookups(queryparams)
+        queryparams = self._list_query(pagination, page_size, page, queryparams)
+        max_workers = self._list_workers(pagination, page, max_workers)
+        cache_kwargs = self._cache_kwargs(cache)
+        if max_workers > 1:
+            first_page = dict(query=queryparams, paginate=True, lazy=False, **cache_kwargs)
+        else:
+            first_page = dict(query=queryparams, paginate=pagination, **cache_kwargs)
+        return queryparams, lookups, max_workers, cache_kwargs, first_page
+
+    @classmethod
+    def _remaining_pages(cls, response, page_length, max_workers):
+        # pages left after the first one, fetched at once when the count is known (None otherwise)
+        if max_workers > 1 and "X-Pagination-Count" in response.headers:
+            return range(2, cls._page_count(response, page_length) + 1)
+        return None
+
+    @staticmethod
+    def _page_count(response, page_length):
+        count = int(response.headers["X-Pagination-Count"])
+        page_size = int(response.headers.get("X-Paginated-By") or page_length or count or 1)
+        return -(-count // page_size)
+
+    @staticmethod
+    def _has_next_page(response):
+        return bool(response.headers.get("X-Pagination-Next", False))
+
+    @staticmethod
+    def _page_query(queryparams, page):
+        pageparams = queryparams.copy()
+        pageparams["page"] = page
+        return pageparams
+
+    def _get_page(self, queryparams, cache_kwargs, page):
+        result = self.requester.get(self.instance.endpoint, query=self._page_query(queryparams, page), **cache_kwargs)
+        return self.parse_list(utils.json_response(result))
+
+    def _bulk_chunks(self, subjects, chunk_size):
+        subjects = list(subjects)
+        for subject in subjects:
+            if not isinstance(subject, str) or not subject.strip() or "\n" in subject or "\r" in subject:
+                raise ValueError("Invalid subject for bulk creation: {!r}".format(subject))
+        chunk_size = chunk_size or self.bulk_chunk_size
+        return [subjects[start : start + chunk_size] for start in range(0, len(subjects), chunk_size)]
+
+    def _bulk_create(self, field, subjects, payload, chunk_size=None, max_workers=None):
+        """
+        Create objects through the ``bulk_create`` action of the endpoint, which takes
+        their subjects one per line in ``field``
+
+        :param field: payload field holding the subjects
+        :param subjects: subjects of the objects
+        :param payload: the other fields of the payload
+        :param chunk_size: objects created by each request (default: :py:attr:`bulk_chunk_size`)
+        :param max_workers: number of requests sent concurrently (default: the requester ``max_workers``)
+        :return: <SearchableList> of the created objects, in the order of ``subjects``
+        """
+        chunks = self._bulk_chunks(subjects, chunk_size)
+        max_workers = min(self._list_workers(True, None, max_workers), len(chunks))
+
+        def create(chunk):
+            response = self.requester.post(
+                "/{endpoint}/bulk_create",
+                endpoint=self.instance.endpoint,
+                payload=dict(payload, **{field: "\n".join(chunk)}),
+            )
+            return self.parse_list(utils.json_response(response))
+
+        objects = SearchableList()
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for entries in executor.map(create, chunks):
+                    objects.extend(entries)
+        else:
+            for chunk in chunks:
+                objects.extend(create(chunk))
+        return objects
+
+    def _cache_kwargs(self, cache):
+        if cache is None:
+            cache = self.reference_data and self.requester.cache_reference_data
+        return {"cache": True} if cache else {}
+
+    def _split_lookups(self, queryparams):
+        lookups = {}
+        for key in list(queryparams):
+            name, lookup = split_lookup(key)
+            if key in self.server_lookups:
+                queryparams[self.server_lookups[key]] = _query_value(queryparams.pop(key))
+            elif name != key:
+                lookups[key] = queryparams.pop(key)
+        return queryparams, lookups
+
+    @staticmethod
+    def _list_query(pagination, page_size, page, queryparams):
         if page_size and pagination:
             try:
                 page_size = int(page_size)
@@ -67,30 +570,20 @@ class ListResource(Resource):
             queryparams["page_size"] = page_size
         if page and pagination:
             queryparams["page"] = page
-        result = self.requester.get(self.instance.endpoint, query=queryparams, paginate=pagination)
-        objects = SearchableList()
-        objects.extend(self.parse_list(result.json()))
-        if result.headers.get("X-Pagination-Next", False) and not page:
-            next_page = 2
-        else:
-            next_page = None
-        while next_page:
-            pageparams = queryparams.copy()
-            pageparams["page"] = next_page
-            result = self.requester.get(
-                self.instance.endpoint,
-                query=pageparams,
-            )
-            objects.extend(self.parse_list(result.json()))
-            if result.headers.get("X-Pagination-Next", False):
-                next_page += 1
-            else:
-                next_page = None
-        return objects
+        return queryparams
 
-    def get(self, resource_id):
-        response = self.requester.get("/{endpoint}/{id}", endpoint=self.instance.endpoint, id=resource_id)
-        return self.instance.parse(self.requester, response.json())
+    def get(self, resource_id, cache=None):
+        """
+        Retrieves a single object.
+
+        :param resource_id: id of the object
+        :param cache: Serve the object from the requester cache (default:
+                      only for reference data, if enabled on the requester)
+        """
+        response = self.requester.get(
+            "/{endpoint}/{id}", endpoint=self.instance.endpoint, id=resource_id, **self._cache_kwargs(cache)
+        )
+        return self.instance.parse(self.requester, utils.json_response(response))
 
     def delete(self, resource_id, query=None):
         self.requester.delete("/{endpoint}/{id}", endpoint=self.instance.endpoint, id=resource_id, query=query)
@@ -98,7 +591,10 @@ class ListResource(Resource):
 
     def _new_resource(self, **attrs):
         response = self.requester.post(self.instance.endpoint, **attrs)
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
+
+    def _parse_response(self, response):
+        return self.instance.parse(self.requester, utils.json_response(response))
 
     @classmethod
     def parse(cls, requester, entries):
@@ -118,11 +614,412 @@ class ListResource(Resource):
         return result_entries
 
 
+class AsyncListResource(ListResource):
+    """AsyncListResource model
+
+    Awaitable flavour of :class:`ListResource` (:py:meth:`list`, :py:meth:`get`, :py:meth:`delete`,
+    :py:meth:`update`, :py:meth:`patch` and the ``create``, ``import_`` and ``get_by_*`` methods
+    of the concrete resource).
+
+    It's meant to be combined with a concrete :class:`ListResource` subclass through :py:func:`async_resource`,
+    and to be used with an :class:`AsyncRequestMaker`. Instances are parsed by the same model classes used by
+    the synchronous API, but their own methods (e.g. :py:meth:`InstanceResource.update`) are not awaitable:
+    use the ones of the resource instead.
+
+    :param requester: :class:`AsyncRequestMaker` instance
+    """
+
+    async def list(  # noqa: A003
+        self, pagination=True, page_size=None, page=None, max_workers=None, cache=None, **queryparams
+    ):
+        """
+        Retrieves a list of objects.
+
+        See :py:meth:`ListResource.list` for the meaning of the parameters.
+
+        :return: <SearchableList>
+        """
+        queryparams, lookups, max_workers, cache_kwargs, first_page = self._list_plan(
+            pagination, page_size, page, max_workers, cache, queryparams
+        )
+        result = await self.requester.get(self.instance.endpoint, **first_page)
+        objects = self.parse_list(utils.json_response(result))
+        pages = self._remaining_pages(result, len(objects), max_workers)
+        if pages:
+            semaphore = asyncio.Semaphore(max_workers)
+
+            async def get_page(page):
+                async with semaphore:
+                    return await self._get_page(queryparams, cache_kwargs, page)
+
+            for entries in await asyncio.gather(*(get_page(page) for page in pages)):
+                objects.extend(entries)
+        elif pages is None and not page:
+            next_page = 2
+            while self._has_next_page(result):
+                result = await self.requester.get(
+                    self.instance.endpoint, query=self._page_query(queryparams, next_page), **cache_kwargs
+                )
+                objects.extend(self.parse_list(utils.json_response(result)))
+                next_page += 1
+        return objects.filter(**lookups) if lookups else objects
+
+    async def iter(self, page_size=None, pagination=True, **queryparams):  # noqa: A003
+        """
+        Asynchronously iterates over the objects, one page at a time.
+
+        See :py:meth:`ListResource.iter` for the meaning of the parameters.
+
+        :return: asynchronous generator of model instances
+        """
+        if not pagination:
+            response = await self.requester.stream(self.instance.endpoint, query=queryparams)
+            try:
+                decoder = utils.JSONArrayDecoder()
+                async for chunk in response.aiter_bytes(self.stream_chunk_size):
+                    for entry in decoder.feed(chunk):
+                        yield self.instance.parse(self.requester, entry)
+                for entry in decoder.feed(b"", final=True):
+                    yield self.instance.parse(self.requester, entry)
+            finally:
+                await response.aclose()
+            return
+        queryparams = self._list_query(True, page_size, None, queryparams)
+        task = asyncio.ensure_future(self.requester.get(self.instance.endpoint, query=queryparams, paginate=True))
+        next_page = 2
+        try:
+            while task:
+                result = await task
+                if self._has_next_page(result):
+                    pageparams = self._page_query(queryparams, next_page)
+                    task = asyncio.ensure_future(self.requester.get(self.instance.endpoint, query=pageparams))
+                    next_page += 1
+                else:
+                    task = None
+                for entry in utils.json_response(result) or []:
+                    yield self.instance.parse(self.requester, entry)
+        finally:
+            if task:
+                task.cancel()
+
+    async def _get_page(self, queryparams, cache_kwargs, page):
+        result = await self.requester.get(
+            self.instance.endpoint, query=self._page_query(queryparams, page), **cache_kwargs
+        )
+        return self.parse_list(utils.json_response(result))
+
+    async def get(self, resource_id, cache=None):
+        response = await self.requester.get(
+            "/{endpoint}/{id}", endpoint=self.instance.endpoint, id=resource_id, **self._cache_kwargs(cache)
+        )
+        return self.instance.parse(self.requester, utils.json_response(response))
+
+    async def delete(self, resource_id, query=None):
+        await self.requester.delete("/{endpoint}/{id}", endpoint=self.instance.endpoint, id=resource_id, query=query)
+        return self
+
+    async def update(self, resource, **args):
+        """
+        Update the given :class:`InstanceResource`
+        """
+        self_dict = resource.to_dict()
+        if args:
+            self_dict = dict(list(self_dict.items()) + list(args.items()))
+        response = await self.requester.put(
+            "/{endpoint}/{id}", endpoint=self.instance.endpoint, id=resource.id, payload=self_dict
+        )
+        obj_json = utils.json_response(response)
+        if "version" in obj_json:
+            resource.version = obj_json["version"]
+        resource._clean()
+        return resource
+
+    async def patch(self, resource, fields, **args):
+        """
+        Patch the given :class:`InstanceResource`
+        """
+        self_dict = {key: value for (key, value) in resource.to_dict().items() if key in fields}
+        if args:
+            self_dict = dict(list(self_dict.items()) + list(args.items()))
+        response = await self.requester.patch(
+            "/{endpoint}/{id}", endpoint=self.instance.endpoint, id=resource.id, payload=self_dict
+        )
+        obj_json = utils.json_response(response)
+        if "version" in obj_json:
+            resource.version = obj_json["version"]
+        resource._clean([*self_dict, "version"])
+        return resource
+
+    async def save(self, resource, **args):
+        """
+        Patch the fields of the given :class:`InstanceResource` changed since it was parsed or
+        last saved, along with its ``version`` (see :py:meth:`InstanceResource.save`)
+        """
+        fields, version = resource._save_fields()
+        if not fields and not args:
+            return resource
+        return await self.patch(resource, fields, **dict(version, **args))
+
+    async def _new_resource(self, **attrs):
+        response = await self.requester.post(self.instance.endpoint, **attrs)
+        return self.instance.parse(self.requester, utils.json_response(response))
+
+    async def _parse_response(self, response):
+        # the helpers of the concrete resources pass the (awaitable) response of the requester
+        return self.instance.parse(self.requester, utils.json_response(await response))
+
+    async def _bulk_create(self, field, subjects, payload, chunk_size=None, max_workers=None):
+        chunks = self._bulk_chunks(subjects, chunk_size)
+        semaphore = asyncio.Semaphore(self._list_workers(True, None, max_workers))
+
+        async def create(chunk):
+            async with semaphore:
+                response = await self.requester.post(
+                    "/{endpoint}/bulk_create",
+                    endpoint=self.instance.endpoint,
+                    payload=dict(payload, **{field: "\n".join(chunk)}),
+                )
+            return self.parse_list(utils.json_response(response))
+
+        objects = SearchableList()
+        for entries in await asyncio.gather(*(create(chunk) for chunk in chunks)):
+            objects.extend(entries)
+        return objects
+
+
+@functools.lru_cache(maxsize=None)
+def async_resource(resource_class):
+    """
+    Build the :class:`AsyncListResource` flavour of a :class:`ListResource` subclass.
+
+    :param resource_class: :class:`ListResource` subclass (e.g. :class:`taiga.models.UserStories`)
+    """
+    return type("Async{}".format(resource_class.__name__), (resource_class, AsyncListResource), {})
+
+
+_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:?\d{2})?$")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+def parse_date(value, date_only=False):
+    """
+    Decode an ISO 8601 date and time (in the local timezone) or date string
+
+    Values which can't be decoded are returned unchanged.
+
+    :param value: the string to decode
+    :param date_only: decode a date (``YYYY-MM-DD``) instead of a date and time
+    """
+    if not isinstance(value, str):
+        return value
+    if date_only:
+        if _DATE_RE.match(value):
+            try:
+                return datetime.date.fromisoformat(value)
+            except ValueError:
+                pass
+        return value
+    if not _DATETIME_RE.match(value):
+        return value
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        # offsets without colon and "Z" suffix are not supported by fromisoformat before python 3.11
+        import dateutil.parser
+
+        try:
+            parsed = dateutil.parser.isoparse(value)
+        except (ValueError, OverflowError):
+            return value
+    return parsed.astimezone()
+
+
+class DateField:
+    """
+    Model attribute holding an ISO 8601 string, decoded on first access
+
+    The original string is kept in the instance ``__dict__`` (so it's sent back
+    unchanged on updates, see :py:meth:`InstanceResource.raw_date`) and the
+    decoded value is cached until the attribute is set again. Dates and datetimes
+    assigned to the attribute are stored in their ISO 8601 format.
+
+    :param date_only: the attribute is a date, without time
+    """
+
+    def __init__(self, date_only=False):
+        self.date_only = date_only
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            raw = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+        dates = instance.__dict__.setdefault("_dates", {})
+        cached = dates.get(self.name)
+        if cached is None or cached[0] is not raw:
+            cached = dates[self.name] = (raw, parse_date(raw, self.date_only))
+        return cached[1]
+
+    def __set__(self, instance, value):
+        if isinstance(value, datetime.datetime):
+            value = value.date().isoformat() if self.date_only else value.isoformat()
+        elif isinstance(value, datetime.date):
+            value = value.isoformat()
+        instance.__dict__[self.name] = value
+
+    def __delete__(self, instance):
+        try:
+            del instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+
+class NestedField:
+    """
+    Model attribute holding related objects, parsed from their JSON on first access
+
+    Fields declared in :py:attr:`InstanceResource.parser` are set up automatically. The JSON
+    received from the server is replaced by the parsed objects the first time the attribute is
+    read; values assigned later are kept as they are, unless they are JSON lists or objects.
+
+    :param resource_class: :class:`ListResource` or :class:`InstanceResource` class parsing the JSON
+    :param name: name of the attribute
+    """
+
+    def __init__(self, resource_class, name=None):
+        self.resource_class = resource_class
+        self.name = name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+        if value is None or type(value) in (list, dict):
+            value = instance.__dict__[self.name] = self.resource_class.parse(instance.requester, value)
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+
+    def __delete__(self, instance):
+        try:
+            del instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+
+class IdentityMap:
+    """
+    Registry of the model instances parsed by a client, by model and id
+
+    When the same object is parsed again (e.g. listed after being fetched, or nested in
+    another object), the existing instance is returned, refreshed with the new data unless
+    the data is older than the instance (by ``version``, or ``modified_date`` without a
+    version). Instances are held by weak references, so they are dropped once unused.
+    """
+
+    def __init__(self):
+        self._objects = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # the instances are held by weak references: an unpickled map starts empty
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, model, resource_id):
+        """
+        Get the instance of the given model and id (``None`` if not in the map)
+
+        :param model: :class:`InstanceResource` subclass
+        :param resource_id: id of the object
+        """
+        return self._objects.get((model, resource_id))
+
+    def clear(self):
+        """
+        Forget all the instances
+        """
+        with self._lock:
+            self._objects.clear()
+
+    def merge(self, model, requester, entry):
+        """
+        Get the instance of the object in ``entry``, creating or refreshing it
+
+        :param model: :class:`InstanceResource` subclass
+        :param requester: :class:`Requester` instance
+        :param entry: JSON object, with an ``id``
+        """
+        key = (model, entry["id"])
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is None:
+                obj = self._objects[key] = model(requester, **entry)
+                return obj
+        if not self._is_older(entry, obj):
+            obj._refresh(entry)
+        return obj
+
+    @staticmethod
+    def _is_older(entry, obj):
+        version = entry.get("version")
+        current_version = getattr(obj, "version", None)
+        if isinstance(version, int) and isinstance(current_version, int):
+            return version < current_version
+        modified_date = parse_date(entry.get("modified_date"))
+        current_modified_date = getattr(obj, "modified_date", None)
+        if isinstance(modified_date, datetime.datetime) and isinstance(current_modified_date, datetime.datetime):
+            return modified_date < current_modified_date
+        return False
+
+
+def _is_data_descriptor(cls, name):
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return hasattr(type(klass.__dict__[name]), "__set__")
+    return False
+
+
+def _rebuild_instance(model, requester, fields, attrs):
+    obj = model.__new__(model, requester, **fields)
+    object.__setattr__(obj, "requester", requester)
+    for key, value in fields.items():
+        object.__setattr__(obj, key, value)
+    obj.__dict__.update(attrs)
+    return obj
+
+
 class InstanceResource(Resource):
     """InstanceResource model
 
     Base class for methods that operates on a single resource (:py:meth:`update`, :py:meth:`patch`, :py:meth:`delete`).
 
+    Unless :py:attr:`compact` is disabled, instances are created from a subclass generated for
+    each set of fields, which stores them in ``__slots__`` instead of the instance ``__dict__``
+    (date fields and attributes set later are still kept in ``__dict__``): check the model of
+    an object with ``isinstance``. Pickled objects are rebuilt through the model class.
+
+    Keys listed in :py:attr:`parser` are parsed into the given resource class when first accessed
+    (see :class:`NestedField`).
+
     :param requester: :class:`Requester` instance
     :param params: :various parameters
     """
@@ -135,16 +1032,138 @@ class InstanceResource(Resource):
 
     repr_attribute = "name"
 
-    def __init__(self, requester, **params):
-        import dateutil.parser
+    created_date = DateField()
+    modified_date = DateField()
+    finished_date = DateField()
+    due_date = DateField(date_only=True)
+    estimated_start = DateField(date_only=True)
+    estimated_finish = DateField(date_only=True)
+
+    #: Store the fields in ``__slots__`` (see :class:`InstanceResource`)
+    compact = True
+
+    #: Maximum number of compact classes generated for a model: objects with other sets of fields
+    #: are stored in the instance ``__dict__``
+    compact_classes_max = 64
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_compact_fields" in cls.__dict__:
+            return
+        for name, resource_class in cls.__dict__.get("parser", {}).items():
+            if name not in cls.__dict__:
+                setattr(cls, name, NestedField(resource_class, name))
+
+    def __new__(cls, requester=None, **params):
+        if params and cls.compact and "_compact_fields" not in cls.__dict__:
+            compact_class = cls._compact_class(tuple(params))
+            if compact_class is not None:
+                return super().__new__(compact_class)
+        return super().__new__(cls)
 
+    @classmethod
+    def _compact_class(cls, keys):
+        classes = cls.__dict__.get("_compact_classes")
+        if classes is None:
+            classes = cls._compact_classes = {}
+        compact_class = classes.get(keys)
+        if compact_class is None and len(classes) < cls.compact_classes_max:
+            fields = tuple(
+                key
+                for key in keys
+                if key.isidentifier()
+                and not key.startswith("__")
+                and key != "requester"
+                and not _is_data_descriptor(cls, key)
+            )
+            compact_class = classes.setdefault(
+                keys,
+                type(
+                    cls.__name__,
+                    (cls,),
+                    {
+                        "__slots__": fields + ("requester",),
+                        "__module__": cls.__module__,
+                        "__qualname__": cls.__qualname__,
+                        "_compact_fields": fields,
+                    },
+                ),
+            )
+        return compact_class
+
+    #: Attributes set since the object was parsed or last saved (see :py:attr:`dirty_fields`)
+    _dirty = frozenset()
+
+    def __init__(self, requester, **params):
         self.requester = requester
         for key, value in params.items():
-            if key in ["created_date", "modified_date"]:
-                if re.compile(r"\d+-\d+-\d+T\d+:\d+:\d+\+0000").match(value):
-                    d = dateutil.parser.parse(value)
-                    value = d.astimezone(dateutil.tz.tzlocal())
-            setattr(self, key, value)
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name != "requester" and not name.startswith("_"):
+            try:
+                self._dirty.add(name)
+            except AttributeError:
+                object.__setattr__(self, "_dirty", {name})
+
+    @property
+    def dirty_fields(self):
+        """
+        Names of the attributes set since the object was parsed or last saved
+
+        Changes made in place (e.g. appending to a list attribute) are not tracked:
+        assign the attribute again to mark it as changed.
+        """
+        return frozenset(self._dirty)
+
+    def __reduce__(self):
+        # compact classes are generated at runtime: unpickle through the model class
+        public_class = next(klass for klass in type(self).__mro__ if "_compact_fields" not in klass.__dict__)
+        fields = {key: getattr(self, key) for key in self._slot_fields()}
+        attrs = dict(self.__dict__)
+        # the changes tracked and the dates parsed belong to each copy
+        for key in ("_dirty", "_dates"):
+            if key in attrs:
+                attrs[key] = attrs[key].copy()
+        return _rebuild_instance, (public_class, self.requester, fields, attrs)
+
+    def _slot_fields(self):
+        return [key for key in getattr(type(self), "_compact_fields", ()) if hasattr(self, key)]
+
+    def _clean(self, fields=None):
+        if fields is None:
+            self.__dict__.pop("_dirty", None)
+        elif self._dirty:
+            self._dirty.difference_update(fields)
+
+    def _refresh(self, entry):
+        # fields received from the server are updated, except the unsaved local changes and,
+        # while there are some, the version they are based on
+        kept = self._dirty | {"version"} if self._dirty else ()
+        for key, value in entry.items():
+            if key not in kept:
+                object.__setattr__(self, key, value)
+
+    def _save_fields(self):
+        # changed fields which are sent to the server, and the version they're based on
+        fields = [key for key in self.allowed_params if key in self._dirty]
+        version = getattr(self, "version", None)
+        return fields, {"version": version} if version is not None else {}
+
+    def _fields(self):
+        # fields stored in the slots of compact classes (unless deleted) and in the instance __dict__
+        for key in self._slot_fields():
+            yield key, getattr(self, key)
+        yield from self.__dict__.items()
+
+    def raw_date(self, name):
+        """
+        Get the string received from the server for a date field
+
+        :param name: name of the field, e.g. ``created_date``
+        """
+        return self.__dict__.get(name)
 
     def update(self, **args):
         """
@@ -154,9 +1173,10 @@ class InstanceResource(Resource):
         if args:
             self_dict = dict(list(self_dict.items()) + list(args.items()))
         response = self.requester.put("/{endpoint}/{id}", endpoint=self.endpoint, id=self.id, payload=self_dict)
-        obj_json = response.json()
+        obj_json = utils.json_response(response)
         if "version" in obj_json:
-            self.__dict__["version"] = obj_json["version"]
+            self.version = obj_json["version"]
+        self._clean()
         return self
 
     def patch(self, fields, **args):
@@ -167,11 +1187,24 @@ class InstanceResource(Resource):
         if args:
             self_dict = dict(list(self_dict.items()) + list(args.items()))
         response = self.requester.patch("/{endpoint}/{id}", endpoint=self.endpoint, id=self.id, payload=self_dict)
-        obj_json = response.json()
+        obj_json = utils.json_response(response)
         if "version" in obj_json:
-            self.__dict__["version"] = obj_json["version"]
+            self.version = obj_json["version"]
+        self._clean([*self_dict, "version"])
         return self
 
+    def save(self, **args):
+        """
+        Patch the fields of the current :class:`InstanceResource` changed since it was
+        parsed or last saved (see :py:attr:`dirty_fields`), along with its ``version``
+
+        No request is sent if none of the :py:attr:`allowed_params` changed.
+        """
+        fields, version = self._save_fields()
+        if not fields and not args:
+            return self
+        return self.patch(fields, **dict(version, **args))
+
     def delete(self, query=None):
         """
         Delete the current :class:`InstanceResource`
@@ -184,7 +1217,7 @@ class InstanceResource(Resource):
         Get a dictionary representation of :class:`InstanceResource`
         """
         self_dict = {}
-        for key, value in self.__dict__.items():
+        for key, value in self._fields():
             if self.allowed_params and key in self.allowed_params:
                 self_dict[key] = value
         return self_dict
@@ -193,12 +1226,15 @@ class InstanceResource(Resource):
     def parse(cls, requester, entry):
         """
         Turns a JSON object into a model instance.
+
+        If the requester has an :class:`IdentityMap`, the instance already parsed
+        for the same object is refreshed and returned instead.
         """
         if not isinstance(entry, dict):
             return entry
-        for key_to_parse, cls_to_parse in cls.parser.items():
-            if key_to_parse in entry:
-                entry[key_to_parse] = cls_to_parse.parse(requester, entry[key_to_parse])
+        identity_map = getattr(requester, "identity_map", None)
+        if identity_map is not None and "id" in entry:
+            return identity_map.merge(cls, requester, entry)
         return cls(requester, **entry)
 
     def __repr__(self):
@@ -1,8 +1,10 @@
 import datetime
+import functools
 import warnings
 from io import IOBase
 
-from .. import exceptions
+from .. import exceptions, utils
+from ..requestmaker import CachedResponse
 from .base import InstanceResource, ListResource
 
 
@@ -60,17 +62,17 @@ class CustomAttributeResource(InstanceResource):
             id=self.id,
             payload={"attributes_values": attributes["attributes_values"], "version": version},
         )
-        cache_key = self.requester.get_full_url(
+        cache_key = self.requester.cache_key(
             "/{endpoint}/custom-attributes-values/{id}", endpoint=self.endpoint, id=self.id
         )
-        self.requester.cache.put(cache_key, response)
-        return response.json()
+        self.requester.cache.put(cache_key, CachedResponse.from_response(response))
+        return utils.json_response(response)
 
     def _get_attributes(self, cache=False):
         response = self.requester.get(
             "/{endpoint}/custom-attributes-values/{id}", endpoint=self.endpoint, id=self.id, cache=cache
         )
-        return response.json()
+        return utils.json_response(response)
 
     def get_attributes(self):
         """
@@ -126,7 +128,7 @@ class User(InstanceResource):
         Get a list of starred :class:`Project`.
         """
         response = self.requester.get("/{endpoint}/{id}/starred", endpoint=self.endpoint, id=self.id)
-        return Projects.parse(self.requester, response.json())
+        return Projects.parse(self.requester, utils.json_response(response))
 
 
 class Users(ListResource):
@@ -197,6 +199,8 @@ class Priorities(MoveOnDestroyMixinList, ListResource):
 
     instance = Priority
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         """
         Create a new :class:`Priority`.
@@ -385,6 +389,8 @@ class EpicStatus(MoveOnDestroyMixinObject, InstanceResource):
 class EpicStatuses(MoveOnDestroyMixinList, ListResource):
     instance = EpicStatus
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         """
         Create a new :class:`EpicStatus`.
@@ -495,6 +501,27 @@ class UserStories(ListResource):
 
     instance = UserStory
 
+    server_lookups = {
+        "status__in": "status",
+        "assigned_to__in": "assigned_to",
+        "owner__in": "owner",
+        "epic__in": "epic",
+        "tags__contains": "tags",
+        "milestone__isnull": "milestone__isnull",
+        "created_date__gt": "created_date__gt",
+        "created_date__gte": "created_date__gte",
+        "created_date__lt": "created_date__lt",
+        "created_date__lte": "created_date__lte",
+        "modified_date__gt": "modified_date__gt",
+        "modified_date__gte": "modified_date__gte",
+        "modified_date__lt": "modified_date__lt",
+        "modified_date__lte": "modified_date__lte",
+        "finish_date__gt": "finish_date__gt",
+        "finish_date__gte": "finish_date__gte",
+        "finish_date__lt": "finish_date__lt",
+        "finish_date__lte": "finish_date__lte",
+    }
+
     def create(self, project, subject, **attrs):
         """
         Create a new :class:`UserStory`.
@@ -506,12 +533,29 @@ class UserStories(ListResource):
         attrs.update({"project": project, "subject": subject})
         return self._new_resource(payload=attrs)
 
+    def bulk_create(self, project, subjects, status=None, chunk_size=None, max_workers=None, **attrs):
+        """
+        Create many :class:`UserStory` with a request for each chunk of subjects.
+
+        :param project: :class:`Project` id
+        :param subjects: subjects of the :class:`UserStory`, one for each
+        :param status: :class:`UserStoryStatus` id of the :class:`UserStory`
+        :param chunk_size: user stories created by each request (default: :py:attr:`bulk_chunk_size`)
+        :param max_workers: number of requests sent concurrently (default: the requester ``max_workers``)
+        :param attrs: other fields accepted by the endpoint (e.g. ``milestone_id``, ``swimlane_id``)
+        :return: <SearchableList> of :class:`UserStory`, in the order of ``subjects``
+        """
+        attrs["project_id"] = project
+        if status is not None:
+            attrs["status_id"] = status
+        return self._bulk_create("bulk_stories", subjects, attrs, chunk_size, max_workers)
+
     def import_(self, project, subject, status, **attrs):
         attrs.update({"project": project, "subject": subject, "status": status})
         response = self.requester.post(
             "/{endpoint}/{id}/{type}", endpoint="importer", id=project, type="us", payload=attrs
         )
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
 
 class UserStoryStatus(MoveOnDestroyMixinObject, InstanceResource):
@@ -536,6 +580,8 @@ class UserStoryStatus(MoveOnDestroyMixinObject, InstanceResource):
 class UserStoryStatuses(MoveOnDestroyMixinList, ListResource):
     instance = UserStoryStatus
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         """
         Create a new :class:`UserStoryStatus`.
@@ -609,6 +655,8 @@ class Points(MoveOnDestroyMixinList, ListResource):
 
     instance = Point
 
+    reference_data = True
+
     def create(self, project, name, value, **attrs):
         """
         Create a new :class:`UserStoryStatus`.
@@ -650,12 +698,14 @@ class Milestone(InstanceResource):
         "user_stories": UserStories,
     }
 
-    def stats(self):
+    def stats(self, cache=False):
         """
         Get the stats for the current :class:`Milestone`
+
+        :param cache: serve the stats from the requester cache
         """
-        response = self.requester.get("/{endpoint}/{id}/stats", endpoint=self.endpoint, id=self.id)
-        return response.json()
+        response = self.requester.get("/{endpoint}/{id}/stats", endpoint=self.endpoint, id=self.id, cache=cache)
+        return utils.json_response(response)
 
 
 class Milestones(ListResource):
@@ -705,7 +755,7 @@ class Milestones(ListResource):
         response = self.requester.post(
             "/{endpoint}/{id}/{type}", endpoint="importer", id=project, type="milestone", payload=attrs
         )
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
 
 class TaskStatus(MoveOnDestroyMixinObject, InstanceResource):
@@ -727,6 +777,8 @@ class TaskStatus(MoveOnDestroyMixinObject, InstanceResource):
 class TaskStatuses(MoveOnDestroyMixinList, ListResource):
     instance = TaskStatus
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         """
         Create a new :class:`TaskStatus`.
@@ -827,6 +879,25 @@ class Tasks(ListResource):
 
     instance = Task
 
+    server_lookups = {
+        "status__in": "status",
+        "assigned_to__in": "assigned_to",
+        "owner__in": "owner",
+        "tags__contains": "tags",
+        "created_date__gt": "created_date__gt",
+        "created_date__gte": "created_date__gte",
+        "created_date__lt": "created_date__lt",
+        "created_date__lte": "created_date__lte",
+        "modified_date__gt": "modified_date__gt",
+        "modified_date__gte": "modified_date__gte",
+        "modified_date__lt": "modified_date__lt",
+        "modified_date__lte": "modified_date__lte",
+        "finished_date__gt": "finished_date__gt",
+        "finished_date__gte": "finished_date__gte",
+        "finished_date__lt": "finished_date__lt",
+        "finished_date__lte": "finished_date__lte",
+    }
+
     def create(self, project, subject, status, **attrs):
         """
         Create a new :class:`Task`.
@@ -839,12 +910,42 @@ class Tasks(ListResource):
         attrs.update({"project": project, "subject": subject, "status": status})
         return self._new_resource(payload=attrs)
 
+    def bulk_create(
+        self,
+        project,
+        subjects,
+        user_story=None,
+        milestone=None,
+        status=None,
+        chunk_size=None,
+        max_workers=None,
+        **attrs,
+    ):
+        """
+        Create many :class:`Task` with a request for each chunk of subjects.
+
+        :param project: :class:`Project` id
+        :param subjects: subjects of the :class:`Task`, one for each
+        :param user_story: :class:`UserStory` id of the :class:`Task`
+        :param milestone: :class:`Milestone` id of the :class:`Task`
+        :param status: :class:`TaskStatus` id of the :class:`Task`
+        :param chunk_size: tasks created by each request (default: :py:attr:`bulk_chunk_size`)
+        :param max_workers: number of requests sent concurrently (default: the requester ``max_workers``)
+        :param attrs: other fields accepted by the endpoint
+        :return: <SearchableList> of :class:`Task`, in the order of ``subjects``
+        """
+        attrs["project_id"] = project
+        for field, value in (("us_id", user_story), ("milestone_id", milestone), ("status_id", status)):
+            if value is not None:
+                attrs[field] = value
+        return self._bulk_create("bulk_tasks", subjects, attrs, chunk_size, max_workers)
+
     def import_(self, project, subject, status, **attrs):
         attrs.update({"project": project, "subject": subject, "status": status})
         response = self.requester.post(
             "/{endpoint}/{id}/{type}", endpoint="importer", id=project, type="task", payload=attrs
         )
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
 
 class IssueType(MoveOnDestroyMixinObject, InstanceResource):
@@ -869,6 +970,8 @@ class IssueTypes(MoveOnDestroyMixinList, ListResource):
 
     instance = IssueType
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         attrs.update({"project": project, "name": name})
         return self._new_resource(payload=attrs)
@@ -897,6 +1000,8 @@ class IssueStatuses(MoveOnDestroyMixinList, ListResource):
 
     instance = IssueStatus
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         attrs.update({"project": project, "name": name})
         return self._new_resource(payload=attrs)
@@ -995,6 +1100,28 @@ class Issue(CustomAttributeResource, CommentableResource):
 class Issues(ListResource):
     instance = Issue
 
+    server_lookups = {
+        "status__in": "status",
+        "assigned_to__in": "assigned_to",
+        "owner__in": "owner",
+        "priority__in": "priority",
+        "severity__in": "severity",
+        "type__in": "type",
+        "tags__contains": "tags",
+        "created_date__gt": "created_date__gt",
+        "created_date__gte": "created_date__gte",
+        "created_date__lt": "created_date__lt",
+        "created_date__lte": "created_date__lte",
+        "modified_date__gt": "modified_date__gt",
+        "modified_date__gte": "modified_date__gte",
+        "modified_date__lt": "modified_date__lt",
+        "modified_date__lte": "modified_date__lte",
+        "finished_date__gt": "finished_date__gt",
+        "finished_date__gte": "finished_date__gte",
+        "finished_date__lt": "finished_date__lt",
+        "finished_date__lte": "finished_date__lte",
+    }
+
     def create(self, project, subject, priority, status, issue_type, severity, **attrs):
         """
         Create a new :class:`Task`.
@@ -1019,6 +1146,25 @@ class Issues(ListResource):
         )
         return self._new_resource(payload=attrs)
 
+    def bulk_create(self, project, subjects, milestone=None, chunk_size=None, max_workers=None, **attrs):
+        """
+        Create many :class:`Issue` with a request for each chunk of subjects.
+
+        The issues get the default priority, status, type and severity of the project.
+
+        :param project: :class:`Project` id
+        :param subjects: subjects of the :class:`Issue`, one for each
+        :param milestone: :class:`Milestone` id of the :class:`Issue`
+        :param chunk_size: issues created by each request (default: :py:attr:`bulk_chunk_size`)
+        :param max_workers: number of requests sent concurrently (default: the requester ``max_workers``)
+        :param attrs: other fields accepted by the endpoint
+        :return: <SearchableList> of :class:`Issue`, in the order of ``subjects``
+        """
+        attrs["project_id"] = project
+        if milestone is not None:
+            attrs["milestone_id"] = milestone
+        return self._bulk_create("bulk_issues", subjects, attrs, chunk_size, max_workers)
+
     def import_(self, project, subject, priority, status, issue_type, severity, **attrs):
         attrs.update(
             {
@@ -1033,7 +1179,7 @@ class Issues(ListResource):
         response = self.requester.post(
             "/{endpoint}/{id}/{type}", endpoint="importer", id=project, type="issue", payload=attrs
         )
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
 
 class IssueAttribute(CustomAttribute):
@@ -1122,6 +1268,8 @@ class Severities(MoveOnDestroyMixinList, ListResource):
 
     instance = Severity
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         """
         Create a new :class:`Severity`
@@ -1158,6 +1306,8 @@ class Roles(ListResource):
 
     instance = Role
 
+    reference_data = True
+
     def create(self, project, name, **attrs):
         """
         Create a new :class:`Role`
@@ -1225,7 +1375,7 @@ class Project(InstanceResource):
         response = self.requester.get(
             "/resolver?project={project_id}&ref={task_ref}", task_ref=ref, project_id=self.slug
         )
-        response_json = response.json()
+        response_json = utils.json_response(response)
 
         if response_json and "task" in response_json:
             return self.get_task_by_ref(ref)
@@ -1248,7 +1398,7 @@ class Project(InstanceResource):
             task_ref=ref,
             project_id=self.id,
         )
-        return Task.parse(self.requester, response.json())
+        return Task.parse(self.requester, utils.json_response(response))
 
     def get_epic_by_ref(self, ref):
         """
@@ -1262,7 +1412,7 @@ class Project(InstanceResource):
             ep_ref=ref,
             project_id=self.id,
         )
-        return Epic.parse(self.requester, response.json())
+        return Epic.parse(self.requester, utils.json_response(response))
 
     def get_userstory_by_ref(self, ref):
         """
@@ -1276,7 +1426,7 @@ class Project(InstanceResource):
             us_ref=ref,
             project_id=self.id,
         )
-        return UserStory.parse(self.requester, response.json())
+        return UserStory.parse(self.requester, utils.json_response(response))
 
     def get_issue_by_ref(self, ref):
         """
@@ -1290,21 +1440,25 @@ class Project(InstanceResource):
             us_ref=ref,
             project_id=self.id,
         )
-        return Issue.parse(self.requester, response.json())
+        return Issue.parse(self.requester, utils.json_response(response))
 
-    def stats(self):
+    def stats(self, cache=False):
         """
         Get the stats of the project
+
+        :param cache: serve the stats from the requester cache
         """
-        response = self.requester.get("/{endpoint}/{id}/stats", endpoint=self.endpoint, id=self.id)
-        return response.json()
+        response = self.requester.get("/{endpoint}/{id}/stats", endpoint=self.endpoint, id=self.id, cache=cache)
+        return utils.json_response(response)
 
-    def issues_stats(self):
+    def issues_stats(self, cache=False):
         """
         Get stats for issues of the project
+
+        :param cache: serve the stats from the requester cache
         """
-        response = self.requester.get("/{endpoint}/{id}/issues_stats", endpoint=self.endpoint, id=self.id)
-        return response.json()
+        response = self.requester.get("/{endpoint}/{id}/issues_stats", endpoint=self.endpoint, id=self.id, cache=cache)
+        return utils.json_response(response)
 
     def like(self):
         """
@@ -1387,6 +1541,12 @@ class Project(InstanceResource):
         """
         return UserStories(self.requester).list(project=self.id, **queryparams)
 
+    def iter_user_stories(self, **queryparams):
+        """
+        Iterates over the :class:`UserStory` of the project, one page at a time.
+        """
+        return UserStories(self.requester).iter(project=self.id, **queryparams)
+
     def add_swimlane(self, name, **attrs):
         """
         Adds a :class:`SwimLane` and returns a :class:`SwimLane` resource.
@@ -1434,6 +1594,18 @@ class Project(InstanceResource):
         """
         return Issues(self.requester).list(project=self.id)
 
+    def iter_issues(self, **queryparams):
+        """
+        Iterates over the :class:`Issue` of the project, one page at a time.
+        """
+        return Issues(self.requester).iter(project=self.id, **queryparams)
+
+    def iter_tasks(self, **queryparams):
+        """
+        Iterates over the :class:`Task` of the project, one page at a time.
+        """
+        return Tasks(self.requester).iter(project=self.id, **queryparams)
+
     def add_milestone(self, name, estimated_start, estimated_finish, **attrs):
         """
         Add a Milestone to the project and returns a :class:`Milestone` object.
@@ -1754,7 +1926,7 @@ class Project(InstanceResource):
         Get the list of tags for the project.
         """
         response = self.requester.get("/{}/{}/tags_colors".format(self.endpoint, self.id))
-        return response.json()
+        return utils.json_response(response)
 
     def duplicate(self, name, description, is_private=False, users=[], **attrs):
         """
@@ -1768,7 +1940,7 @@ class Project(InstanceResource):
         """
         attrs.update({"name": name, "description": description, "is_private": is_private, "users": users})
         response = self.requester.post("/{endpoint}/{id}/duplicate", payload=attrs, endpoint=self.endpoint, id=self.id)
-        return self.parse(self.requester, response.json())
+        return self.parse(self.requester, utils.json_response(response))
 
 
 class Projects(ListResource):
@@ -1792,7 +1964,7 @@ class Projects(ListResource):
     def import_(self, name, description, roles, **attrs):
         attrs.update({"name": name, "description": description, "roles": roles})
         response = self.requester.post("/{endpoint}", endpoint="importer", payload=attrs)
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
     def get_by_slug(self, slug):
         """
@@ -1801,7 +1973,7 @@ class Projects(ListResource):
         :param slug: the slug of :class:`Project`
         """
         response = self.requester.get("/{endpoint}/by_slug?slug={slug}", endpoint=self.instance.endpoint, slug=slug)
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
 
 class WikiAttachment(Attachment):
@@ -1876,7 +2048,7 @@ class WikiPages(ListResource):
         response = self.requester.post(
             "/{endpoint}/{id}/{type}", endpoint="importer", id=project, type="wiki_page", payload=attrs
         )
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
 
 class WikiLink(InstanceResource):
@@ -1920,7 +2092,7 @@ class WikiLinks(ListResource):
         response = self.requester.post(
             "/{endpoint}/{id}/{type}", endpoint="importer", id=project, type="wiki_link", payload=attrs
         )
-        return self.instance.parse(self.requester, response.json())
+        return self._parse_response(response)
 
 
 class History(InstanceResource):
@@ -1930,11 +2102,23 @@ class History(InstanceResource):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.issue = HistoryIssue(self.requester)
-        self.task = HistoryTask(self.requester)
-        self.user_story = HistoryUserStory(self.requester)
-        self.wiki = HistoryWiki(self.requester)
-        self.epic = HistoryEpic(self.requester)
+        self.issue = self._entity(HistoryIssue)
+        self.task = self._entity(HistoryTask)
+        self.user_story = self._entity(HistoryUserStory)
+        self.wiki = self._entity(HistoryWiki)
+        self.epic = self._entity(HistoryEpic)
+
+    def _entity(self, entity_class):
+        return entity_class(self.requester)
+
+
+class AsyncHistory(History):
+    """
+    Awaitable flavour of :class:`History`, for :class:`taiga.client.AsyncTaigaAPI`
+    """
+
+    def _entity(self, entity_class):
+        return _async_history_entity(entity_class)(self.requester)
 
 
 class HistoryEntity:
@@ -1956,7 +2140,7 @@ class HistoryEntity:
         response = self.requester.get(
             "/{endpoint}/{entity}/{id}", endpoint=self.endpoint, entity=self.entity, id=resource_id, paginate=False
         )
-        return response.json()
+        return self._json_response(response)
 
     def delete_comment(self, resource_id, comment_id):
         """
@@ -1965,12 +2149,14 @@ class HistoryEntity:
         :param resource_id: id of the resource object (resource type is defined by the HistoryEntity subclass used)
         :param comment_id: id of the comment to delete
         """
-        self.requester.post(
-            "/{endpoint}/{entity}/{id}/delete_comment?id={comment_id}",
-            endpoint=self.endpoint,
-            entity=self.entity,
-            id=resource_id,
-            comment_id=comment_id,
+        return self._no_response(
+            self.requester.post(
+                "/{endpoint}/{entity}/{id}/delete_comment?id={comment_id}",
+                endpoint=self.endpoint,
+                entity=self.entity,
+                id=resource_id,
+                comment_id=comment_id,
+            )
         )
 
     def undelete_comment(self, resource_id, comment_id):
@@ -1980,14 +2166,43 @@ class HistoryEntity:
         :param resource_id: id of the resource object (resource type is defined by the HistoryEntity subclass used)
         :param comment_id: id of the comment to undelete
         """
-        self.requester.post(
-            "/{endpoint}/{entity}/{id}/undelete_comment?id={comment_id}",
-            endpoint=self.endpoint,
-            entity=self.entity,
-            id=resource_id,
-            comment_id=comment_id,
+        return self._no_response(
+            self.requester.post(
+                "/{endpoint}/{entity}/{id}/undelete_comment?id={comment_id}",
+                endpoint=self.endpoint,
+                entity=self.entity,
+                id=resource_id,
+                comment_id=comment_id,
+            )
         )
 
+    @staticmethod
+    def _json_response(response):
+        return utils.json_response(response)
+
+    @staticmethod
+    def _no_response(response):
+        return None
+
+
+class AsyncHistoryEntityMixin:
+    """
+    Awaitable flavour of the :class:`HistoryEntity` methods
+    """
+
+    @staticmethod
+    async def _json_response(response):
+        return utils.json_response(await response)
+
+    @staticmethod
+    async def _no_response(response):
+        await response
+
+
+@functools.lru_cache(maxsize=None)
+def _async_history_entity(entity_class):
+    return type("Async{}".format(entity_class.__name__), (AsyncHistoryEntityMixin, entity_class), {})
+
 
 class HistoryIssue(HistoryEntity):
     """
@@ -1995,7 +2210,7 @@ class HistoryIssue(HistoryEntity):
     """
 
     def __init__(self, *args, **kwargs):
-        super(type(self), self).__init__(*args, **kwargs)
+        super().__init__(*args, **kwargs)
         self.entity = "issue"
 
 
@@ -2005,7 +2220,7 @@ class HistoryEpic(HistoryEntity):
     """
 
     def __init__(self, *args, **kwargs):
-        super(type(self), self).__init__(*args, **kwargs)
+        super().__init__(*args, **kwargs)
         self.entity = "epic"
 
 
@@ -2015,7 +2230,7 @@ class HistoryTask(HistoryEntity):
     """
 
     def __init__(self, *args, **kwargs):
-        super(type(self), self).__init__(*args, **kwargs)
+        super().__init__(*args, **kwargs)
         self.entity = "task"
 
 
@@ -2025,7 +2240,7 @@ class HistoryUserStory(HistoryEntity):
     """
 
     def __init__(self, *args, **kwargs):
-        super(type(self), self).__init__(*args, **kwargs)
+        super().__init__(*args, **kwargs)
         self.entity = "userstory"
 
 
@@ -2035,7 +2250,7 @@ class HistoryWiki(HistoryEntity):
     """
 
     def __init__(self, *args, **kwargs):
-        super(type(self), self).__init__(*args, **kwargs)
+        super().__init__(*args, **kwargs)
         self.entity = "wiki"
 
 
@@ -1,8 +1,21 @@
-import json
+import abc
+import asyncio
+import email.utils
+import functools
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from requests.exceptions import RequestException
     from requests.packages.urllib3.exceptions import InsecureRequestWarning
 except ImportError:  # pragma: no cover
@@ -23,60 +36,1025 @@ class RequestCacheInvalidException(RequestCacheException):  # noqa: N818
     pass
 
 
-class RequestCache:
-    def __init__(self, valid_time=60):
+class CachedResponse:
+    """
+    Lightweight stand-in for a response stored in :class:`RequestCache`
+
+    Only the status code, the headers and the decoded JSON body are retained;
+    :py:meth:`json` returns a fresh copy of the body on each call, so the
+    cached value is not altered by the models parsing it.
+
+    :param status_code: HTTP status code
+    :param headers: response headers
+    :param data: decoded JSON body
+    :param size: size in bytes of the original body
+    """
+
+    def __init__(self, status_code, headers, data, size=0):
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.data = data
+        self.size = size
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Build a :class:`CachedResponse` from a response, decoding its JSON body
+        """
+        return cls(response.status_code, response.headers, utils.json_response(response), len(response.content))
+
+    @property
+    def text(self):
+        return utils.json_dumps(self.data).decode("utf-8")
+
+    @property
+    def validators(self):
+        """
+        Conditional request headers to revalidate the response (empty if the server sent no validator)
+        """
+        validators = {}
+        if self.headers.get("ETag"):
+            validators["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = self.headers["Last-Modified"]
+        return validators
+
+    def json(self):
+        return utils.copy_json(self.data)
+
+
+class BaseRequestCache(abc.ABC):
+    """
+    Interface of the cache backends used by :class:`RequestMaker`
+
+    Backends store the values (usually :class:`CachedResponse`) by key and are
+    passed to the requester with the ``cache`` argument; reads raise
+    :class:`RequestCacheMissingException` for unknown keys and
+    :class:`RequestCacheInvalidException` for expired ones.
+    """
+
+    @property
+    @abc.abstractmethod
+    def stats(self):
+        """
+        Counters and current usage of the cache
+        """
+
+    @abc.abstractmethod
+    def put(self, key, value, size=None):
+        """
+        Store the value for the key, evicting the least recently used entries if the cache is full
+
+        :param key: the cache key
+        :param value: the value to store
+        :param size: size of the value in bytes (default: the ``size`` of the value)
+        """
+
+    @abc.abstractmethod
+    def remove(self, key):
+        """
+        Drop the entry for the key, if any
+        """
+
+    @abc.abstractmethod
+    def keys(self):
+        """
+        Keys of the stored entries, including the expired ones
+        """
+
+    @abc.abstractmethod
+    def get(self, key, stale=False):
+        """
+        Get the value stored for the key
+
+        :param key: the cache key
+        :param stale: return expired entries within the stale window as well
+        """
+
+    @abc.abstractmethod
+    def is_expired(self, key):
+        """
+        Check if the entry for the key is past its lifetime (missing keys are expired)
+        """
+
+    @abc.abstractmethod
+    def get_stale(self, key, default=None):
+        """
+        Get the value stored for the key, even if expired
+        """
+
+    @abc.abstractmethod
+    def touch(self, key):
+        """
+        Mark the entry as fresh, restarting its lifetime
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """
+        Drop all the entries
+        """
+
+
+class RequestCache(BaseRequestCache):
+    """
+    Bounded in-memory cache with LRU eviction and expiration time
+
+    Expired entries are dropped when read and by a sweep running at most
+    once every ``valid_time`` seconds, so memory is reclaimed even for keys
+    which are never requested again; entries carrying validators (see
+    :py:attr:`CachedResponse.validators`) are kept to revalidate them with
+    a conditional request. When any of the limits is exceeded the least
+    recently used entries are evicted.
+
+    With a ``stale_time``, expired entries can still be served for that many
+    seconds (see ``stale`` argument of :py:meth:`get`) while the requester
+    refreshes them in the background (stale-while-revalidate).
+
+    Updates are serialized by a lock (single entry lookups are atomic), so the
+    cache can be shared by many threads.
+
+    :param valid_time: lifetime of the entries in seconds
+    :param max_entries: maximum number of entries (``None`` for no limit)
+    :param max_bytes: maximum total size of the entries in bytes (``None`` for no limit)
+    :param stale_time: seconds after expiration during which an entry can still be served
+    """
+
+    def __init__(self, valid_time=60, max_entries=1000, max_bytes=50 * 1024 * 1024, stale_time=0):
         self._valid_time = valid_time
-        self._cache = {}
+        self._stale_time = stale_time
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = time.time()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
-    def put(self, key, value):
-        self._cache[key] = {"time": time.time(), "value": value}
+    def __getstate__(self):
+        with self._lock:
+            state = self.__dict__.copy()
+            state["_cache"] = self._cache.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @property
+    def stats(self):
+        """
+        Counters and current usage of the cache
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+            }
+
+    def put(self, key, value, size=None):
+        if size is None:
+            size = getattr(value, "size", None)
+            if size is None:
+                size = sys.getsizeof(value)
+        with self._lock:
+            self.remove(key)
+            self._cache[key] = {"time": time.time(), "value": value, "size": size}
+            self._bytes += size
+            self._sweep()
+            self._evict()
 
     def remove(self, key):
-        if key in self._cache:
-            del self._cache[key]
+        with self._lock:
+            if key in self._cache:
+                self._bytes -= self._cache.pop(key)["size"]
 
-    def get(self, key):
-        if key not in self._cache:
-            raise RequestCacheMissingException()
-        if time.time() > self._cache[key]["time"] + self._valid_time:
+    def keys(self):
+        with self._lock:
+            return list(self._cache)
+
+    def get(self, key, stale=False):
+        """
+        Get the value stored for the key
+
+        :param key: the cache key
+        :param stale: return expired entries within the stale window as well
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                raise RequestCacheMissingException()
+            age = time.time() - entry["time"]
+            if age > self._valid_time and not (stale and age <= self._valid_time + self._stale_time):
+                if age > self._valid_time + self._stale_time and not self._revalidable(entry):
+                    self.remove(key)
+                self.misses += 1
+                self.expirations += 1
+                raise RequestCacheInvalidException()
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def is_expired(self, key):
+        """
+        Check if the entry for the key is past its lifetime (missing keys are expired)
+        """
+        entry = self._cache.get(key)
+        return entry is None or time.time() > entry["time"] + self._valid_time
+
+    def get_stale(self, key, default=None):
+        """
+        Get the value stored for the key, even if expired
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return default
+        return entry["value"]
+
+    def touch(self, key):
+        """
+        Mark the entry as fresh, restarting its lifetime
+        """
+        with self._lock:
+            if key in self._cache:
+                self._cache[key]["time"] = time.time()
+                self._cache.move_to_end(key)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def _sweep(self):
+        now = time.time()
+        if now - self._last_sweep < self._valid_time:
+            return
+        self._last_sweep = now
+        expired = [
+            key
+            for key, entry in self._cache.items()
+            if now > entry["time"] + self._valid_time + self._stale_time and not self._revalidable(entry)
+        ]
+        for key in expired:
             self.remove(key)
+        self.expirations += len(expired)
+
+    @staticmethod
+    def _revalidable(entry):
+        return bool(getattr(entry["value"], "validators", None))
+
+    def _evict(self):
+        while self._cache and (
+            (self._max_entries is not None and len(self._cache) > self._max_entries)
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            _key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry["size"]
+            self.evictions += 1
+
+
+class SQLiteRequestCache(BaseRequestCache):
+    """
+    Persistent cache stored in a SQLite database
+
+    Processes on the same host pointing to the same file share the cached
+    responses: the database runs in WAL mode, so readers never block the
+    writer. Each thread uses its own connection. Expiration, stale window, sweeps and LRU eviction behave as in
+    :class:`RequestCache`; values are stored as JSON, hence they must be
+    :class:`CachedResponse` instances or JSON serializable.
+
+    To keep cache hits from competing for the database write lock, the last access
+    time used by the LRU eviction is only updated once every ``access_resolution``
+    of ``valid_time``.
+
+    :param path: path of the database file
+    :param valid_time: lifetime of the entries in seconds
+    :param max_entries: maximum number of entries (``None`` for no limit)
+    :param max_bytes: maximum total size of the entries in bytes (``None`` for no limit)
+    :param stale_time: seconds after expiration during which an entry can still be served
+    :param timeout: seconds to wait for the database lock held by other processes
+    """
+
+    #: Fraction of ``valid_time`` between two updates of the access time of an entry
+    access_resolution = 0.1
+
+    def __init__(self, path, valid_time=60, max_entries=1000, max_bytes=50 * 1024 * 1024, stale_time=0, timeout=5):
+        self.path = path
+        self._valid_time = valid_time
+        self._stale_time = stale_time
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, time REAL, accessed REAL, size INTEGER, revalidable INTEGER, value TEXT)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def __getstate__(self):
+        # the connections are opened again by the unpickled cache
+        state = self.__dict__.copy()
+        del state["_local"], state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        # sqlite connections can't be shared across threads nor forked processes
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            self._local.pid = pid
+            self._local.connection = sqlite3.connect(self.path, timeout=self._timeout)
+            self._local.connection.execute("PRAGMA journal_mode=WAL")
+        return self._local.connection
+
+    def close(self):
+        """
+        Close the database connection of the current thread
+        """
+        if getattr(self._local, "pid", None) == os.getpid():
+            self._local.connection.close()
+        self._local.pid = None
+
+    @property
+    def stats(self):
+        entries, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    @staticmethod
+    def _dumps(value):
+        if isinstance(value, CachedResponse):
+            return utils.json_dumps(
+                {
+                    "status_code": value.status_code,
+                    "headers": dict(value.headers),
+                    "data": value.data,
+                    "size": value.size,
+                }
+            )
+        return utils.json_dumps({"value": value})
+
+    @staticmethod
+    def _loads(value):
+        value = utils.json_loads(value)
+        if "value" in value:
+            return value["value"]
+        return CachedResponse(value["status_code"], value["headers"], value["data"], value["size"])
+
+    def put(self, key, value, size=None):
+        serialized = self._dumps(value)
+        if size is None:
+            size = getattr(value, "size", None)
+            if size is None:
+                size = len(serialized)
+        now = time.time()
+        revalidable = bool(getattr(value, "validators", None))
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, now, now, size, revalidable, serialized),
+            )
+        self._sweep()
+        self._evict()
+
+    def remove(self, key):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def keys(self):
+        return [key for (key,) in self._connection().execute("SELECT key FROM responses")]
+
+    def _entry(self, key):
+        return (
+            self._connection()
+            .execute("SELECT time, revalidable, value, accessed FROM responses WHERE key = ?", (key,))
+            .fetchone()
+        )
+
+    def get(self, key, stale=False):
+        entry = self._entry(key)
+        if entry is None:
+            self._count(misses=1)
+            raise RequestCacheMissingException()
+        stored, revalidable, value, accessed = entry
+        now = time.time()
+        age = now - stored
+        if age > self._valid_time and not (stale and age <= self._valid_time + self._stale_time):
+            if age > self._valid_time + self._stale_time and not revalidable:
+                self.remove(key)
+            self._count(misses=1, expirations=1)
             raise RequestCacheInvalidException()
-        return self._cache[key]["value"]
+        if now - accessed >= self._valid_time * self.access_resolution:
+            with self._connection() as connection:
+                connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._count(hits=1)
+        return self._loads(value)
+
+    def is_expired(self, key):
+        entry = self._entry(key)
+        return entry is None or time.time() > entry[0] + self._valid_time
+
+    def get_stale(self, key, default=None):
+        entry = self._entry(key)
+        if entry is None:
+            return default
+        return self._loads(entry[2])
+
+    def touch(self, key):
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute("UPDATE responses SET time = ?, accessed = ? WHERE key = ?", (now, now, key))
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def _sweep(self):
+        now = time.time()
+        if now - self._last_sweep < self._valid_time:
+            return
+        self._last_sweep = now
+        with self._connection() as connection:
+            expired = connection.execute(
+                "DELETE FROM responses WHERE time < ? AND NOT revalidable",
+                (now - self._valid_time - self._stale_time,),
+            ).rowcount
+        self._count(expirations=expired)
+
+    def _evict(self):
+        connection = self._connection()
+        entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if (self._max_entries is None or entries <= self._max_entries) and (
+            self._max_bytes is None or size <= self._max_bytes
+        ):
+            return
+        evicted = []
+        for key, entry_size in connection.execute("SELECT key, size FROM responses ORDER BY accessed, rowid"):
+            if (self._max_entries is None or entries <= self._max_entries) and (
+                self._max_bytes is None or size <= self._max_bytes
+            ):
+                break
+            evicted.append((key,))
+            entries -= 1
+            size -= entry_size
+        with connection:
+            connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self._count(evictions=len(evicted))
+
+    def _count(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+class RetryPolicy:
+    """
+    Retry policy of the requests failing for transient errors
+
+    Network errors and responses with one of the ``statuses`` are retried up to
+    ``max_attempts`` requests overall, waiting a random time up to
+    ``backoff_factor * 2 ** (attempt - 1)`` seconds (exponential backoff with full
+    jitter) or the time requested by the ``Retry-After`` header of the response;
+    responses asking to wait longer than ``max_backoff`` are not retried.
+    Only idempotent methods are retried by default: add ``"POST"`` to ``methods``
+    to retry creations as well (file uploads are never retried).
+
+    :param max_attempts: maximum number of attempts of each request (``1`` disables retries)
+    :param backoff_factor: base of the exponential backoff in seconds
+    :param max_backoff: maximum wait between two attempts in seconds
+    :param statuses: HTTP statuses to retry
+    :param methods: HTTP methods to retry
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_factor=0.5,
+        max_backoff=30,
+        statuses=(429, 500, 502, 503, 504),
+        methods=("GET", "PUT", "DELETE"),
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def is_retryable(self, method, attempt, response=None):
+        """
+        Check if a request should be retried
+
+        :param method: HTTP method of the request
+        :param attempt: number of the attempt just made, starting from 1
+        :param response: the response, ``None`` for network errors
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return False
+        if response is None:
+            return True
+        retry_after = self._retry_after(response)
+        return response.status_code in self.statuses and (retry_after is None or retry_after <= self.max_backoff)
+
+    def delay(self, attempt, response=None):
+        """
+        Seconds to wait before the next attempt
+        """
+        retry_after = self._retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def _retry_after(response):
+        # seconds requested by the Retry-After header (None if missing or invalid)
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+        try:
+            return max(email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled with ``rate`` tokens per second, holding up to ``burst`` tokens
+
+    :param rate: tokens added per second
+    :param burst: capacity of the bucket (defaults to ``rate``, at least one token)
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token, returning the seconds to wait before using it
+
+        Tokens are reserved in advance, so concurrent callers are scheduled one
+        after another instead of competing for the next token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0, -self._tokens / self.rate)
+
+
+class RateLimiter:
+    """
+    Client side rate limiter made of token buckets
+
+    Every request takes a token from the global bucket (if ``rate`` is given)
+    and from the bucket of each matching entry of ``limits``; the request is
+    delayed until all the tokens are available. ``limits`` maps an HTTP method
+    (``"POST"``), an endpoint (``"userstories"``) or both (``"POST userstories"``)
+    to a ``(rate, burst)`` tuple. An endpoint limit also applies to the actions
+    on its collection (``"userstories"`` covers ``userstories/bulk_create``).
+
+    The limiter is thread safe: share a single instance among the request makers
+    (e.g. through :class:`taiga.TaigaAPI`) to limit them altogether.
+
+    :param rate: maximum requests per second overall (``None`` for no global limit)
+    :param burst: maximum requests sent at once overall
+    :param limits: per method and endpoint limits
+    """
+
+    #: HTTP methods accepted in the ``limits`` keys
+    METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+
+    def __init__(self, rate=None, burst=None, limits=None):
+        self._buckets = {}
+        if rate is not None:
+            self._buckets[None] = TokenBucket(rate, burst)
+        for key, (key_rate, key_burst) in (limits or {}).items():
+            self._buckets[self._parse_key(key)] = TokenBucket(key_rate, key_burst)
+
+    @classmethod
+    def _parse_key(cls, key):
+        # "POST", "userstories" or "POST userstories" to a (method, endpoint) tuple
+        parts = key.split()
+        if len(parts) == 1:
+            parts = [parts[0], ""] if parts[0].upper() in cls.METHODS else ["", parts[0]]
+        if len(parts) != 2 or parts[0].upper() not in cls.METHODS + ("",) or parts[1] and not parts[1].strip("/"):
+            raise ValueError("Invalid rate limit {!r}: expected a method, an endpoint or both".format(key))
+        return parts[0].upper(), parts[1].strip("/")
+
+    def reserve(self, method, endpoint):
+        """
+        Take the tokens needed by a request, returning the seconds to wait before sending it
+
+        :param method: HTTP method of the request
+        :param endpoint: endpoint of the request (e.g. ``userstories``)
+        """
+        method = method.upper()
+        wait = 0
+        for key, bucket in self._buckets.items():
+            if key is None or (key[0] in ("", method) and self._matches(key[1], endpoint)):
+                wait = max(wait, bucket.reserve())
+        return wait
+
+    @staticmethod
+    def _matches(limit_endpoint, endpoint):
+        # endpoint limits cover the actions on the collection, as cache invalidation does
+        return not limit_endpoint or endpoint == limit_endpoint or endpoint.startswith(limit_endpoint + "/")
+
+    def acquire(self, method, endpoint):
+        """
+        Wait until a request can be sent
+        """
+        wait = self.reserve(method, endpoint)
+        if wait:
+            time.sleep(wait)
+
+
+class Credentials:
+    """
+    Token shared by the request makers of a client
+
+    The request makers read the token on each request, so replacing it with
+    :py:meth:`set` affects every resource and model at once. When a request
+    is rejected with ``401 Unauthorized`` the request maker calls :py:meth:`renew`,
+    which runs the ``refresh`` callback (a coroutine function for the asyncio
+    client) to get a new token; concurrent renewals are coalesced into a single
+    refresh.
+
+    :param token: the token
+    :param token_type: the token type
+    :param refresh: callable refreshing the token, called without arguments
+    """
+
+    def __init__(self, token, token_type="Bearer", refresh=None):
+        self._value = (token_type, token)
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._async_lock = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"], state["_async_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._async_lock = None
+
+    @property
+    def token(self):
+        return self._value[1]
+
+    @property
+    def token_type(self):
+        return self._value[0]
+
+    @property
+    def authorization(self):
+        return "{} {}".format(*self._value)
+
+    def set(self, token, token_type=None):
+        """
+        Replace the token (and its type) at once
+        """
+        self._value = (token_type or self._value[0], token)
+
+    def renew(self, authorization):
+        """
+        Refresh the token rejected by the server, returning ``True`` when a new one is available
+
+        :param authorization: the ``Authorization`` header of the rejected request
+        """
+        with self._lock:
+            if self.authorization != authorization:
+                # already refreshed by a concurrent request
+                return True
+            if self.refresh is None:
+                return False
+            try:
+                self.refresh()
+            except exceptions.TaigaException:
+                return False
+            return self.authorization != authorization
+
+    async def arenew(self, authorization):
+        """
+        Awaitable flavour of :py:meth:`renew`, awaiting the ``refresh`` coroutine function
+        """
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self.authorization != authorization:
+                return True
+            if self.refresh is None:
+                return False
+            try:
+                await self.refresh()
+            except exceptions.TaigaException:
+                return False
+            return self.authorization != authorization
 
 
 class RequestMakerException(Exception):  # noqa: N818
     pass
 
 
+def _rewind_files(files):
+    # rewind the files of an upload before sending it again, False if one of them can't be
+    for value in (files or {}).values():
+        fileobj = value[1] if isinstance(value, (tuple, list)) else value
+        if not hasattr(fileobj, "read"):
+            continue
+        try:
+            fileobj.seek(0)
+        except (AttributeError, OSError, ValueError):
+            return False
+    return True
+
+
+def create_session(pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True):
+    """
+    Build a :class:`requests.Session` backed by a connection pool
+
+    :param pool_connections: number of per-host connection pools to cache
+    :param pool_maxsize: maximum number of connections kept open per host
+    :param pool_block: block when the pool is exhausted instead of opening throw-away connections
+    :param keep_alive: reuse connections between requests
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def create_async_session(tls_verify=True, proxies=None, max_connections=100, max_keepalive_connections=20):
+    """
+    Build a :class:`httpx.AsyncClient` backed by a connection pool
+
+    Requires the optional ``httpx`` dependency (``pip install python-taiga[async]``).
+
+    :param tls_verify: verify server certificate
+    :param proxies: a dictionary of proxies to use for requests, in the same format used by requests
+    :param max_connections: maximum number of concurrent connections
+    :param max_keepalive_connections: maximum number of idle connections kept alive
+    """
+    import httpx
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    mounts = None
+    if proxies:
+        mounts = {
+            (scheme if "://" in scheme else "{}://".format(scheme)): httpx.AsyncHTTPTransport(
+                proxy=proxy, verify=tls_verify, limits=limits
+            )
+            for scheme, proxy in proxies.items()
+        }
+    return httpx.AsyncClient(verify=tls_verify, limits=limits, mounts=mounts)
+
+
 class RequestMaker:
     def __init__(
-        self, api_path, host, token, token_type="Bearer", tls_verify=True, enable_pagination=True, proxies=None
+        self,
+        api_path,
+        host,
+        token,
+        token_type="Bearer",
+        tls_verify=True,
+        enable_pagination=True,
+        proxies=None,
+        session=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        max_workers=1,
+        cache_reference_data=False,
+        cache=None,
+        retry=None,
+        rate_limiter=None,
+        credentials=None,
+        identity_map=None,
+    ):
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(pool_connections, pool_maxsize, pool_block, keep_alive)
+        self._setup(
+            session,
+            api_path,
+            host,
+            credentials if credentials is not None else Credentials(token, token_type),
+            tls_verify,
+            enable_pagination,
+            proxies,
+            max_workers,
+            cache_reference_data,
+            cache,
+            retry,
+            rate_limiter,
+            identity_map,
+        )
+        if not self.tls_verify:
+            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+
+    def _setup(
+        self,
+        session,
+        api_path,
+        host,
+        credentials,
+        tls_verify,
+        enable_pagination,
+        proxies,
+        max_workers,
+        cache_reference_data,
+        cache,
+        retry,
+        rate_limiter,
+        identity_map,
     ):
+        # settings shared by the sync and asyncio request makers
+        self.session = session
         self.api_path = api_path
         self.host = host
-        self.token = token
-        self.token_type = token_type
+        self.credentials = credentials
         self.tls_verify = tls_verify
         self.enable_pagination = enable_pagination
         self.proxies = proxies
-        self._cache = RequestCache()
-        if not self.tls_verify:
-            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+        self.max_workers = max_workers
+        self.cache_reference_data = cache_reference_data
+        self._cache = cache if cache is not None else RequestCache()
+        self.retry = retry if retry is not None else RetryPolicy(max_attempts=1)
+        self.rate_limiter = rate_limiter
+        self.identity_map = identity_map
+        self._reset_requests()
 
     @property
     def cache(self):
         return self._cache
 
+    #: Attributes tracking the requests in progress, which are not pickled
+    _REQUESTS_STATE = ("_refreshing", "_refresh_lock", "_inflight", "_inflight_lock", "_refresher")
+
+    def _reset_requests(self):
+        self._refreshing = {}
+        self._refresh_lock = threading.Lock()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._refresher = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in self._REQUESTS_STATE:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_requests()
+
+    @property
+    def token(self):
+        return self.credentials.token
+
+    @token.setter
+    def token(self, token):
+        self.credentials.set(token)
+
+    @property
+    def token_type(self):
+        return self.credentials.token_type
+
+    @token_type.setter
+    def token_type(self, token_type):
+        self.credentials.set(self.credentials.token, token_type)
+
+    @property
+    def authorization(self):
+        return self.credentials.authorization
+
+    def set_token(self, token, token_type=None):
+        """
+        Replace the credentials used by the following requests
+
+        Token and type are swapped at once, so requests running concurrently
+        in other threads always send a consistent pair.
+        """
+        self.credentials.set(token, token_type)
+
+    def close(self):
+        """
+        Release the pooled connections, unless the session was provided by the caller
+        """
+        with self._refresh_lock:
+            refresher, self._refresher = self._refresher, None
+        if refresher:
+            refresher.shutdown(wait=False)
+        if self._owns_session:
+            self.session.close()
+
     def is_bad_response(self, response):
         return 400 <= response.status_code <= 500
 
-    def headers(self, paginate=True):
+    def _send(self, method, full_url, retry=True, **kwargs):
+        # perform the request through the session, retrying transient errors as per the retry policy
+        # and replaying it once with a renewed token if rejected as unauthorized
+        attempt = 1
+        renewed = False
+        while True:
+            response = self._attempt(method, full_url, **kwargs)
+            if not renewed and self._renew(response, kwargs):
+                renewed = True
+                continue
+            if not self._should_retry(method, full_url, attempt, response, retry):
+                return response
+            if response is not None and kwargs.get("stream"):
+                response.close()
+            time.sleep(self.retry.delay(attempt, response))
+            attempt += 1
+
+    def _attempt(self, method, full_url, **kwargs):
+        # send the request once, returning None on network errors
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(method, self._endpoint(full_url))
+        try:
+            return getattr(self.session, method.lower())(full_url, **kwargs)
+        except RequestException:
+            return None
+
+    def _renew(self, response, kwargs):
+        # renew the token rejected by the server, updating the headers of the request to replay
+        if response is None or response.status_code != 401:
+            return False
+        if not self.credentials.renew(kwargs["headers"].get("Authorization")):
+            return False
+        kwargs["headers"] = dict(kwargs["headers"], Authorization=self.authorization)
+        if kwargs.get("stream"):
+            response.close()
+        return _rewind_files(kwargs.get("files"))
+
+    def _should_retry(self, method, full_url, attempt, response, retry):
+        # network errors (no response) which are not retried are raised
+        if retry and self.retry.is_retryable(method, attempt, response):
+            return True
+        if response is None:
+            raise exceptions.TaigaRestException(full_url, 400, "Network error!", method)
+        return False
+
+    def headers(self, paginate=True, lazy=True):
         headers = {
             "Content-type": "application/json",
-            "Authorization": "{} {}".format(self.token_type, self.token),
+            "Authorization": self.authorization,
         }
         if self.enable_pagination and paginate:
-            headers["x-lazy-pagination"] = "True"
+            if lazy:
+                headers["x-lazy-pagination"] = "True"
         else:
             headers["x-disable-pagination"] = "True"
         return headers
@@ -88,109 +1066,492 @@ class RequestMaker:
         full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
         return full_url
 
-    def get(self, uri, query=None, cache=False, paginate=True, **parameters):
+    def cache_key(self, uri, query=None, method="GET", paginate=True, lazy=True, **parameters):
+        """
+        Build the cache key of a request
+
+        The key is made of the method, the URL, the sorted query parameters (both the ones
+        in ``uri`` and in ``query``), the pagination mode and a digest of the credentials.
+        """
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        return self._cache_key(method, full_url, query, self.headers(paginate, lazy))
+
+    def _cache_key(self, method, full_url, query, headers):
+        url = urlsplit(full_url)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        for key, value in (query or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple)):
+                params.extend((key, str(item)) for item in value)
+            else:
+                params.append((key, str(value)))
+        flags = sorted(key.lower() for key in headers if key.lower().startswith("x-"))
+        credentials = hashlib.sha256(headers.get("Authorization", "").encode("utf-8")).hexdigest()[:16]
+        return "{} {}?{} {} {}".format(
+            method, urlunsplit(url._replace(query="")), urlencode(sorted(params)), ",".join(flags), credentials
+        )
+
+    def get(self, uri, query=None, cache=False, paginate=True, lazy=True, **parameters):
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        headers = self.headers(paginate, lazy)
+        key = self._cache_key("GET", full_url, query, headers)
+        if not cache:
+            return self._single_flight(key, full_url, headers, query)
         try:
-            full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
-
-            result = None
-
-            if cache:
-                try:
-                    result = self._cache.get(full_url)
-                except RequestCacheException:
-                    pass
-
-            if not result:
-                result = requests.get(
-                    full_url,
-                    headers=self.headers(paginate),
-                    params=query or {},
-                    verify=self.tls_verify,
-                    proxies=self.proxies,
-                )
-            if cache:
-                self._cache.put(full_url, result)
-        except RequestException:
-            raise exceptions.TaigaRestException(full_url, 400, "Network error!", "GET")
+            result = self._cache.get(key, stale=True)
+        except RequestCacheException:
+            return self._single_flight(key, full_url, headers, query, key)
+        if self._cache.is_expired(key):
+            self._refresh(full_url, headers, query, key)
+        return result
+
+    def stream(self, uri, query=None, **parameters):
+        """
+        Send an unpaginated GET request without reading the response body
+
+        The body is read while iterating over ``iter_content`` of the returned
+        response, which must be closed (e.g. using it as a context manager).
+        """
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        result = self._send(
+            "GET",
+            full_url,
+            headers=self.headers(paginate=False),
+            params=query or {},
+            verify=self.tls_verify,
+            proxies=self.proxies,
+            stream=True,
+        )
+        if self.is_bad_response(result):
+            with result:
+                raise exceptions.TaigaRestException(full_url, result.status_code, result.text, "GET")
+        return result
+
+    def _single_flight(self, key, full_url, headers, query, cache_key=None):
+        # concurrent identical requests wait for the first one and share its decoded response
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = self._inflight[key] = {"future": Future(), "followers": 0}
+                leader = True
+            else:
+                flight["followers"] += 1
+                leader = False
+        if not leader:
+            return flight["future"].result()
+        try:
+            result = self._get(full_url, headers, query, cache_key)
+        except BaseException as e:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight["future"].set_exception(e)
+            raise
+        with self._inflight_lock:
+            del self._inflight[key]
+        flight["future"].set_result(self._shared_response(result) if flight["followers"] else None)
+        return result
+
+    @staticmethod
+    def _shared_response(response):
+        if isinstance(response, CachedResponse):
+            return response
+        try:
+            return CachedResponse.from_response(response)
+        except ValueError:
+            return response
+
+    def _get(self, full_url, headers, query, cache_key=None):
+        stale = None
+        if cache_key is not None:
+            stale = self._cache.get_stale(cache_key)
+            if stale is not None:
+                headers = dict(headers, **stale.validators)
+        result = self._send(
+            "GET", full_url, headers=headers, params=query or {}, verify=self.tls_verify, proxies=self.proxies
+        )
         if not self.is_bad_response(result):
+            if stale is not None and result.status_code == 304:
+                self._cache.touch(cache_key)
+                return stale
+            if cache_key is not None:
+                result = self._cache_response(cache_key, result)
             return result
         else:
             raise exceptions.TaigaRestException(full_url, result.status_code, result.text, "GET")
 
+    def _refresh(self, full_url, headers, query, cache_key):
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taiga-cache-refresh")
+            self._refreshing[cache_key] = self._refresher.submit(
+                self._refresh_entry, full_url, headers, query, cache_key
+            )
+
+    def _refresh_entry(self, full_url, headers, query, cache_key):
+        try:
+            self._get(full_url, headers, query, cache_key)
+        except exceptions.TaigaException:
+            # the stale value is served until the end of the stale window
+            pass
+        finally:
+            with self._refresh_lock:
+                self._refreshing.pop(cache_key, None)
+
+    @staticmethod
+    def _resource_path(path):
+        # split an API path in the endpoint and the id of the object (if any)
+        segments = [segment for segment in path.split("/") if segment]
+        for index, segment in enumerate(segments):
+            if segment.isdigit():
+                return segments[:index], segment
+        return segments, None
+
+    def _endpoint(self, full_url):
+        return "/".join(
+            self._resource_path(full_url[len(self.urljoin(self.host, self.api_path)) :].split("?", 1)[0])[0]
+        )
+
+    def _invalidate(self, full_url, payload=None):
+        """
+        Evict the cached responses affected by a write to ``full_url``
+
+        The written object, the lists and lookups of its endpoint and, when known,
+        the project the object belongs to are evicted; other objects are kept unless
+        the write is an action on the whole collection.
+        """
+        root = self.urljoin(self.host, self.api_path)
+        endpoint, object_id = self._resource_path(full_url[len(root) :])
+        projects = set()
+        if isinstance(payload, dict) and (payload.get("project") or payload.get("project_id")):
+            projects.add(str(payload.get("project") or payload["project_id"]))
+        evicted, project_keys = [], []
+        for key in self._cache.keys():
+            url = key.split(" ", 2)[1].split("?", 1)[0]
+            if not url.startswith(root):
+                continue
+            cached_endpoint, cached_id = self._resource_path(url[len(root) :])
+            if cached_id is None:
+                # lists and lookups of the endpoint, its parents and children
+                common = min(len(endpoint), len(cached_endpoint))
+                stale = cached_endpoint[:common] == endpoint[:common]
+            elif object_id is None:
+                # actions on a whole collection (e.g. bulk updates) may change any of its objects
+                stale = len(endpoint) > len(cached_endpoint) and endpoint[: len(cached_endpoint)] == cached_endpoint
+            else:
+                stale = cached_endpoint == endpoint and cached_id == object_id
+            if stale:
+                evicted.append(key)
+                data = getattr(self._cache.get_stale(key), "data", None)
+                if cached_id is not None and isinstance(data, dict) and data.get("project"):
+                    projects.add(str(data["project"]))
+            elif cached_endpoint == ["projects"]:
+                project_keys.append((key, cached_id))
+        evicted.extend(key for key, project_id in project_keys if project_id in projects)
+        for key in evicted:
+            self._cache.remove(key)
+
+    def _cache_response(self, key, response):
+        try:
+            cached = CachedResponse.from_response(response)
+        except ValueError:
+            return response
+        self._cache.put(key, cached)
+        return cached
+
     def post(self, uri, payload=None, query=None, files=None, **parameters):
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
         if files:
             headers = {
-                "Authorization": "{} {}".format(self.token_type, self.token),
+                "Authorization": self.authorization,
                 "x-disable-pagination": "True",
             }
             data = payload
         else:
             headers = self.headers()
-            data = json.dumps(payload)
+            data = utils.json_dumps(payload)
             files = {}
-        try:
-            full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
-            result = requests.post(
-                full_url,
-                headers=headers,
-                data=data,
-                params=query or {},
-                files=files,
-                verify=self.tls_verify,
-                proxies=self.proxies,
-            )
-        except RequestException:
-            raise exceptions.TaigaRestException(full_url, 400, "Network error!", "POST")
+        result = self._send(
+            "POST",
+            full_url,
+            retry=not files,
+            headers=headers,
+            data=data,
+            params=query or {},
+            files=files,
+            verify=self.tls_verify,
+            proxies=self.proxies,
+        )
+        self._invalidate(full_url, payload)
         if not self.is_bad_response(result):
             return result
         else:
             raise exceptions.TaigaRestException(full_url, result.status_code, result.text, "POST")
 
     def delete(self, uri, query=None, **parameters):
-        try:
-            full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
-            result = requests.delete(
-                full_url, headers=self.headers(), params=query or {}, verify=self.tls_verify, proxies=self.proxies
-            )
-        except RequestException:
-            raise exceptions.TaigaRestException(full_url, 400, "Network error!", "DELETE")
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        result = self._send(
+            "DELETE",
+            full_url,
+            headers=self.headers(),
+            params=query or {},
+            verify=self.tls_verify,
+            proxies=self.proxies,
+        )
+        self._invalidate(full_url, None)
         if not self.is_bad_response(result):
             return result
         else:
             raise exceptions.TaigaRestException(full_url, result.status_code, result.text, "DELETE")
 
     def put(self, uri, payload=None, query=None, **parameters):
-        try:
-            full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
-            result = requests.put(
-                full_url,
-                headers=self.headers(),
-                data=json.dumps(payload),
-                params=query or {},
-                verify=self.tls_verify,
-                proxies=self.proxies,
-            )
-        except RequestException:
-            raise exceptions.TaigaRestException(full_url, 400, "Network error!", "PUT")
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        result = self._send(
+            "PUT",
+            full_url,
+            headers=self.headers(),
+            data=utils.json_dumps(payload),
+            params=query or {},
+            verify=self.tls_verify,
+            proxies=self.proxies,
+        )
+        self._invalidate(full_url, payload)
         if not self.is_bad_response(result):
             return result
         else:
             raise exceptions.TaigaRestException(full_url, result.status_code, result.text, "PUT")
 
     def patch(self, uri, payload=None, query=None, **parameters):
-        try:
-            full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
-            result = requests.patch(
-                full_url,
-                headers=self.headers(),
-                data=json.dumps(payload),
-                params=query or {},
-                verify=self.tls_verify,
-                proxies=self.proxies,
-            )
-        except RequestException:
-            raise exceptions.TaigaRestException(full_url, 400, "Network error!", "PATCH")
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        result = self._send(
+            "PATCH",
+            full_url,
+            headers=self.headers(),
+            data=utils.json_dumps(payload),
+            params=query or {},
+            verify=self.tls_verify,
+            proxies=self.proxies,
+        )
+        self._invalidate(full_url, payload)
         if not self.is_bad_response(result):
             return result
         else:
             raise exceptions.TaigaRestException(full_url, result.status_code, result.text, "PATCH")
+
+
+class AsyncRequestMaker(RequestMaker):
+    """
+    Awaitable flavour of :class:`RequestMaker` running on top of :class:`httpx.AsyncClient`
+
+    Requires the optional ``httpx`` dependency (``pip install python-taiga[async]``).
+    """
+
+    def __init__(
+        self,
+        api_path,
+        host,
+        token,
+        token_type="Bearer",
+        tls_verify=True,
+        enable_pagination=True,
+        proxies=None,
+        session=None,
+        max_connections=100,
+        max_keepalive_connections=20,
+        max_workers=1,
+        cache_reference_data=False,
+        cache=None,
+        retry=None,
+        rate_limiter=None,
+        credentials=None,
+        identity_map=None,
+    ):
+        self._owns_session = session is None
+        if session is None:
+            session = create_async_session(tls_verify, proxies, max_connections, max_keepalive_connections)
+        self._setup(
+            session,
+            api_path,
+            host,
+            credentials if credentials is not None else Credentials(token, token_type),
+            tls_verify,
+            enable_pagination,
+            proxies,
+            max_workers,
+            cache_reference_data,
+            cache,
+            retry,
+            rate_limiter,
+            identity_map,
+        )
+
+    async def close(self):
+        """
+        Release the pooled connections, unless the session was provided by the caller
+        """
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        for flight in list(self._inflight.values()):
+            flight["task"].cancel()
+        if self._owns_session:
+            await self.session.aclose()
+
+    async def _request(self, method, full_url, payload=None, retry=True, stream=False, **kwargs):
+        result = await self._asend(method, full_url, retry, stream, **kwargs)
+        if method != "GET":
+            self._invalidate(full_url, payload)
+        if not self.is_bad_response(result):
+            return result
+        else:
+            if stream:
+                await result.aread()
+                await result.aclose()
+            raise exceptions.TaigaRestException(full_url, result.status_code, result.text, method)
+
+    async def _asend(self, method, full_url, retry, stream, **kwargs):
+        # awaitable flavour of :py:meth:`RequestMaker._send`
+        attempt = 1
+        renewed = False
+        while True:
+            result = await self._aattempt(method, full_url, stream, **kwargs)
+            if not renewed and await self._arenew(result, stream, kwargs):
+                renewed = True
+                continue
+            if not self._should_retry(method, full_url, attempt, result, retry):
+                return result
+            if result is not None and stream:
+                await result.aclose()
+            await asyncio.sleep(self.retry.delay(attempt, result))
+            attempt += 1
+
+    async def _aattempt(self, method, full_url, stream, **kwargs):
+        import httpx
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(method, self._endpoint(full_url))
+            if wait:
+                await asyncio.sleep(wait)
+        try:
+            if stream:
+                request = self.session.build_request(method, full_url, **kwargs)
+                return await self.session.send(request, stream=True)
+            return await self.session.request(method, full_url, **kwargs)
+        except httpx.RequestError:
+            return None
+
+    async def _arenew(self, result, stream, kwargs):
+        if result is None or result.status_code != 401:
+            return False
+        if not await self.credentials.arenew(kwargs["headers"].get("Authorization")):
+            return False
+        kwargs["headers"] = dict(kwargs["headers"], Authorization=self.authorization)
+        if stream:
+            await result.aclose()
+        return _rewind_files(kwargs.get("files"))
+
+    async def stream(self, uri, query=None, **parameters):
+        """
+        Send an unpaginated GET request without reading the response body
+
+        The body is read while iterating over ``aiter_bytes`` of the returned
+        response, which must be closed with ``aclose``.
+        """
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        return await self._request(
+            "GET", full_url, headers=self.headers(paginate=False), params=query or {}, stream=True
+        )
+
+    async def get(self, uri, query=None, cache=False, paginate=True, lazy=True, **parameters):
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        headers = self.headers(paginate, lazy)
+        key = self._cache_key("GET", full_url, query, headers)
+        if not cache:
+            return await self._single_flight(key, full_url, headers, query)
+        try:
+            result = self._cache.get(key, stale=True)
+        except RequestCacheException:
+            return await self._single_flight(key, full_url, headers, query, key)
+        if self._cache.is_expired(key):
+            self._refresh(full_url, headers, query, key)
+        return result
+
+    async def _single_flight(self, key, full_url, headers, query, cache_key=None):
+        # the request runs in its own task, so cancelling one of the callers doesn't cancel the others
+        flight = self._inflight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(self._get(full_url, headers, query, cache_key))
+            flight = self._inflight[key] = {"task": task}
+            task.add_done_callback(functools.partial(self._land, key, flight))
+            return await asyncio.shield(task)
+        result = await asyncio.shield(flight["task"])
+        if "shared" not in flight:
+            flight["shared"] = self._shared_response(result)
+        return flight["shared"]
+
+    def _land(self, key, flight, task):
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if not task.cancelled():
+            # retrieve the error, even if all the callers were cancelled
+            task.exception()
+
+    async def _get(self, full_url, headers, query, cache_key=None):
+        stale = None
+        if cache_key is not None:
+            stale = self._cache.get_stale(cache_key)
+            if stale is not None:
+                headers = dict(headers, **stale.validators)
+        result = await self._request("GET", full_url, headers=headers, params=query or {})
+        if stale is not None and result.status_code == 304:
+            self._cache.touch(cache_key)
+            return stale
+        if cache_key is not None:
+            result = self._cache_response(cache_key, result)
+        return result
+
+    def _refresh(self, full_url, headers, query, cache_key):
+        if cache_key not in self._refreshing:
+            self._refreshing[cache_key] = asyncio.ensure_future(
+                self._refresh_entry(full_url, headers, query, cache_key)
+            )
+
+    async def _refresh_entry(self, full_url, headers, query, cache_key):
+        try:
+            await self._get(full_url, headers, query, cache_key)
+        except exceptions.TaigaException:
+            # the stale value is served until the end of the stale window
+            pass
+        finally:
+            self._refreshing.pop(cache_key, None)
+
+    async def post(self, uri, payload=None, query=None, files=None, **parameters):
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        if files:
+            headers = {
+                "Authorization": self.authorization,
+                "x-disable-pagination": "True",
+            }
+            return await self._request(
+                "POST", full_url, payload, retry=False, headers=headers, data=payload, files=files, params=query or {}
+            )
+        return await self._request(
+            "POST", full_url, payload, headers=self.headers(), content=utils.json_dumps(payload), params=query or {}
+        )
+
+    async def delete(self, uri, query=None, **parameters):
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        return await self._request("DELETE", full_url, headers=self.headers(), params=query or {})
+
+    async def put(self, uri, payload=None, query=None, **parameters):
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        return await self._request(
+            "PUT", full_url, payload, headers=self.headers(), content=utils.json_dumps(payload), params=query or {}
+        )
+
+    async def patch(self, uri, payload=None, query=None, **parameters):
+        full_url = self.urljoin(self.host, self.api_path, uri.format(**parameters))
+        return await self._request(
+            "PATCH", full_url, payload, headers=self.headers(), content=utils.json_dumps(payload), params=query or {}
+        )
@@ -1,2 +1,136 @@
+import codecs
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
 def urljoin(*parts):
     return "/".join(part.strip("/") for part in parts)
+
+
+def copy_json(value):
+    """
+    Copy a decoded JSON value, faster than :py:func:`copy.deepcopy` as it only handles JSON types
+    """
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+def json_dumps(value):
+    """
+    Encode a value as JSON bytes, using :mod:`orjson` when installed
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value).encode("utf-8")
+
+
+def json_loads(data):
+    """
+    Decode JSON from bytes or text, using :mod:`orjson` when installed
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_response(response):
+    """
+    Decode the JSON body of a response straight from its bytes
+
+    Objects without a raw body (e.g. cached responses) are decoded by their own ``json`` method.
+    """
+    content = getattr(response, "content", None)
+    if not isinstance(content, (bytes, str)):
+        return response.json()
+    return json_loads(content)
+
+
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+class JSONArrayDecoder:
+    """
+    Incremental decoder of a JSON array
+
+    Chunks of the document (bytes or text) are fed as they are received and the
+    items of the array are returned as soon as they are complete, so the whole
+    document is never held in memory.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk, final=False):
+        """
+        Decode a chunk of the document, returning the items completed by it
+
+        :param chunk: the next chunk of the document
+        :param final: the chunk is the last one
+        """
+        text = self._utf8.decode(chunk, final) if isinstance(chunk, bytes) else chunk
+        buffer = self._buffer[self._position :] + text
+        position = 0
+        items = []
+        while not self._finished:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position == len(buffer):
+                break
+            if not self._started or buffer[position] == "]":
+                position = self._bracket(buffer, position)
+                continue
+            decoded = self._decode(buffer, position, final)
+            if decoded is None:
+                break
+            item, position = decoded
+            items.append(item)
+        if final and not self._finished:
+            raise ValueError("Unterminated JSON array")
+        self._buffer, self._position = buffer, position
+        return items
+
+    def _bracket(self, buffer, position):
+        # opening or closing bracket of the array
+        if self._started:
+            self._finished = True
+            return position
+        if buffer[position] != "[":
+            raise ValueError("Expecting a JSON array")
+        self._started = True
+        return position + 1
+
+    def _decode(self, buffer, position, final):
+        # the item at position and the position after it, None if it may be completed by the next chunk
+        try:
+            item, end = self._decoder.raw_decode(buffer, position)
+        except ValueError:
+            if final:
+                raise
+            return None
+        if not final and buffer[position] in "-0123456789" and _NUMBER_TAIL.match(buffer, end):
+            # a number could continue in the next chunk (e.g. "1." followed by "5")
+            return None
+        return item, end
+
+
+def iter_json_array(chunks):
+    """
+    Iterate over the items of a JSON array received in chunks
+    """
+    decoder = JSONArrayDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.feed(b"", final=True)
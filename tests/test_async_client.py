@@ -0,0 +1,394 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+import taiga.exceptions
+from taiga import AsyncTaigaAPI
+from taiga.models import Issue, Issues, Priorities, Project, Task, UserStory
+from taiga.models.base import AsyncListResource, SearchableList, async_resource
+from taiga.requestmaker import AsyncRequestMaker, RequestCache, RetryPolicy
+
+from .tools import MockResponse, create_mock_json
+
+
+class TestAsyncRequestMaker(unittest.IsolatedAsyncioTestCase):
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_call_get(self, request):
+        rm = AsyncRequestMaker(api_path="/v1/", host="http://host", token="f4k3")
+        request.return_value = MockResponse(200, "")
+        await rm.get("nowhere", query={"a": 1})
+        request.assert_awaited_once_with(
+            "GET",
+            "http://host/v1/nowhere",
+            headers={"Content-type": "application/json", "Authorization": "Bearer f4k3", "x-lazy-pagination": "True"},
+            params={"a": 1},
+        )
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_call_post(self, request):
+        rm = AsyncRequestMaker(api_path="/v1/", host="http://host", token="f4k3")
+        request.return_value = MockResponse(200, "")
+        await rm.post("nowhere", payload={"subject": "s"})
+        self.assertEqual(request.call_args.args, ("POST", "http://host/v1/nowhere"))
+        self.assertEqual(json.loads(request.call_args.kwargs["content"]), {"subject": "s"})
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_raise_exception_on_bad_response(self, request):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3")
+        request.return_value = MockResponse(400, "")
+        for method in (rm.get, rm.post, rm.put, rm.patch, rm.delete):
+            with self.assertRaises(taiga.exceptions.TaigaRestException):
+                await method("/nowhere")
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_raise_exception_on_network_error(self, request):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3")
+        request.side_effect = httpx.ConnectError("boom")
+        with self.assertRaises(taiga.exceptions.TaigaRestException):
+            await rm.get("/nowhere")
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_retry(self, request, sleep):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3", retry=RetryPolicy(max_attempts=3))
+        request.side_effect = [
+            httpx.ConnectError("boom"),
+            MockResponse(503, "", {"Retry-After": "1"}),
+            MockResponse(200, ""),
+        ]
+        await rm.get("/nowhere")
+        self.assertEqual(request.await_count, 3)
+        sleep.assert_awaited_with(1)
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_concurrent_gets_share_request(self, request):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3")
+
+        async def get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return MockResponse(200, '{"id": 1}')
+
+        request.side_effect = get
+        responses = await asyncio.gather(*(rm.get("/nowhere") for _ in range(3)), rm.get("/other"))
+        self.assertEqual(request.await_count, 2)
+        self.assertEqual([response.json() for response in responses], [{"id": 1}] * 4)
+
+        async def fail(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("boom")
+
+        request.side_effect = fail
+        results = await asyncio.gather(rm.get("/nowhere"), rm.get("/nowhere"), return_exceptions=True)
+        self.assertEqual(request.await_count, 3)
+        self.assertTrue(all(isinstance(result, taiga.exceptions.TaigaRestException) for result in results))
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_cancelled_get_keeps_shared_request(self, request):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3")
+
+        async def get(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return MockResponse(200, '{"id": 1}')
+
+        request.side_effect = get
+        first = asyncio.ensure_future(asyncio.wait_for(rm.get("/nowhere"), 0.01))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(rm.get("/nowhere"))
+        with self.assertRaises(asyncio.TimeoutError):
+            await first
+        self.assertEqual((await second).json(), {"id": 1})
+        self.assertEqual(request.await_count, 1)
+        self.assertEqual(rm._inflight, {})
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_get_with_cache(self, request):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3")
+        request.return_value = MockResponse(200, "{}")
+        await rm.get("/nowhere", cache=True)
+        await rm.get("/nowhere", cache=True)
+        self.assertEqual(request.await_count, 1)
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    @patch("time.time")
+    async def test_get_with_stale_cache(self, mock_time, request):
+        mock_time.return_value = 0
+        rm = AsyncRequestMaker(
+            api_path="/", host="host", token="f4k3", cache=RequestCache(valid_time=60, stale_time=300)
+        )
+        request.return_value = MockResponse(200, '{"id": 1}')
+        await rm.get("/nowhere", cache=True)
+        mock_time.return_value = 100
+        request.return_value = MockResponse(200, '{"id": 2}')
+        self.assertEqual((await rm.get("/nowhere", cache=True)).json(), {"id": 1})
+        self.assertEqual((await rm.get("/nowhere", cache=True)).json(), {"id": 1})
+        tasks = list(rm._refreshing.values())
+        self.assertEqual(len(tasks), 1)
+        await tasks[0]
+        self.assertEqual(request.await_count, 2)
+        self.assertEqual((await rm.get("/nowhere", cache=True)).json(), {"id": 2})
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    async def test_invalidate_cache_on_update(self, request):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3")
+        request.return_value = MockResponse(200, '{"id": 1}')
+        await rm.get("/tasks/1", cache=True)
+        await rm.put("/tasks/1", payload={"subject": "subject"})
+        await rm.get("/tasks/1", cache=True)
+        self.assertEqual(request.await_count, 3)
+
+
+class TestAsyncTaigaAPI(unittest.IsolatedAsyncioTestCase):
+    def test_async_resources(self):
+        api = AsyncTaigaAPI(token="f4k3")
+        self.assertIsInstance(api.raw_request, AsyncRequestMaker)
+        self.assertIsInstance(api.user_stories, AsyncListResource)
+        self.assertIs(api.issues.instance, Issue)
+        self.assertIs(async_resource(Issues), type(api.issues))
+        self.assertIs(api.raw_request.session, api.session)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_list(self, mock_get):
+        mock_get.return_value = MockResponse(200, create_mock_json("tests/resources/userstories_list_success.json"))
+        api = AsyncTaigaAPI(token="f4k3")
+        user_stories = await api.user_stories.list(project=1)
+        mock_get.assert_awaited_once_with("userstories", query={"project": 1}, paginate=True)
+        self.assertIsInstance(user_stories, SearchableList)
+        self.assertIsInstance(user_stories[0], UserStory)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_list_pages(self, mock_get):
+        mock_get.side_effect = [
+            MockResponse(200, json.dumps([{"id": 1}]), {"X-Pagination-Next": "url"}),
+            MockResponse(200, json.dumps([{"id": 2}])),
+        ]
+        api = AsyncTaigaAPI(token="f4k3")
+        tasks = await api.tasks.list()
+        self.assertEqual([task.id for task in tasks], [1, 2])
+        mock_get.assert_awaited_with("tasks", query={"page": 2})
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_list_concurrent_pages(self, mock_get):
+        async def get_page(endpoint, query, **kwargs):
+            page = query.get("page", 1)
+            headers = {"X-Pagination-Count": "3", "X-Paginated-By": "1"} if page == 1 else {}
+            return MockResponse(200, json.dumps([{"id": page}]), headers)
+
+        mock_get.side_effect = get_page
+        api = AsyncTaigaAPI(token="f4k3", max_workers=2)
+        tasks = await api.tasks.list()
+        self.assertEqual([task.id for task in tasks], [1, 2, 3])
+        mock_get.assert_any_await("tasks", query={}, paginate=True, lazy=False)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_iter(self, mock_get):
+        mock_get.side_effect = [
+            MockResponse(200, json.dumps([{"id": 1}]), {"X-Pagination-Next": "url"}),
+            MockResponse(200, json.dumps([{"id": 2}])),
+        ]
+        api = AsyncTaigaAPI(token="f4k3")
+        tasks = [task async for task in api.tasks.iter(project=1)]
+        self.assertEqual([task.id for task in tasks], [1, 2])
+        mock_get.assert_awaited_with("tasks", query={"project": 1, "page": 2})
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.stream", new_callable=AsyncMock)
+    async def test_iter_without_pagination(self, mock_stream):
+        response = MockResponse(200, json.dumps([{"id": 1}, {"id": 2}]))
+        mock_stream.return_value = response
+        api = AsyncTaigaAPI(token="f4k3")
+        tasks = [task async for task in api.tasks.iter(pagination=False, project=1)]
+        self.assertEqual([task.id for task in tasks], [1, 2])
+        mock_stream.assert_awaited_once_with("tasks", query={"project": 1})
+        self.assertTrue(response.closed)
+
+    @patch("httpx.AsyncClient.send", new_callable=AsyncMock)
+    async def test_stream(self, send):
+        rm = AsyncRequestMaker(api_path="/", host="host", token="f4k3")
+        send.return_value = MockResponse(200, "[]")
+        self.assertIs(await rm.stream("nowhere"), send.return_value)
+        request = send.call_args.args[0]
+        self.assertEqual(request.headers["x-disable-pagination"], "True")
+        self.assertEqual(send.call_args.kwargs, {"stream": True})
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_get(self, mock_get):
+        mock_get.return_value = MockResponse(200, create_mock_json("tests/resources/task_details_success.json"))
+        api = AsyncTaigaAPI(token="f4k3")
+        task = await api.tasks.get(1)
+        mock_get.assert_awaited_once_with("/{endpoint}/{id}", endpoint="tasks", id=1)
+        self.assertIsInstance(task, Task)
+        self.assertIs(task.requester, api.raw_request)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.post", new_callable=AsyncMock)
+    async def test_create(self, mock_post):
+        mock_post.return_value = MockResponse(200, create_mock_json("tests/resources/issue_details_success.json"))
+        api = AsyncTaigaAPI(token="f4k3")
+        issue = await api.issues.create(1, "subject", 2, 3, 4, 5, description="desc")
+        mock_post.assert_awaited_once_with(
+            "issues",
+            payload={
+                "project": 1,
+                "subject": "subject",
+                "priority": 2,
+                "status": 3,
+                "type": 4,
+                "severity": 5,
+                "description": "desc",
+            },
+        )
+        self.assertIsInstance(issue, Issue)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.put", new_callable=AsyncMock)
+    async def test_update(self, mock_put):
+        mock_put.return_value = MockResponse(200, '{"version": 3}')
+        api = AsyncTaigaAPI(token="f4k3")
+        task = Task(api.raw_request, id=1, subject="subject", version=2)
+        await api.tasks.update(task, comment="comment")
+        mock_put.assert_awaited_once_with(
+            "/{endpoint}/{id}",
+            endpoint="tasks",
+            id=1,
+            payload={"subject": "subject", "version": 2, "comment": "comment"},
+        )
+        self.assertEqual(task.version, 3)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.post", new_callable=AsyncMock)
+    async def test_bulk_create(self, mock_post):
+        async def post(uri, endpoint, payload):
+            await asyncio.sleep(0.01 * len(payload["bulk_stories"].split("\n")))
+            return MockResponse(
+                200, json.dumps([{"id": 1, "subject": line} for line in payload["bulk_stories"].split("\n")])
+            )
+
+        mock_post.side_effect = post
+        api = AsyncTaigaAPI(token="f4k3")
+        subjects = ["Story {}".format(index) for index in range(5)]
+        stories = await api.user_stories.bulk_create(1, subjects, chunk_size=3, max_workers=2)
+        self.assertEqual([story.subject for story in stories], subjects)
+        self.assertIsInstance(stories[0], UserStory)
+        self.assertEqual(mock_post.await_count, 2)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.patch", new_callable=AsyncMock)
+    async def test_save(self, mock_patch):
+        mock_patch.return_value = MockResponse(200, '{"version": 3}')
+        api = AsyncTaigaAPI(token="f4k3")
+        task = Task(api.raw_request, id=1, subject="subject", description="description", version=2)
+        await api.tasks.save(task)
+        mock_patch.assert_not_awaited()
+        task.subject = "new subject"
+        await api.tasks.save(task)
+        mock_patch.assert_awaited_once_with(
+            "/{endpoint}/{id}", endpoint="tasks", id=1, payload={"subject": "new subject", "version": 2}
+        )
+        self.assertEqual(task.version, 3)
+        self.assertEqual(task.dirty_fields, frozenset())
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.patch", new_callable=AsyncMock)
+    async def test_patch(self, mock_patch):
+        mock_patch.return_value = MockResponse(200, '{"version": 3}')
+        api = AsyncTaigaAPI(token="f4k3")
+        task = Task(api.raw_request, id=1, subject="subject", version=2)
+        await api.tasks.patch(task, ["subject"], version=2)
+        mock_patch.assert_awaited_once_with(
+            "/{endpoint}/{id}", endpoint="tasks", id=1, payload={"subject": "subject", "version": 2}
+        )
+        self.assertEqual(task.version, 3)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.delete", new_callable=AsyncMock)
+    async def test_delete(self, mock_delete):
+        api = AsyncTaigaAPI(token="f4k3")
+        await api.tasks.delete(1)
+        mock_delete.assert_awaited_once_with("/{endpoint}/{id}", endpoint="tasks", id=1, query=None)
+        await api.priorities.delete(1, 2)
+        self.assertIsInstance(api.priorities, Priorities)
+        mock_delete.assert_awaited_with("/{endpoint}/{id}", endpoint="priorities", id=1, query={"moveTo": 2})
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_search(self, mock_get):
+        mock_get.return_value = MockResponse(200, create_mock_json("tests/resources/search_success.json"))
+        api = AsyncTaigaAPI(token="f4k3")
+        search_result = await api.search(1, "NEW")
+        self.assertEqual(search_result.count, 3)
+        self.assertIsInstance(search_result.user_stories[0], UserStory)
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_auth(self, mock_post):
+        mock_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_user_success.json"))
+        api = AsyncTaigaAPI(host="host")
+        await api.auth("valid_user", "valid_password")
+        self.assertEqual(api.token, "f4k3")
+        self.assertEqual(api.token_refresh, "j5l4")
+        self.assertIsInstance(api.raw_request, AsyncRequestMaker)
+        mock_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_refresh_token_success.json"))
+        await api.refresh_token()
+        self.assertEqual(api.token, "newToken")
+        self.assertEqual(api.raw_request.token, "newToken")
+
+    @patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_refresh_on_unauthorized(self, mock_post, request):
+        mock_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_user_success.json"))
+        api = AsyncTaigaAPI(host="host")
+        await api.auth("valid_user", "valid_password")
+        mock_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_refresh_token_success.json"))
+        request.side_effect = [MockResponse(401, ""), MockResponse(200, "{}")]
+        await api.raw_request.get("/nowhere")
+        self.assertEqual(request.call_args.kwargs["headers"]["Authorization"], "Bearer newToken")
+        self.assertEqual(mock_post.await_count, 2)
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_auth_not_success(self, mock_post):
+        mock_post.return_value = MockResponse(401, "Not allowed")
+        api = AsyncTaigaAPI(host="host")
+        with self.assertRaises(taiga.exceptions.TaigaRestException):
+            await api.auth("valid_user", "valid_password")
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_auth_app(self, mock_post):
+        mock_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_app_success.json"))
+        api = AsyncTaigaAPI(host="host")
+        await api.auth_app("valid-app-id", "valid-app-secret", "valid-auth-code", "valid-state")
+        self.assertEqual(api.token, "f4k3")
+        self.assertEqual(api.raw_request.credentials.token_type, "Application")
+        mock_post.assert_awaited_once()
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_get_by_slug(self, mock_get):
+        mock_get.return_value = MockResponse(200, create_mock_json("tests/resources/project_details_success.json"))
+        api = AsyncTaigaAPI(token="f4k3")
+        project = await api.projects.get_by_slug("my_slug")
+        mock_get.assert_awaited_once_with("/{endpoint}/by_slug?slug={slug}", endpoint="projects", slug="my_slug")
+        self.assertIsInstance(project, Project)
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.post", new_callable=AsyncMock)
+    async def test_import(self, mock_post):
+        mock_post.return_value = MockResponse(200, create_mock_json("tests/resources/userstory_details_success.json"))
+        api = AsyncTaigaAPI(token="f4k3")
+        user_story = await api.user_stories.import_(1, "Test user story", "New")
+        self.assertIsInstance(user_story, UserStory)
+        self.assertEqual(mock_post.call_args.kwargs["payload"]["subject"], "Test user story")
+
+    @patch("taiga.requestmaker.AsyncRequestMaker.post", new_callable=AsyncMock)
+    @patch("taiga.requestmaker.AsyncRequestMaker.get", new_callable=AsyncMock)
+    async def test_history(self, mock_get, mock_post):
+        mock_get.return_value = MockResponse(200, create_mock_json("tests/resources/history_success.json"))
+        mock_post.return_value = MockResponse(204, "")
+        api = AsyncTaigaAPI(token="f4k3")
+        history = await api.history.user_story.get(1)
+        self.assertEqual(history, json.loads(create_mock_json("tests/resources/history_success.json")))
+        self.assertIsNone(await api.history.user_story.delete_comment(1, "c1"))
+        self.assertIsNone(await api.history.task.undelete_comment(1, "c1"))
+        self.assertEqual(mock_post.await_count, 2)
+
+    def test_sync_context_manager(self):
+        with self.assertRaises(TypeError):
+            with AsyncTaigaAPI(token="f4k3"):
+                pass
+
+    @patch("httpx.AsyncClient.aclose", new_callable=AsyncMock)
+    async def test_context_manager(self, aclose):
+        async with AsyncTaigaAPI(token="f4k3"):
+            self.assertFalse(aclose.called)
+        aclose.assert_awaited_once_with()
@@ -1,10 +1,13 @@
+import json
 import unittest
 from unittest.mock import patch
 
 import requests
 
 import taiga.exceptions
-from taiga import TaigaAPI
+from taiga import TaigaAPI, utils
+from taiga.models import Project
+from taiga.requestmaker import RequestCache
 
 from .tools import MockResponse, create_mock_json
 
@@ -20,32 +23,32 @@ class TestAuth(unittest.TestCase):
         TaigaAPI(host="host")
         self.assertFalse(init.called)
 
-    @patch("taiga.client.requests")
-    def test_auth_success(self, requests):
-        requests.post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_user_success.json"))
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_auth_success(self, requests_post):
+        requests_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_user_success.json"))
         api = TaigaAPI(host="host")
         api.auth("valid_user", "valid_password")
         self.assertEqual(api.token, "f4k3")
 
-    @patch("taiga.client.requests")
-    def test_auth_not_success(self, requests):
-        requests.post.return_value = MockResponse(401, "Not allowed")
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_auth_not_success(self, requests_post):
+        requests_post.return_value = MockResponse(401, "Not allowed")
         api = TaigaAPI(host="host")
         self.assertRaises(taiga.exceptions.TaigaRestException, api.auth, "valid_user", "valid_password")
 
-    @patch("taiga.client.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_auth_connection_error(self, requests_post):
         requests_post.side_effect = requests.RequestException()
         api = TaigaAPI(host="host")
         self.assertRaises(taiga.exceptions.TaigaRestException, api.auth, "valid_user", "valid_password")
 
-    @patch("taiga.client.requests")
-    def test_refresh_token_not_success(self, requests):
-        requests.post.return_value = MockResponse(401, "Not allowed")
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_refresh_token_not_success(self, requests_post):
+        requests_post.return_value = MockResponse(401, "Not allowed")
         api = TaigaAPI(host="host")
         self.assertRaises(taiga.exceptions.TaigaRestException, api.refresh_token, "testToken")
 
-    @patch("taiga.client.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_refresh_token_connection_error(self, requests_post):
         requests_post.side_effect = requests.RequestException()
         api = TaigaAPI(host="host")
@@ -55,7 +58,7 @@ class TestAuth(unittest.TestCase):
         api = TaigaAPI(host="host")
         self.assertRaises(ValueError, api.refresh_token)
 
-    @patch("taiga.client.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_refresh_token_passed_token(self, requests_post):
         requests_post.return_value = MockResponse(
             200, create_mock_json("tests/resources/auth_refresh_token_success.json")
@@ -64,13 +67,13 @@ class TestAuth(unittest.TestCase):
         api.refresh_token("testToken")
         requests_post.assert_called_with(
             "host/api/v1/auth/refresh",
-            data='{"refresh": "testToken"}',
+            data=utils.json_dumps({"refresh": "testToken"}),
             headers={"Content-type": "application/json"},
             verify=True,
             proxies=None,
         )
 
-    @patch("taiga.client.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_refresh_token_with_auth(self, requests_post):
         requests_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_user_success.json"))
         api = TaigaAPI(host="host")
@@ -84,3 +87,60 @@ class TestAuth(unittest.TestCase):
         api.refresh_token()
         self.assertEqual(api.token, "newToken")
         self.assertEqual(api.token_refresh, "newRefreshToken")
+
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_session_shared_after_refresh(self, requests_post):
+        requests_post.return_value = MockResponse(
+            200, create_mock_json("tests/resources/auth_refresh_token_success.json")
+        )
+        api = TaigaAPI(token="f4k3")
+        session = api.session
+        self.assertIs(api.raw_request.session, session)
+        self.assertIs(api.projects.requester.session, session)
+        api.token_refresh = "testToken"
+        api.refresh_token()
+        self.assertIs(api.raw_request.session, session)
+        self.assertIs(api.user_stories.requester.session, session)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_refresh_on_unauthorized(self, requests_post, requests_get):
+        requests_post.return_value = MockResponse(200, create_mock_json("tests/resources/auth_user_success.json"))
+        api = TaigaAPI(host="host")
+        api.auth("valid_user", "valid_password")
+        project = Project(api.raw_request, id=1)
+        requests_post.return_value = MockResponse(
+            200, create_mock_json("tests/resources/auth_refresh_token_success.json")
+        )
+        requests_get.side_effect = [MockResponse(401, ""), MockResponse(200, "{}")]
+        project.stats()
+        self.assertEqual(json.loads(requests_post.call_args.kwargs["data"]), {"refresh": "j5l4"})
+        self.assertEqual(requests_get.call_args.kwargs["headers"]["Authorization"], "Bearer newToken")
+        self.assertEqual(api.token, "newToken")
+
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_resources_kept_after_refresh(self, requests_post):
+        requests_post.return_value = MockResponse(
+            200, create_mock_json("tests/resources/auth_refresh_token_success.json")
+        )
+        api = TaigaAPI(token="f4k3")
+        raw_request, projects = api.raw_request, api.projects
+        api.refresh_token("testToken")
+        self.assertIs(api.raw_request, raw_request)
+        self.assertIs(api.projects, projects)
+        self.assertEqual(projects.requester.headers()["Authorization"], "Bearer newToken")
+        self.assertIs(api.raw_request.cache, api.cache)
+
+    def test_cache_provided(self):
+        cache = RequestCache(valid_time=60, stale_time=300)
+        api = TaigaAPI(token="f4k3", cache=cache)
+        self.assertIs(api.raw_request.cache, cache)
+        self.assertIs(api.tasks.requester.cache, cache)
+
+    @patch("taiga.requestmaker.requests.Session.close")
+    def test_context_manager_closes_session(self, session_close):
+        with TaigaAPI(token="f4k3") as api:
+            self.assertFalse(session_close.called)
+        self.assertEqual(session_close.call_count, 1)
+        api.close()
+        self.assertEqual(session_close.call_count, 2)
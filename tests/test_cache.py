@@ -1,12 +1,33 @@
+import os
+import tempfile
+import threading
 import unittest
 from unittest.mock import patch
 
-from taiga.requestmaker import RequestCache, RequestCacheInvalidException, RequestCacheMissingException, RequestMaker
+import taiga.exceptions
+from taiga.requestmaker import (
+    BaseRequestCache,
+    CachedResponse,
+    RequestCache,
+    RequestCacheInvalidException,
+    RequestCacheMissingException,
+    RequestMaker,
+    SQLiteRequestCache,
+)
 
 from .tools import MockResponse
 
 
 class TestRequestCache(unittest.TestCase):
+    def test_base_request_cache_is_abstract(self):
+        class IncompleteCache(BaseRequestCache):
+            def get(self, key, stale=False):
+                raise RequestCacheMissingException()
+
+        self.assertRaises(TypeError, BaseRequestCache)
+        self.assertRaises(TypeError, IncompleteCache)
+        self.assertIsInstance(RequestCache(), BaseRequestCache)
+
     def test_cache_put_get(self):
         cache = RequestCache()
         cache.put("http://ciao", "value")
@@ -29,12 +50,12 @@ class TestRequestCache(unittest.TestCase):
         mock_time.return_value = 101
         self.assertRaises(RequestCacheInvalidException, cache.get, "http://ciao")
 
-    @patch("taiga.requestmaker.requests.get")
+    @patch("taiga.requestmaker.requests.Session.get")
     @patch("time.time")
     def test_call_requests_get_with_cache(self, mock_time, requests_get):
         mock_time.return_value = 0
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
-        requests_get.return_value = MockResponse(200, "")
+        requests_get.return_value = MockResponse(200, "{}")
         rm.get("/nowhere", cache=True)
         self.assertEqual(requests_get.call_count, 1)
         rm.get("/nowhere", cache=True)
@@ -46,3 +67,356 @@ class TestRequestCache(unittest.TestCase):
         mock_time.return_value = 61
         rm.get("/nowhere", cache=True)
         self.assertEqual(requests_get.call_count, 3)
+
+    def test_cache_max_entries_lru(self):
+        cache = RequestCache(max_entries=2)
+        cache.put("a", "value")
+        cache.put("b", "value")
+        cache.get("a")
+        cache.put("c", "value")
+        self.assertRaises(RequestCacheMissingException, cache.get, "b")
+        self.assertEqual(cache.get("a"), "value")
+        self.assertEqual(cache.get("c"), "value")
+        self.assertEqual(cache.stats["evictions"], 1)
+        self.assertEqual(cache.stats["entries"], 2)
+
+    def test_cache_max_bytes(self):
+        cache = RequestCache(max_bytes=10)
+        cache.put("a", "value", size=6)
+        cache.put("b", "value", size=4)
+        self.assertEqual(cache.stats["bytes"], 10)
+        cache.put("c", "value", size=5)
+        self.assertRaises(RequestCacheMissingException, cache.get, "a")
+        self.assertEqual(cache.stats["bytes"], 9)
+        cache.put("b", "value", size=1)
+        self.assertEqual(cache.stats["bytes"], 6)
+
+    @patch("time.time")
+    def test_cache_sweep_expired(self, mock_time):
+        mock_time.return_value = 0
+        cache = RequestCache(valid_time=100)
+        cache.put("a", "value", size=1)
+        cache.put("b", "value", size=1)
+        mock_time.return_value = 50
+        cache.put("c", "value", size=1)
+        self.assertEqual(cache.stats["entries"], 3)
+        mock_time.return_value = 120
+        cache.put("d", "value", size=1)
+        self.assertEqual(cache.stats["entries"], 2)
+        self.assertEqual(cache.stats["expirations"], 2)
+        self.assertEqual(cache.stats["bytes"], 2)
+
+    def test_cache_counters(self):
+        cache = RequestCache()
+        cache.put("a", "value")
+        cache.get("a")
+        cache.get("a")
+        self.assertRaises(RequestCacheMissingException, cache.get, "b")
+        self.assertEqual(cache.stats["hits"], 2)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_cached_response(self):
+        cached = CachedResponse.from_response(
+            MockResponse(200, '[{"id": 1, "tags": ["a"]}]', {"X-Pagination-Next": "1"})
+        )
+        self.assertEqual(cached.size, 26)
+        self.assertEqual(cached.headers.get("x-pagination-next"), "1")
+        data = cached.json()
+        data[0]["tags"].append("b")
+        self.assertEqual(cached.json(), [{"id": 1, "tags": ["a"]}])
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_call_requests_get_with_cache_stores_decoded_body(self, requests_get):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        requests_get.return_value = MockResponse(200, '{"id": 1}')
+        rm.get("/nowhere", cache=True)
+        response = rm.get("/nowhere", cache=True)
+        self.assertIsInstance(response, CachedResponse)
+        self.assertEqual(response.json(), {"id": 1})
+        requests_get.return_value = MockResponse(200, "not json")
+        response = rm.get("/other", cache=True)
+        self.assertEqual(response.text, "not json")
+        self.assertEqual(rm.cache.stats["entries"], 1)
+        requests_get.return_value = MockResponse(404, '{"id": 1}')
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.get, "/missing", cache=True)
+        self.assertEqual(rm.cache.stats["entries"], 1)
+
+    def test_cache_key_normalization(self):
+        rm = RequestMaker(api_path="/api/v1", host="http://host", token="f4k3")
+        key = rm.cache_key("userstories", query={"project": 1, "status": 2})
+        self.assertEqual(key, rm.cache_key("/userstories", query={"status": 2, "project": 1}))
+        self.assertEqual(key, rm.cache_key("userstories?status=2", query={"project": 1}))
+        self.assertEqual(key, rm.cache_key("userstories", query={"project": 1, "status": 2, "milestone": None}))
+        self.assertNotEqual(key, rm.cache_key("userstories", query={"project": 1, "status": 3}))
+        self.assertNotEqual(key, rm.cache_key("userstories", query={"project": 1, "status": 2, "page": 2}))
+        self.assertNotEqual(key, rm.cache_key("userstories", query={"project": 1, "status": 2}, paginate=False))
+        self.assertNotEqual(key, rm.cache_key("userstories", query={"project": 1, "status": 2}, method="HEAD"))
+        self.assertNotIn("f4k3", key)
+        other_rm = RequestMaker(api_path="/api/v1", host="http://host", token="0th3r")
+        self.assertNotEqual(key, other_rm.cache_key("userstories", query={"project": 1, "status": 2}))
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_call_requests_get_with_cache_and_query(self, requests_get):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        requests_get.return_value = MockResponse(200, "[]")
+        rm.get("/nowhere", query={"page": 1}, cache=True)
+        rm.get("/nowhere", query={"page": 2}, cache=True)
+        self.assertEqual(requests_get.call_count, 2)
+        rm.get("/nowhere", query={"page": 2}, cache=True)
+        self.assertEqual(requests_get.call_count, 2)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    @patch("time.time")
+    def test_call_requests_get_with_cache_revalidation(self, mock_time, requests_get):
+        mock_time.return_value = 0
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        requests_get.return_value = MockResponse(
+            200, '{"id": 1}', {"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        )
+        rm.get("/nowhere", cache=True)
+        self.assertNotIn("If-None-Match", requests_get.call_args.kwargs["headers"])
+        mock_time.return_value = 61
+        requests_get.return_value = MockResponse(304, "")
+        response = rm.get("/nowhere", cache=True)
+        self.assertEqual(response.json(), {"id": 1})
+        headers = requests_get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"abc"')
+        self.assertEqual(headers["If-Modified-Since"], "Wed, 21 Oct 2015 07:28:00 GMT")
+        self.assertEqual(requests_get.call_count, 2)
+        mock_time.return_value = 100
+        rm.get("/nowhere", cache=True)
+        self.assertEqual(requests_get.call_count, 2)
+        mock_time.return_value = 200
+        requests_get.return_value = MockResponse(200, '{"id": 2}', {"ETag": '"def"'})
+        self.assertEqual(rm.get("/nowhere", cache=True).json(), {"id": 2})
+        mock_time.return_value = 300
+        rm.get("/nowhere", cache=True)
+        self.assertEqual(requests_get.call_args.kwargs["headers"]["If-None-Match"], '"def"')
+
+    @patch("time.time")
+    def test_cache_keeps_revalidable_entries(self, mock_time):
+        mock_time.return_value = 0
+        cache = RequestCache(valid_time=100)
+        cached = CachedResponse(200, {"ETag": '"abc"'}, {"id": 1})
+        cache.put("a", cached)
+        cache.put("b", "value")
+        mock_time.return_value = 101
+        self.assertRaises(RequestCacheInvalidException, cache.get, "a")
+        self.assertRaises(RequestCacheInvalidException, cache.get, "b")
+        self.assertIs(cache.get_stale("a"), cached)
+        self.assertIsNone(cache.get_stale("b"))
+        cache.touch("a")
+        self.assertIs(cache.get("a"), cached)
+
+    def test_cache_concurrent_access(self):
+        cache = RequestCache(max_entries=50)
+
+        def work(worker):
+            for index in range(200):
+                key = str((worker * index) % 80)
+                cache.put(key, "value", size=1)
+                try:
+                    cache.get(key)
+                except RequestCacheMissingException:
+                    pass
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats
+        self.assertEqual(stats["entries"], len(cache.keys()))
+        self.assertEqual(stats["bytes"], stats["entries"])
+        self.assertLessEqual(stats["entries"], 50)
+        self.assertEqual(stats["hits"] + stats["misses"], 8 * 200)
+
+    @patch("time.time")
+    def test_cache_stale_window(self, mock_time):
+        mock_time.return_value = 0
+        cache = RequestCache(valid_time=60, stale_time=300)
+        cache.put("a", "value")
+        self.assertFalse(cache.is_expired("a"))
+        mock_time.return_value = 100
+        self.assertRaises(RequestCacheInvalidException, cache.get, "a")
+        self.assertEqual(cache.get("a", stale=True), "value")
+        self.assertTrue(cache.is_expired("a"))
+        mock_time.return_value = 361
+        self.assertRaises(RequestCacheInvalidException, cache.get, "a", stale=True)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    @patch("time.time")
+    def test_call_requests_get_with_stale_cache(self, mock_time, requests_get):
+        mock_time.return_value = 0
+        rm = RequestMaker(api_path="/", host="host", token="f4k3", cache=RequestCache(valid_time=60, stale_time=300))
+        requests_get.return_value = MockResponse(200, '{"id": 1}')
+        rm.get("/nowhere", cache=True)
+        mock_time.return_value = 100
+        refreshed = threading.Event()
+
+        def refresh(*args, **kwargs):
+            refreshed.wait(5)
+            return MockResponse(200, '{"id": 2}')
+
+        requests_get.side_effect = refresh
+        self.assertEqual(rm.get("/nowhere", cache=True).json(), {"id": 1})
+        self.assertEqual(rm.get("/nowhere", cache=True).json(), {"id": 1})
+        futures = list(rm._refreshing.values())
+        self.assertEqual(len(futures), 1)
+        refreshed.set()
+        futures[0].result(5)
+        self.assertEqual(requests_get.call_count, 2)
+        self.assertEqual(rm.get("/nowhere", cache=True).json(), {"id": 2})
+        self.assertEqual(requests_get.call_count, 2)
+        rm.close()
+
+
+class TestSQLiteRequestCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite")
+
+    def cache(self, **kwargs):
+        cache = SQLiteRequestCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_cache_put_get(self):
+        cache = self.cache()
+        cache.put("a", CachedResponse(200, {"ETag": '"abc"'}, {"id": 1}, 9))
+        cache.put("b", "value")
+        cached = cache.get("a")
+        self.assertIsInstance(cached, CachedResponse)
+        self.assertEqual(cached.json(), {"id": 1})
+        self.assertEqual(cached.headers["etag"], '"abc"')
+        self.assertEqual(cache.get("b"), "value")
+        self.assertRaises(RequestCacheMissingException, cache.get, "c")
+        cache.remove("b")
+        self.assertRaises(RequestCacheMissingException, cache.get, "b")
+        self.assertEqual(cache.stats["entries"], 1)
+        self.assertEqual(cache.stats["bytes"], 9)
+        cache.clear()
+        self.assertEqual(cache.stats["entries"], 0)
+
+    def test_cache_shared(self):
+        self.cache().put("a", CachedResponse(200, {}, [1, 2]))
+        self.assertEqual(self.cache().get("a").json(), [1, 2])
+
+    @patch("time.time")
+    def test_cache_valid_time(self, mock_time):
+        mock_time.return_value = 0
+        cache = self.cache(valid_time=60, stale_time=300)
+        cache.put("a", "value")
+        cache.put("b", CachedResponse(200, {"ETag": '"abc"'}, {"id": 1}))
+        mock_time.return_value = 100
+        self.assertTrue(cache.is_expired("a"))
+        self.assertRaises(RequestCacheInvalidException, cache.get, "a")
+        self.assertEqual(cache.get("a", stale=True), "value")
+        mock_time.return_value = 361
+        self.assertRaises(RequestCacheInvalidException, cache.get, "a", stale=True)
+        self.assertRaises(RequestCacheMissingException, cache.get, "a")
+        self.assertRaises(RequestCacheInvalidException, cache.get, "b")
+        self.assertEqual(cache.get_stale("b").json(), {"id": 1})
+        cache.touch("b")
+        self.assertFalse(cache.is_expired("b"))
+        self.assertEqual(cache.stats["expirations"], 3)
+
+    @patch("time.time")
+    def test_cache_sweep_expired(self, mock_time):
+        mock_time.return_value = 0
+        cache = self.cache(valid_time=60)
+        cache.put("a", "value")
+        mock_time.return_value = 100
+        cache.put("b", "value")
+        self.assertEqual(cache.stats["entries"], 1)
+        self.assertEqual(cache.stats["expirations"], 1)
+
+    @patch("time.time")
+    def test_cache_max_entries_lru(self, mock_time):
+        mock_time.return_value = 1000
+        cache = self.cache(max_entries=2)
+        cache.put("a", "value")
+        cache.put("b", "value")
+        mock_time.return_value = 1010
+        cache.get("a")
+        cache.put("c", "value")
+        self.assertEqual(cache.get("a"), "value")
+        self.assertRaises(RequestCacheMissingException, cache.get, "b")
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    @patch("time.time")
+    def test_cache_access_time_throttled(self, mock_time):
+        mock_time.return_value = 1000
+        cache = self.cache(valid_time=60)
+        cache.put("a", "value")
+
+        def accessed():
+            return cache._connection().execute("SELECT accessed FROM responses WHERE key = 'a'").fetchone()[0]
+
+        mock_time.return_value = 1005
+        self.assertEqual(cache.get("a"), "value")
+        self.assertEqual(accessed(), 1000)
+        mock_time.return_value = 1006
+        self.assertEqual(cache.get("a"), "value")
+        self.assertEqual(accessed(), 1006)
+
+    def test_cache_max_bytes(self):
+        cache = self.cache(max_bytes=20)
+        cache.put("a", "value", size=10)
+        cache.put("b", "value", size=10)
+        cache.put("c", "value", size=10)
+        self.assertRaises(RequestCacheMissingException, cache.get, "a")
+        self.assertEqual(cache.stats["bytes"], 20)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_call_requests_get_with_cache(self, requests_get):
+        requests_get.return_value = MockResponse(200, '{"id": 1}')
+        rm = RequestMaker(api_path="/", host="host", token="f4k3", cache=self.cache())
+        rm.get("/nowhere", cache=True)
+        other = RequestMaker(api_path="/", host="host", token="f4k3", cache=self.cache())
+        self.assertEqual(other.get("/nowhere", cache=True).json(), {"id": 1})
+        self.assertEqual(requests_get.call_count, 1)
+
+
+class TestCacheInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.rm = RequestMaker(api_path="/api/v1/", host="http://host", token="f4k3")
+        responses = {
+            "tasks/1": {"id": 1, "project": 1},
+            "tasks/2": {"id": 2, "project": 1},
+            "tasks": [],
+            "tasks/by_ref": {"id": 1},
+            "projects/1": {"id": 1},
+            "projects/1/stats": {},
+            "projects/2": {"id": 2},
+            "issues/1": {"id": 1, "project": 1},
+        }
+        for uri, data in responses.items():
+            key = self.rm.cache_key(uri, query={"project": 1} if uri == "tasks" else None)
+            self.rm.cache.put(key, CachedResponse(200, {}, data))
+
+    def cached(self):
+        return sorted(key.split(" ")[1].split("?")[0][len("http://host/api/v1/") :] for key in self.rm.cache.keys())
+
+    @patch("taiga.requestmaker.requests.Session.patch")
+    def test_invalidate_on_update(self, requests_patch):
+        requests_patch.return_value = MockResponse(200, "{}")
+        self.rm.patch("/{endpoint}/{id}", endpoint="tasks", id=1, payload={"subject": "subject"})
+        self.assertEqual(self.cached(), ["issues/1", "projects/2", "tasks/2"])
+
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_invalidate_on_create(self, requests_post):
+        requests_post.return_value = MockResponse(200, "{}")
+        self.rm.post("/{endpoint}", endpoint="tasks", payload={"project": 2, "subject": "subject"})
+        self.assertEqual(self.cached(), ["issues/1", "projects/1", "projects/1/stats", "tasks/1", "tasks/2"])
+        self.rm.post("/{endpoint}/bulk_create", endpoint="tasks", payload={"project_id": 1})
+        self.assertEqual(self.cached(), ["issues/1"])
+
+    @patch("taiga.requestmaker.requests.Session.delete")
+    def test_invalidate_on_delete_error(self, requests_delete):
+        requests_delete.return_value = MockResponse(400, "")
+        self.assertRaises(
+            taiga.exceptions.TaigaRestException, self.rm.delete, "/{endpoint}/{id}", endpoint="issues", id=1
+        )
+        self.assertEqual(self.cached(), ["projects/2", "tasks", "tasks/1", "tasks/2", "tasks/by_ref"])
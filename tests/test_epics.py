@@ -42,6 +42,16 @@ class TestEpics(unittest.TestCase):
         # self.assertEqual(epics[0].description, 'Description of the Epic')
         self.assertEqual(len(epics), 1)
 
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_list_epics_lookups(self, mock_requestmaker_get):
+        mock_requestmaker_get.return_value = MockResponse(
+            200, create_mock_json("tests/resources/epics_list_success.json")
+        )
+        api = TaigaAPI(token="f4k3")
+        self.assertEqual(len(api.epics.list(project=1, status__in=[1, 2])), 0)
+        mock_requestmaker_get.assert_called_with("epics", query={"project": 1}, paginate=True)
+        self.assertEqual(len(api.epics.list(project=1, status__in=[4])), 1)
+
     @patch(import_open)
     @patch("taiga.models.base.ListResource._new_resource")
     def test_file_attach(self, mock_new_resource, mock_open):
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import patch
 
@@ -11,6 +12,19 @@ import_open = "builtins.open"
 
 
 class TestIssues(unittest.TestCase):
+    @patch("taiga.requestmaker.RequestMaker.post")
+    def test_bulk_create_issues(self, mock_requestmaker_post):
+        mock_requestmaker_post.return_value = MockResponse(200, json.dumps([{"id": 1}, {"id": 2}]))
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        issues = Issues(rm).bulk_create(1, ["Issue 1", "Issue 2"], milestone=4)
+        self.assertEqual([issue.id for issue in issues], [1, 2])
+        self.assertIsInstance(issues[0], Issue)
+        mock_requestmaker_post.assert_called_once_with(
+            "/{endpoint}/bulk_create",
+            endpoint="issues",
+            payload={"project_id": 1, "milestone_id": 4, "bulk_issues": "Issue 1\nIssue 2"},
+        )
+
     @patch("taiga.requestmaker.RequestMaker.get")
     def test_list_attachments(self, mock_requestmaker_get):
         mock_requestmaker_get.return_value = MockResponse(
@@ -108,5 +122,5 @@ class TestIssues(unittest.TestCase):
             "/{endpoint}/{id}",
             endpoint=Issue.endpoint,
             id=issue.id,
-            payload={"project": project.id, "due_date": issue.due_date},
+            payload={"project": project.id, "due_date": "2025-01-22"},
         )
@@ -73,4 +73,6 @@ class TestMilestones(unittest.TestCase):
         api = TaigaAPI(token="f4k3")
         milestone = api.milestones.get(1)
         milestone.stats()
-        mock_requestmaker_get.assert_called_with("/{endpoint}/{id}/stats", endpoint="milestones", id=milestone.id)
+        mock_requestmaker_get.assert_called_with(
+            "/{endpoint}/{id}/stats", endpoint="milestones", id=milestone.id, cache=False
+        )
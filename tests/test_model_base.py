@@ -1,10 +1,14 @@
+import copy
 import datetime
+import gc
 import json
+import pickle
 import unittest
 from unittest.mock import patch
 
-from taiga.models import Projects
-from taiga.models.base import InstanceResource, ListResource, SearchableList
+from taiga import TaigaAPI
+from taiga.models import Projects, UserStory
+from taiga.models.base import IdentityMap, InstanceResource, ListResource, SearchableList
 from taiga.requestmaker import RequestMaker
 
 from .tools import MockResponse, create_mock_json
@@ -214,7 +218,7 @@ class TestModelBase(unittest.TestCase):
         mock_requestmaker_get.assert_called_with("fakes", query={"id": 1}, paginate=False)
         self.assertEqual(len(f_list), 1)
 
-    @patch("taiga.requestmaker.requests.get")
+    @patch("taiga.requestmaker.requests.Session.get")
     def test_call_model_base_list_elements_no_paginate_check_requests(self, mock_requestmaker_get):
         js_list = json.loads(create_mock_json("tests/resources/fakes_list_success.json"))
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
@@ -236,7 +240,7 @@ class TestModelBase(unittest.TestCase):
         )
         self.assertEqual(len(f_list), 9)
 
-    @patch("taiga.requestmaker.requests.get")
+    @patch("taiga.requestmaker.requests.Session.get")
     def test_call_model_base_list_elements_paginate_check_requests(self, mock_requestmaker_get):
         js_list = json.loads(create_mock_json("tests/resources/fakes_list_success.json"))
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
@@ -276,6 +280,105 @@ class TestModelBase(unittest.TestCase):
         self.assertEqual(len(f_list), 4)
         mock_requestmaker_get.assert_called_with("fakes", query={"page_size": 5, "page": 2}, paginate=True)
 
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_call_model_base_list_concurrent_pages(self, mock_requestmaker_get):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fakes = Fakes(rm)
+
+        def get_page(endpoint, query, **kwargs):
+            page = query.get("page", 1)
+            headers = {"X-Pagination-Count": "7", "X-Paginated-By": "2"} if page == 1 else {}
+            data = [{"id": page * 10 + i} for i in range(2 if page < 4 else 1)]
+            return MockResponse(200, json.dumps(data), headers)
+
+        mock_requestmaker_get.side_effect = get_page
+        f_list = fakes.list(page_size=2, max_workers=3)
+        self.assertEqual([fake.id for fake in f_list], [10, 11, 20, 21, 30, 31, 40])
+        self.assertIsInstance(f_list, SearchableList)
+        self.assertEqual(mock_requestmaker_get.call_count, 4)
+        mock_requestmaker_get.assert_any_call("fakes", query={"page_size": 2}, paginate=True, lazy=False)
+        mock_requestmaker_get.assert_any_call("fakes", query={"page_size": 2, "page": 4})
+
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_call_model_base_list_concurrent_fallback(self, mock_requestmaker_get):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken", max_workers=4)
+        fakes = Fakes(rm)
+        mock_requestmaker_get.side_effect = [
+            MockResponse(200, json.dumps([{"id": 1}]), {"X-Pagination-Next": "url"}),
+            MockResponse(200, json.dumps([{"id": 2}]), {"X-Pagination-Next": "url"}),
+            MockResponse(200, json.dumps([{"id": 3}])),
+        ]
+        f_list = fakes.list()
+        self.assertEqual([fake.id for fake in f_list], [1, 2, 3])
+        mock_requestmaker_get.assert_called_with("fakes", query={"page": 3})
+
+        mock_requestmaker_get.reset_mock(side_effect=True)
+        mock_requestmaker_get.return_value = MockResponse(200, json.dumps([{"id": 1}]))
+        fakes.list(page=2)
+        mock_requestmaker_get.assert_called_once_with("fakes", query={"page": 2}, paginate=True)
+
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_call_model_base_iter(self, mock_requestmaker_get):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fakes = Fakes(rm)
+        mock_requestmaker_get.side_effect = [
+            MockResponse(200, json.dumps([{"id": 1}, {"id": 2}]), {"X-Pagination-Next": "url"}),
+            MockResponse(200, json.dumps([{"id": 3}])),
+        ]
+        f_iter = fakes.iter(page_size=2, param1="one")
+        self.assertFalse(mock_requestmaker_get.called)
+        first = next(f_iter)
+        self.assertIsInstance(first, Fake)
+        self.assertEqual(first.id, 1)
+        self.assertEqual([fake.id for fake in f_iter], [2, 3])
+        self.assertEqual(mock_requestmaker_get.call_count, 2)
+        mock_requestmaker_get.assert_any_call("fakes", query={"page_size": 2, "param1": "one"}, paginate=True)
+        mock_requestmaker_get.assert_called_with("fakes", query={"page_size": 2, "param1": "one", "page": 2})
+
+    @patch("taiga.requestmaker.RequestMaker.stream")
+    def test_call_model_base_iter_without_pagination(self, mock_requestmaker_stream):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fakes = Fakes(rm)
+        fakes.stream_chunk_size = 3
+        response = MockResponse(200, json.dumps([{"id": 1, "param1": "[1]"}, {"id": 2}, {"id": 3}]))
+        mock_requestmaker_stream.return_value = response
+        f_iter = fakes.iter(pagination=False, param1="one")
+        self.assertEqual(next(f_iter).param1, "[1]")
+        self.assertFalse(hasattr(response, "closed"))
+        self.assertEqual([fake.id for fake in f_iter], [2, 3])
+        self.assertTrue(response.closed)
+        mock_requestmaker_stream.assert_called_once_with("fakes", query={"param1": "one"})
+
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_call_model_base_list_and_get_with_cache(self, mock_requestmaker_get):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fakes = Fakes(rm)
+        mock_requestmaker_get.return_value = MockResponse(200, json.dumps([{"id": 1}]))
+        fakes.list(param1="one", cache=True)
+        mock_requestmaker_get.assert_called_with("fakes", query={"param1": "one"}, paginate=True, cache=True)
+        mock_requestmaker_get.return_value = MockResponse(200, json.dumps({"id": 1}))
+        fakes.get(1, cache=True)
+        mock_requestmaker_get.assert_called_with("/{endpoint}/{id}", endpoint="fakes", id=1, cache=True)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_reference_data_cache(self, requests_get):
+        requests_get.return_value = MockResponse(200, json.dumps([{"id": 1, "name": "New"}]))
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken", cache_reference_data=True)
+        project = Projects(rm).instance(rm, id=1)
+        project.list_issue_statuses()
+        statuses = project.list_issue_statuses()
+        self.assertEqual(statuses[0].name, "New")
+        self.assertEqual(requests_get.call_count, 1)
+        project.list_user_stories()
+        project.list_user_stories()
+        self.assertEqual(requests_get.call_count, 3)
+
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        project = Projects(rm).instance(rm, id=1)
+        project.list_issue_statuses()
+        project.list_issue_statuses()
+        self.assertEqual(requests_get.call_count, 5)
+
     def test_to_dict_method(self):
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
         fake = Fake(rm, id=1, param1="one", param2="two", param3="three")
@@ -311,6 +414,93 @@ class TestModelBase(unittest.TestCase):
         self.assertTrue(searchable_list.get(param1="one", param2="a"), 1)
         self.assertTrue(searchable_list.get())
 
+    def test_searchable_list_indexes(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fakes = SearchableList(Fake(rm, id=i, param1=i % 3, param2=["a"]) for i in range(10))
+        self.assertEqual(fakes.get(id=4).id, 4)
+        self.assertEqual([fake.id for fake in fakes.filter(param1=1)], [1, 4, 7])
+        self.assertEqual([fake.id for fake in fakes.filter(param1=1, id=4)], [4])
+        self.assertIsInstance(fakes.filter(param1=1), SearchableList)
+        self.assertEqual(set(fakes._indexes), {"id", "param1"})
+        self.assertIsNone(fakes.get(id=4, param1=2))
+        self.assertIsNone(fakes.get(id=40))
+
+        fakes.append(Fake(rm, id=10, param1=1, param2=["b"]))
+        fakes.extend([Fake(rm, id=11, param1=2, param2=["a"])])
+        self.assertEqual([fake.id for fake in fakes.filter(param1=1)], [1, 4, 7, 10])
+        self.assertEqual(fakes.get(id=11).param1, 2)
+        fakes.insert(0, Fake(rm, id=12, param1=1, param2=[]))
+        self.assertIsNone(fakes._indexes)
+        self.assertEqual([fake.id for fake in fakes.filter(param1=1)], [12, 1, 4, 7, 10])
+
+        fakes.get(id=12).param1 = 0
+        self.assertEqual([fake.id for fake in fakes.filter(param1=1)], [1, 4, 7, 10])
+        fakes.reindex()
+        self.assertEqual([fake.id for fake in fakes.filter(param1=0)], [12, 0, 3, 6, 9])
+
+        self.assertEqual([fake.id for fake in fakes.filter(param2=["a"])], [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 11])
+        self.assertIsNone(fakes._indexes["param2"])
+        self.assertEqual(fakes.get(id=[1]), None)
+        self.assertEqual(len(copy.copy(fakes).filter(param1=2)), 4)
+
+    def test_searchable_list_index_by_and_group_by(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fakes = SearchableList([Fake(rm, id=1, param1="one"), Fake(rm, id=2, param1="one"), Fake(rm, id=3)])
+        self.assertEqual({key: fake.id for key, fake in fakes.index_by("id").items()}, {1: 1, 2: 2, 3: 3})
+        self.assertEqual(fakes.index_by("param1")["one"].id, 1)
+        groups = fakes.group_by("param1")
+        self.assertEqual(list(groups), ["one"])
+        self.assertEqual([fake.id for fake in groups["one"]], [1, 2])
+        self.assertIsInstance(groups["one"], SearchableList)
+        fakes.append(Fake(rm, id=4, param1=["x"]))
+        self.assertRaises(TypeError, fakes.group_by, "param1")
+
+    def test_searchable_list_lookups(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fakes = SearchableList(
+            [
+                Fake(rm, id=1, param1="One", param2=None, tags=[["a", None], ["b", "#fff"]], due_date="2015-02-10"),
+                Fake(rm, id=2, param1="two", param2=3, tags=[], created_date="2015-02-10T17:55:05+0000"),
+                Fake(rm, id=3, param1="three", param2=1, tags=[["b", None]]),
+            ]
+        )
+
+        def ids(objs):
+            return [obj.id for obj in objs]
+
+        self.assertEqual(ids(fakes.filter(id__in=[1, 3])), [1, 3])
+        self.assertEqual(ids(fakes.filter(id__in=(2,), param1__exact="two")), [2])
+        self.assertEqual(ids(fakes.filter(tags__contains="b")), [1, 3])
+        self.assertEqual(ids(fakes.filter(tags__in=[[["b", None]]])), [3])
+        self.assertEqual(ids(fakes.filter(param1__contains="o")), [2])
+        self.assertEqual(ids(fakes.filter(param1__icontains="o")), [1, 2])
+        self.assertEqual(ids(fakes.filter(param1__startswith="t")), [2, 3])
+        self.assertEqual(ids(fakes.filter(param2__gt=1)), [2])
+        self.assertEqual(ids(fakes.filter(param2__lte=3)), [2, 3])
+        self.assertEqual(ids(fakes.filter(param2__isnull=True)), [1])
+        self.assertEqual(ids(fakes.filter(param2__isnull="false")), [2, 3])
+        self.assertEqual(ids(fakes.filter(due_date__isnull=False)), [1])
+        self.assertEqual(ids(fakes.filter(due_date__gte=datetime.date(2015, 2, 10))), [1])
+        self.assertEqual(ids(fakes.filter(created_date__gte="2015-02-10")), [2])
+        self.assertEqual(ids(fakes.filter(created_date__lt="2015-02-10T17:55:05Z")), [])
+        self.assertEqual(ids(fakes.filter(param1__gt=1)), [])
+        self.assertEqual(fakes.get(param1__icontains="T", param2__gte=1).id, 2)
+
+        self.assertTrue(fakes.exists(param2=1))
+        self.assertFalse(fakes.exists(param2=2))
+        self.assertEqual(fakes.count(param1__icontains="o"), 2)
+        self.assertEqual(fakes.count(), 3)
+        self.assertEqual(fakes.count(fakes[0]), 1)
+        self.assertEqual(fakes.first().id, 1)
+        self.assertIsNone(SearchableList().first())
+
+        self.assertEqual(ids(fakes.order_by("param2")), [3, 2, 1])
+        self.assertEqual(ids(fakes.order_by("-param2")), [2, 3, 1])
+        self.assertEqual(ids(fakes.order_by("param1")), [1, 3, 2])
+        self.assertEqual(ids(fakes.order_by("-param1")), [2, 3, 1])
+        self.assertEqual(ids(fakes.order_by("-tags", "id")), [3, 1, 2])
+        self.assertIsInstance(fakes.order_by("id"), SearchableList)
+
     @patch("taiga.requestmaker.RequestMaker.put")
     def test_call_model_base_update_2(self, mock_requestmaker_put):
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
@@ -331,6 +521,200 @@ class TestModelBase(unittest.TestCase):
         self.assertFalse(isinstance(fake.created_date, datetime.datetime))
         self.assertTrue(isinstance(fake.modified_date, datetime.datetime))
 
+    def test_datetime_parsing_is_lazy(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fake = Fake(rm, id=1, param1="one", created_date="2015-02-10T17:55:05.123Z", due_date="2015-03-01")
+        self.assertEqual(fake.__dict__["created_date"], "2015-02-10T17:55:05.123Z")
+        self.assertNotIn("_dates", fake.__dict__)
+        created = fake.created_date
+        self.assertEqual(created, datetime.datetime(2015, 2, 10, 17, 55, 5, 123000, tzinfo=datetime.timezone.utc))
+        self.assertIs(fake.created_date, created)
+        self.assertEqual(fake.raw_date("created_date"), "2015-02-10T17:55:05.123Z")
+        self.assertEqual(fake.due_date, datetime.date(2015, 3, 1))
+        self.assertIsNone(fake.raw_date("finished_date"))
+        self.assertFalse(hasattr(fake, "finished_date"))
+
+        fake.created_date = "2016-01-01T10:00:00+01:00"
+        self.assertEqual(fake.created_date.year, 2016)
+        fake.due_date = datetime.date(2016, 2, 1)
+        self.assertEqual(fake.raw_date("due_date"), "2016-02-01")
+        self.assertEqual(fake.due_date, datetime.date(2016, 2, 1))
+        fake.due_date = None
+        self.assertIsNone(fake.due_date)
+        del fake.due_date
+        self.assertFalse(hasattr(fake, "due_date"))
+
+    def test_datetime_parsing_keeps_payload(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fake = Fake(rm, id=1, param1="2015-02-10", estimated_start="2015-02-10", finished_date="not a date")
+        fake.allowed_params = ["param1", "estimated_start", "finished_date"]
+        self.assertEqual(fake.estimated_start, datetime.date(2015, 2, 10))
+        self.assertEqual(fake.finished_date, "not a date")
+        self.assertEqual(
+            fake.to_dict(), {"param1": "2015-02-10", "estimated_start": "2015-02-10", "finished_date": "not a date"}
+        )
+
+    def test_compact_instances(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fake = Fake(rm, id=1, param1="one", param2="two", created_date="2015-02-10T17:55:05+0000", **{"1": "x"})
+        other = Fake.parse(rm, {"id": 2, "param1": "uno", "param2": "due", "created_date": None, "1": "y"})
+        self.assertIs(type(fake), type(other))
+        self.assertIsNot(type(fake), Fake)
+        self.assertIsInstance(fake, Fake)
+        self.assertEqual(type(fake).__name__, "Fake")
+        self.assertEqual(type(fake).__slots__, ("id", "param1", "param2", "requester"))
+        self.assertEqual(fake.__dict__, {"created_date": "2015-02-10T17:55:05+0000", "1": "x"})
+        self.assertEqual((fake.id, fake.param1, fake.requester), (1, "one", rm))
+        self.assertIsInstance(fake.created_date, datetime.datetime)
+        self.assertEqual(fake.to_dict(), {"param1": "one", "param2": "two"})
+        fake.param3 = "three"
+        self.assertEqual(fake.__dict__["param3"], "three")
+        del fake.param2
+        self.assertFalse(hasattr(fake, "param2"))
+        self.assertEqual(fake.to_dict(), {"param1": "one"})
+        copy_fake = copy.copy(fake)
+        self.assertEqual((copy_fake.id, copy_fake.param1, copy_fake.param3), (1, "one", "three"))
+
+        self.assertIs(type(Fake(rm)), Fake)
+        with patch.object(Fake, "compact", False):
+            self.assertIs(type(Fake(rm, id=1)), Fake)
+        with patch.object(Fake, "compact_classes_max", 0), patch.object(Fake, "_compact_classes", {}):
+            self.assertIs(type(Fake(rm, id=1)), Fake)
+
+    @patch("taiga.requestmaker.RequestMaker.put")
+    def test_compact_instance_update(self, mock_requestmaker_put):
+        mock_requestmaker_put.return_value = MockResponse(200, json.dumps({"id": 1, "param1": "one", "version": 2}))
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fake = Fake(rm, id=1, param1="one", version=1)
+        fake.update()
+        self.assertEqual(fake.version, 2)
+        self.assertNotIn("version", fake.__dict__)
+
+    def test_pickle_compact_instance(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fake = Fake(rm, id=1, param1="one", param2="two", created_date="2015-02-10T17:55:05+0000")
+        fake.param1 = "uno"
+        fake.param3 = "three"
+        self.assertIsInstance(fake.created_date, datetime.datetime)
+        unpickled = pickle.loads(pickle.dumps(fake))
+        self.assertIsInstance(unpickled, Fake)
+        self.assertEqual(type(unpickled).__slots__, type(fake).__slots__)
+        self.assertEqual((unpickled.id, unpickled.param1, unpickled.param2), (1, "uno", "two"))
+        self.assertEqual((unpickled.param3, unpickled.created_date), ("three", fake.created_date))
+        self.assertIsInstance(unpickled.requester, RequestMaker)
+        self.assertEqual(unpickled.requester.authorization, "Bearer faketoken")
+        self.assertEqual(unpickled.dirty_fields, {"param1", "param3"})
+        plain = Fake(rm)
+        plain.param1 = "one"
+        self.assertEqual(pickle.loads(pickle.dumps(plain)).to_dict(), {"param1": "one"})
+        user_story = UserStory.parse(rm, {"id": 1, "subject": "Story", "status": 2})
+        unpickled = pickle.loads(pickle.dumps(user_story))
+        self.assertIsInstance(unpickled, UserStory)
+        self.assertEqual((unpickled.id, unpickled.subject, unpickled.status), (1, "Story", 2))
+
+    @patch("taiga.requestmaker.RequestMaker.patch")
+    def test_copy_instance(self, mock_requestmaker_patch):
+        mock_requestmaker_patch.return_value = MockResponse(200, json.dumps({"id": 1, "version": 2}))
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fake = Fake(rm, id=1, param1="one", param2="two", created_date="2015-02-10T17:55:05+0000")
+        fake.param1 = "uno"
+        self.assertIsInstance(fake.created_date, datetime.datetime)
+        copy_fake = copy.copy(fake)
+        self.assertIs(copy_fake.requester, rm)
+        copy_fake.param2 = "due"
+        copy_fake.created_date = datetime.datetime(2016, 1, 1, tzinfo=datetime.timezone.utc)
+        self.assertEqual(fake.dirty_fields, {"param1"})
+        self.assertEqual(fake.created_date.year, 2015)
+        fake.save()
+        self.assertEqual(mock_requestmaker_patch.call_args.kwargs["payload"], {"param1": "uno"})
+        self.assertEqual(copy_fake.dirty_fields, {"param1", "param2", "created_date"})
+
+    def test_identity_map(self):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken", identity_map=IdentityMap())
+        fake = Fake.parse(rm, {"id": 1, "param1": "one", "version": 2})
+        self.assertIs(rm.identity_map.get(Fake, 1), fake)
+        self.assertIs(Fake.parse(rm, {"id": 1, "param1": "uno", "param2": "due", "version": 2}), fake)
+        self.assertEqual((fake.param1, fake.param2), ("uno", "due"))
+        self.assertIs(Fake.parse(rm, {"id": 1, "param1": "old", "version": 1}), fake)
+        self.assertEqual(fake.param1, "uno")
+        self.assertIs(Fake.parse(rm, {"id": 1, "param1": "new", "version": 3}), fake)
+        self.assertEqual((fake.param1, fake.version), ("new", 3))
+        fake.param1 = "local"
+        self.assertIs(Fake.parse(rm, {"id": 1, "param1": "new", "param2": "tre", "version": 3}), fake)
+        self.assertEqual((fake.param1, fake.param2, fake.version), ("local", "tre", 3))
+        Fake.parse(rm, {"id": 1, "param1": "newer", "version": 4})
+        self.assertEqual((fake.param1, fake.version), ("local", 3))
+        self.assertEqual(fake.dirty_fields, {"param1"})
+        self.assertIsNot(Fake.parse(rm, {"id": 2}), fake)
+        self.assertIsNot(Fake(rm, id=1), fake)
+
+        other = Fake.parse(rm, {"id": 3, "modified_date": "2015-02-10T17:55:05+0000", "param1": "one"})
+        Fake.parse(rm, {"id": 3, "modified_date": "2015-02-09T17:55:05+0000", "param1": "old"})
+        self.assertEqual(other.param1, "one")
+        Fake.parse(rm, {"id": 3, "modified_date": "2015-02-11T17:55:05+0000", "param1": "new"})
+        self.assertEqual((other.param1, other.modified_date.day), ("new", 11))
+
+        self.assertEqual(len(rm.identity_map), 2)
+        del fake, other
+        gc.collect()
+        self.assertEqual(len(rm.identity_map), 0)
+        self.assertIsNone(rm.identity_map.get(Fake, 1))
+
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_identity_map_on_client(self, mock_requestmaker_get):
+        api = TaigaAPI(token="f4k3", identity_map=True)
+        mock_requestmaker_get.return_value = MockResponse(
+            200, create_mock_json("tests/resources/milestone_details_success.json")
+        )
+        milestone = api.milestones.get(1)
+        story = milestone.user_stories[0]
+        mock_requestmaker_get.return_value = MockResponse(200, json.dumps([{"id": story.id, "version": 2}]))
+        stories = api.user_stories.list()
+        self.assertIs(stories[0], story)
+        self.assertEqual(story.version, 2)
+        self.assertIs(api.raw_request.identity_map, api.identity_map)
+        self.assertIsNone(TaigaAPI(token="f4k3").raw_request.identity_map)
+
+    @patch("taiga.requestmaker.RequestMaker.patch")
+    def test_save_dirty_fields(self, mock_requestmaker_patch):
+        mock_requestmaker_patch.return_value = MockResponse(200, json.dumps({"id": 1, "version": 3}))
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        fake = Fake.parse(rm, {"id": 1, "param1": "one", "param2": "two", "version": 2})
+        self.assertEqual(fake.dirty_fields, frozenset())
+        fake.save()
+        mock_requestmaker_patch.assert_not_called()
+
+        fake.param2 = "new"
+        fake.other = "not allowed"
+        self.assertEqual(fake.dirty_fields, {"param2", "other"})
+        fake.save()
+        mock_requestmaker_patch.assert_called_once_with(
+            "/{endpoint}/{id}", endpoint="fakes", id=1, payload={"param2": "new", "version": 2}
+        )
+        self.assertEqual(fake.version, 3)
+        self.assertEqual(fake.dirty_fields, {"other"})
+        fake.save()
+        self.assertEqual(mock_requestmaker_patch.call_count, 1)
+
+        fake.save(param1="uno")
+        mock_requestmaker_patch.assert_called_with(
+            "/{endpoint}/{id}", endpoint="fakes", id=1, payload={"param1": "uno", "version": 3}
+        )
+
+    @patch("taiga.requestmaker.RequestMaker.put")
+    def test_update_cleans_dirty_fields(self, mock_requestmaker_put):
+        mock_requestmaker_put.return_value = MockResponse(200, json.dumps({"id": 1, "version": 2}))
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken", identity_map=IdentityMap())
+        fake = Fake.parse(rm, {"id": 1, "param1": "one", "version": 1})
+        fake.param1 = "uno"
+        fake.update()
+        self.assertEqual(fake.dirty_fields, frozenset())
+        fake.param1 = "one"
+        fake.param2 = "two"
+        Fake.parse(rm, {"id": 1, "param1": "server", "version": 3})
+        self.assertEqual((fake.param1, fake.version), ("one", 2))
+        self.assertEqual(fake.dirty_fields, {"param1", "param2"})
+
     def test_repr(self):
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
         fake = Fake(rm, id=1, param1="one", param2="two", param3="three")
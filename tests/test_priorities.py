@@ -15,7 +15,7 @@ class TestPriorities(unittest.TestCase):
         Priorities(rm).create(1, "Priority 1")
         mock_new_resource.assert_called_with(payload={"project": 1, "name": "Priority 1"})
 
-    @patch("taiga.requestmaker.requests.delete")
+    @patch("taiga.requestmaker.requests.Session.delete")
     def test_delete_priorities(self, requests_delete):
         rm = RequestMaker(api_path="/api/v1", host="host", token="f4k3")
         requests_delete.return_value = MockResponse(204, "")
@@ -28,7 +28,7 @@ class TestPriorities(unittest.TestCase):
             proxies=None,
         )
 
-    @patch("taiga.requestmaker.requests.delete")
+    @patch("taiga.requestmaker.requests.Session.delete")
     def test_delete_priority(self, requests_delete):
         rm = RequestMaker(api_path="/api/v1", host="host", token="f4k3")
         requests_delete.return_value = MockResponse(204, "")
@@ -3,7 +3,7 @@ from datetime import datetime
 from unittest.mock import patch
 
 from taiga import TaigaAPI
-from taiga.models import Point, Project, Projects, Severity, SwimLane, User, UserStoryStatus
+from taiga.models import Point, Project, Projects, Severity, SwimLane, User, Users, UserStoryStatus
 from taiga.requestmaker import RequestMaker
 
 from .tools import MockResponse, create_mock_json
@@ -25,6 +25,25 @@ class TestProjects(unittest.TestCase):
         self.assertTrue(isinstance(project.us_statuses[0], UserStoryStatus))
         self.assertTrue(isinstance(project.severities[0], Severity))
 
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_single_project_lazy_parsing(self, mock_requestmaker_get):
+        mock_requestmaker_get.return_value = MockResponse(
+            200, create_mock_json("tests/resources/project_details_success.json")
+        )
+        api = TaigaAPI(token="f4k3")
+        project = api.projects.get(1)
+        self.assertIs(type(project.__dict__["members"]), list)
+        self.assertIsInstance(project.__dict__["members"][0], dict)
+        with patch("taiga.models.Users.parse", wraps=Users.parse) as parse:
+            members = project.members
+            self.assertIs(project.members, members)
+            parse.assert_called_once()
+        self.assertIs(project.__dict__["members"], members)
+        self.assertIsInstance(members[0], User)
+        project.members = members[:1]
+        self.assertEqual(len(project.members), 1)
+        self.assertIsInstance(Project(api.raw_request, id=2, milestones=None).milestones, list)
+
     @patch("taiga.requestmaker.RequestMaker.get")
     def test_list_projects_parsing(self, mock_requestmaker_get):
         mock_requestmaker_get.return_value = MockResponse(
@@ -136,14 +155,16 @@ class TestProjects(unittest.TestCase):
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
         project = Project(rm, id=1)
         project.stats()
-        mock_requestmaker_get.assert_called_with("/{endpoint}/{id}/stats", endpoint="projects", id=1)
+        mock_requestmaker_get.assert_called_with("/{endpoint}/{id}/stats", endpoint="projects", id=1, cache=False)
 
     @patch("taiga.requestmaker.RequestMaker.get")
     def test_issues_stats(self, mock_requestmaker_get):
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
         project = Project(rm, id=1)
         project.issues_stats()
-        mock_requestmaker_get.assert_called_with("/{endpoint}/{id}/issues_stats", endpoint="projects", id=1)
+        mock_requestmaker_get.assert_called_with(
+            "/{endpoint}/{id}/issues_stats", endpoint="projects", id=1, cache=False
+        )
 
     @patch("taiga.requestmaker.RequestMaker.post")
     def test_like(self, mock_requestmaker_post):
@@ -375,6 +396,20 @@ class TestProjects(unittest.TestCase):
         project.list_issues()
         mock_list_issues.assert_called_with(project=1)
 
+    @patch("taiga.models.Issues.iter")
+    def test_iter_issues(self, mock_iter_issues):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        project = Project(rm, id=1)
+        project.iter_issues(status=2)
+        mock_iter_issues.assert_called_with(project=1, status=2)
+
+    @patch("taiga.models.Tasks.iter")
+    def test_iter_tasks(self, mock_iter_tasks):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        project = Project(rm, id=1)
+        project.iter_tasks()
+        mock_iter_tasks.assert_called_with(project=1)
+
     @patch("taiga.models.UserStories.create")
     def test_add_userstory(self, mock_new_userstory):
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
@@ -396,6 +431,13 @@ class TestProjects(unittest.TestCase):
         project.list_user_stories()
         mock_list_userstories.assert_called_with(project=1)
 
+    @patch("taiga.models.UserStories.iter")
+    def test_iter_userstories(self, mock_iter_userstories):
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        project = Project(rm, id=1)
+        project.iter_user_stories()
+        mock_iter_userstories.assert_called_with(project=1)
+
     @patch("taiga.models.WikiPages.create")
     def test_add_wikipage(self, mock_new_wikipage):
         rm = RequestMaker("/api/v1", "fakehost", "faketoken")
@@ -1,30 +1,37 @@
+import copy
+import io
+import pickle
+import threading
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import requests
 
 import taiga.exceptions
-from taiga.requestmaker import RequestMaker
+from taiga.models import UserStory
+from taiga.models.base import IdentityMap
+from taiga.requestmaker import Credentials, RateLimiter, RequestMaker, RetryPolicy, TokenBucket
 
 from .tools import MockResponse
 
 
 class TestRequestMaker(unittest.TestCase):
-    @patch("taiga.requestmaker.requests.get")
+    @patch("taiga.requestmaker.requests.Session.get")
     def test_call_requests_get(self, requests_get):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_get.return_value = MockResponse(200, "")
         rm.get("/nowhere")
         self.assertTrue(requests_get.called)
 
-    @patch("taiga.requestmaker.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_call_requests_post(self, requests_post):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_post.return_value = MockResponse(200, "")
         rm.post("/nowhere")
         self.assertTrue(requests_post.called)
 
-    @patch("taiga.requestmaker.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_call_requests_post_with_files(self, requests_post):
         rm = RequestMaker(api_path="/v1/", host="http://host", token="f4k3")
         requests_post.return_value = MockResponse(200, "")
@@ -40,83 +47,360 @@ class TestRequestMaker(unittest.TestCase):
             proxies=None,
         )
 
-    @patch("taiga.requestmaker.requests.put")
+    @patch("taiga.requestmaker.requests.Session.put")
     def test_call_requests_put(self, requests_put):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_put.return_value = MockResponse(200, "")
         rm.put("/nowhere")
         self.assertTrue(requests_put.called)
 
-    @patch("taiga.requestmaker.requests.patch")
+    @patch("taiga.requestmaker.requests.Session.patch")
     def test_call_requests_patch(self, requests_patch):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_patch.return_value = MockResponse(200, "")
         rm.patch("/nowhere")
         self.assertTrue(requests_patch.called)
 
-    @patch("taiga.requestmaker.requests.delete")
+    @patch("taiga.requestmaker.requests.Session.delete")
     def test_call_requests_delete(self, requests_delete):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_delete.return_value = MockResponse(200, "")
         rm.delete("/nowhere")
         self.assertTrue(requests_delete.called)
 
-    @patch("taiga.requestmaker.requests.get")
+    @patch("taiga.requestmaker.requests.Session.get")
     def test_call_requests_get_raise_exception_on_bad_response(self, requests_get):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_get.return_value = MockResponse(400, "")
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.get, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_call_requests_post_raise_exception_on_bad_response(self, requests_post):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_post.return_value = MockResponse(400, "")
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.post, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.put")
+    @patch("taiga.requestmaker.requests.Session.put")
     def test_call_requests_put_raise_exception_on_bad_response(self, requests_put):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_put.return_value = MockResponse(400, "")
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.put, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.patch")
+    @patch("taiga.requestmaker.requests.Session.patch")
     def test_call_requests_patch_raise_exception_on_bad_response(self, requests_patch):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_patch.return_value = MockResponse(400, "")
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.patch, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.delete")
+    @patch("taiga.requestmaker.requests.Session.delete")
     def test_call_requests_delete_raise_exception_on_bad_response(self, requests_delete):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_delete.return_value = MockResponse(400, "")
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.delete, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.get")
+    @patch("taiga.requestmaker.requests.Session.get")
     def test_call_requests_get_raise_exception_on_requests_error(self, requests_get):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_get.side_effect = requests.RequestException()
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.get, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.post")
+    @patch("taiga.requestmaker.requests.Session.post")
     def test_call_requests_post_raise_exception_on_requests_error(self, requests_post):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_post.side_effect = requests.RequestException()
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.post, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.put")
+    @patch("taiga.requestmaker.requests.Session.put")
     def test_call_requests_put_raise_exception_on_requests_error(self, requests_put):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_put.side_effect = requests.RequestException()
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.put, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.patch")
+    @patch("taiga.requestmaker.requests.Session.patch")
     def test_call_requests_patch_raise_exception_on_requests_error(self, requests_patch):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_patch.side_effect = requests.RequestException()
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.patch, "/nowhere")
 
-    @patch("taiga.requestmaker.requests.delete")
+    @patch("taiga.requestmaker.requests.Session.delete")
     def test_call_requests_delete_raise_exception_on_requests_error(self, requests_delete):
         rm = RequestMaker(api_path="/", host="host", token="f4k3")
         requests_delete.side_effect = requests.RequestException()
         self.assertRaises(taiga.exceptions.TaigaRestException, rm.delete, "/nowhere")
+
+    def test_session_pool_configuration(self):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3", pool_connections=3, pool_maxsize=7)
+        adapter = rm.session.get_adapter("https://host")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(rm.session.headers["Connection"], "keep-alive")
+        rm = RequestMaker(api_path="/", host="host", token="f4k3", keep_alive=False)
+        self.assertEqual(rm.session.headers["Connection"], "close")
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_session_reused_between_requests(self, requests_get):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        requests_get.return_value = MockResponse(200, "")
+        session = rm.session
+        rm.get("/nowhere")
+        rm.get("/somewhere")
+        self.assertIs(rm.session, session)
+        self.assertEqual(requests_get.call_count, 2)
+
+    @patch("taiga.requestmaker.requests.Session.close")
+    def test_close_owned_session(self, session_close):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        rm.close()
+        self.assertEqual(session_close.call_count, 1)
+        rm = RequestMaker(api_path="/", host="host", token="f4k3", session=requests.Session())
+        rm.close()
+        self.assertEqual(session_close.call_count, 1)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_call_requests_get_stream(self, requests_get):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        requests_get.return_value = MockResponse(200, "[]")
+        self.assertIs(rm.stream("/{endpoint}", endpoint="nowhere", query={"a": 1}), requests_get.return_value)
+        requests_get.assert_called_once_with(
+            "host//nowhere",
+            headers={
+                "Content-type": "application/json",
+                "Authorization": "Bearer f4k3",
+                "x-disable-pagination": "True",
+            },
+            params={"a": 1},
+            verify=True,
+            proxies=None,
+            stream=True,
+        )
+        requests_get.return_value = MockResponse(400, "")
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.stream, "/nowhere")
+        self.assertTrue(requests_get.return_value.closed)
+
+    def test_set_token(self):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        rm.set_token("n3w")
+        self.assertEqual(rm.headers()["Authorization"], "Bearer n3w")
+        rm.set_token("4pp", "Application")
+        self.assertEqual((rm.token_type, rm.token), ("Application", "4pp"))
+        rm.token = "0ther"
+        self.assertEqual(rm.authorization, "Application 0ther")
+
+    def test_headers_without_lazy_pagination(self):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        self.assertEqual(rm.headers()["x-lazy-pagination"], "True")
+        headers = rm.headers(lazy=False)
+        self.assertNotIn("x-lazy-pagination", headers)
+        self.assertNotIn("x-disable-pagination", headers)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_concurrent_gets_share_request(self, requests_get):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3")
+        release = threading.Event()
+
+        def get(*args, **kwargs):
+            release.wait(5)
+            return MockResponse(200, '{"id": 1}')
+
+        requests_get.side_effect = get
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(rm.get("/nowhere").json())) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        key = rm.cache_key("/nowhere")
+        deadline = time.monotonic() + 5
+        while rm._inflight.get(key, {}).get("followers") != 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(requests_get.call_count, 1)
+        self.assertEqual(results, [{"id": 1}] * 4)
+        rm.get("/nowhere")
+        self.assertEqual(requests_get.call_count, 2)
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_pickle(self, requests_get):
+        requests_get.return_value = MockResponse(200, '{"id": 1}')
+        rm = RequestMaker(
+            api_path="/api/v1/",
+            host="host",
+            token="f4k3",
+            rate_limiter=RateLimiter(rate=10, limits={"POST": (1, 1)}),
+            credentials=Credentials("f4k3", refresh=Mock),
+            identity_map=IdentityMap(),
+        )
+        rm.get("/nowhere", cache=True)
+        user_story = UserStory.parse(rm, {"id": 1, "subject": "Story"})
+        for copied in (pickle.loads(pickle.dumps(user_story)), copy.deepcopy(user_story)):
+            self.assertEqual((copied.id, copied.subject), (1, "Story"))
+            self.assertIsInstance(copied.requester, RequestMaker)
+            self.assertIsNot(copied.requester, rm)
+            self.assertEqual(copied.requester.authorization, "Bearer f4k3")
+            self.assertEqual(copied.requester.get("/nowhere", cache=True).json(), {"id": 1})
+            self.assertEqual(copied.requester.rate_limiter.reserve("POST", "tasks"), 0)
+            self.assertEqual(len(copied.requester.identity_map), 0)
+        self.assertEqual(requests_get.call_count, 1)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_is_retryable(self):
+        policy = RetryPolicy(max_attempts=3)
+        self.assertTrue(policy.is_retryable("GET", 1))
+        self.assertTrue(policy.is_retryable("put", 2, MockResponse(503, "")))
+        self.assertFalse(policy.is_retryable("GET", 3, MockResponse(503, "")))
+        self.assertFalse(policy.is_retryable("GET", 1, MockResponse(404, "")))
+        self.assertFalse(policy.is_retryable("POST", 1, MockResponse(503, "")))
+        self.assertTrue(RetryPolicy(methods=("GET", "POST")).is_retryable("POST", 1, MockResponse(429, "")))
+
+    @patch("random.uniform")
+    def test_delay(self, uniform):
+        uniform.side_effect = lambda low, high: high
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        self.assertEqual([policy.delay(attempt) for attempt in (1, 2, 3, 4)], [1, 2, 4, 5])
+        self.assertEqual(policy.delay(1, MockResponse(429, "", {"Retry-After": "3"})), 3)
+        self.assertEqual(policy.delay(1, MockResponse(429, "", {"Retry-After": "invalid"})), 1)
+        self.assertEqual(policy.delay(1, MockResponse(429, "", {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})), 0)
+
+    def test_retry_after_over_max_backoff(self):
+        policy = RetryPolicy(max_backoff=5)
+        self.assertTrue(policy.is_retryable("GET", 1, MockResponse(429, "", {"Retry-After": "5"})))
+        self.assertFalse(policy.is_retryable("GET", 1, MockResponse(429, "", {"Retry-After": "60"})))
+        self.assertFalse(
+            policy.is_retryable("GET", 1, MockResponse(503, "", {"Retry-After": "Wed, 21 Oct 2099 07:28:00 GMT"}))
+        )
+
+    @patch("time.sleep")
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_retry_get(self, requests_get, sleep):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3", retry=RetryPolicy(max_attempts=3))
+        requests_get.side_effect = [
+            requests.exceptions.ConnectionError(),
+            MockResponse(429, "", {"Retry-After": "2"}),
+            MockResponse(200, "{}"),
+        ]
+        self.assertEqual(rm.get("/nowhere").status_code, 200)
+        self.assertEqual(requests_get.call_count, 3)
+        self.assertEqual(sleep.call_args.args, (2,))
+        requests_get.side_effect = None
+        requests_get.return_value = MockResponse(500, "")
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.get, "/nowhere")
+        self.assertEqual(requests_get.call_count, 6)
+
+    @patch("time.sleep")
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_no_retry_post(self, requests_post, sleep):
+        rm = RequestMaker(api_path="/", host="host", token="f4k3", retry=RetryPolicy(max_attempts=3))
+        requests_post.return_value = MockResponse(500, "")
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.post, "/nowhere")
+        self.assertEqual(requests_post.call_count, 1)
+        rm.retry = RetryPolicy(max_attempts=3, methods=("POST",))
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.post, "/nowhere", files={"file": None})
+        self.assertEqual(requests_post.call_count, 2)
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.post, "/nowhere")
+        self.assertEqual(requests_post.call_count, 5)
+        self.assertFalse(RequestMaker(api_path="/", host="host", token="f4k3").retry.is_retryable("GET", 1))
+
+
+class TestRateLimiter(unittest.TestCase):
+    @patch("time.monotonic")
+    def test_token_bucket(self, monotonic):
+        monotonic.return_value = 0
+        bucket = TokenBucket(2, burst=2)
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0, 0, 0.5, 1])
+        monotonic.return_value = 10
+        self.assertEqual(bucket.reserve(), 0)
+
+    @patch("time.monotonic")
+    def test_limits(self, monotonic):
+        monotonic.return_value = 0
+        limiter = RateLimiter(
+            rate=10, burst=10, limits={"POST": (1, 1), "userstories": (2, 1), "DELETE userstories": (1, 1)}
+        )
+        self.assertEqual(limiter.reserve("GET", "tasks"), 0)
+        self.assertEqual(limiter.reserve("post", "tasks"), 0)
+        self.assertEqual(limiter.reserve("POST", "tasks"), 1)
+        self.assertEqual(limiter.reserve("GET", "userstories"), 0)
+        self.assertEqual(limiter.reserve("GET", "userstories"), 0.5)
+        self.assertEqual(limiter.reserve("DELETE", "userstories"), 1)
+
+    @patch("time.monotonic")
+    def test_limits_on_collection(self, monotonic):
+        monotonic.return_value = 0
+        limiter = RateLimiter(limits={"userstories": (1, 1), "post /tasks/": (1, 1)})
+        self.assertEqual(limiter.reserve("GET", "userstories"), 0)
+        self.assertEqual(limiter.reserve("POST", "userstories/bulk_create"), 1)
+        self.assertEqual(limiter.reserve("GET", "userstories-custom-attributes"), 0)
+        self.assertEqual(limiter.reserve("POST", "tasks/bulk_create"), 0)
+        self.assertEqual(limiter.reserve("post", "tasks"), 1)
+        self.assertEqual(limiter.reserve("GET", "tasks"), 0)
+
+    def test_invalid_limits(self):
+        for key in ("", "/", "FETCH userstories", "POST userstories tasks", "POST /"):
+            with self.assertRaises(ValueError):
+                RateLimiter(limits={key: (1, 1)})
+
+    @patch("time.sleep")
+    @patch("time.monotonic")
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_requests_limited(self, requests_get, monotonic, sleep):
+        monotonic.return_value = 0
+        requests_get.return_value = MockResponse(200, "")
+        limiter = RateLimiter(limits={"userstories": (1, 1)})
+        rm = RequestMaker(api_path="/api/v1/", host="host", token="f4k3", rate_limiter=limiter)
+        rm.get("/{endpoint}/{id}", endpoint="userstories", id=1)
+        rm.get("/{endpoint}", endpoint="tasks")
+        self.assertFalse(sleep.called)
+        rm.get("/{endpoint}", endpoint="userstories", query={"project": 1})
+        sleep.assert_called_once_with(1)
+
+
+class TestCredentials(unittest.TestCase):
+    def test_renew(self):
+        credentials = Credentials("f4k3")
+        self.assertFalse(credentials.renew("Bearer f4k3"))
+        credentials.refresh = lambda: credentials.set("n3w")
+        self.assertTrue(credentials.renew("Bearer f4k3"))
+        credentials.refresh = Mock()
+        self.assertTrue(credentials.renew("Bearer f4k3"))
+        self.assertFalse(credentials.refresh.called)
+        credentials.refresh.side_effect = taiga.exceptions.TaigaRestException("url", 400, "", "POST")
+        self.assertFalse(credentials.renew("Bearer n3w"))
+
+    @patch("taiga.requestmaker.requests.Session.get")
+    def test_replay_on_unauthorized(self, requests_get):
+        refresh = Mock()
+        credentials = Credentials("f4k3", refresh=refresh)
+        refresh.side_effect = lambda: credentials.set("n3w{}".format(refresh.call_count))
+        rm = RequestMaker(api_path="/", host="host", token=None, credentials=credentials)
+        requests_get.side_effect = [MockResponse(401, ""), MockResponse(200, "{}")]
+        self.assertEqual(rm.get("/nowhere").status_code, 200)
+        self.assertEqual(requests_get.call_args.kwargs["headers"]["Authorization"], "Bearer n3w1")
+        requests_get.side_effect = None
+        requests_get.return_value = MockResponse(401, "")
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.get, "/nowhere")
+        self.assertEqual(requests_get.call_count, 4)
+        self.assertEqual(refresh.call_count, 2)
+
+    @patch("taiga.requestmaker.requests.Session.post")
+    def test_replay_upload_on_unauthorized(self, requests_post):
+        credentials = Credentials("f4k3", refresh=lambda: credentials.set("n3w"))
+        rm = RequestMaker(api_path="/", host="host", token=None, credentials=credentials)
+        uploaded = []
+
+        def post(*args, **kwargs):
+            uploaded.append(kwargs["files"]["file"].read())
+            return MockResponse(401 if len(uploaded) == 1 else 200, "{}")
+
+        requests_post.side_effect = post
+        self.assertEqual(rm.post("/nowhere", files={"file": io.BytesIO(b"data")}).status_code, 200)
+        self.assertEqual(uploaded, [b"data", b"data"])
+
+        class Unseekable(io.BytesIO):
+            def seek(self, *args):
+                raise io.UnsupportedOperation()
+
+        credentials.refresh = lambda: credentials.set("n3w2")
+        uploaded.clear()
+        self.assertRaises(taiga.exceptions.TaigaRestException, rm.post, "/nowhere", files={"file": Unseekable(b"x")})
+        self.assertEqual(uploaded, [b"x"])
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import patch
 
@@ -10,6 +11,18 @@ import_open = "builtins.open"
 
 
 class TestTasks(unittest.TestCase):
+    @patch("taiga.requestmaker.RequestMaker.post")
+    def test_bulk_create_tasks(self, mock_requestmaker_post):
+        mock_requestmaker_post.return_value = MockResponse(200, json.dumps([{"id": 1, "subject": "Task"}]))
+        rm = RequestMaker("/api/v1", "fakehost", "faketoken")
+        tasks = Tasks(rm).bulk_create(1, ["Task"], user_story=2, status=3)
+        self.assertIsInstance(tasks[0], Task)
+        mock_requestmaker_post.assert_called_once_with(
+            "/{endpoint}/bulk_create",
+            endpoint="tasks",
+            payload={"project_id": 1, "us_id": 2, "status_id": 3, "bulk_tasks": "Task"},
+        )
+
     @patch("taiga.requestmaker.RequestMaker.get")
     def test_list_attachments(self, mock_requestmaker_get):
         mock_requestmaker_get.return_value = MockResponse(
@@ -1,3 +1,5 @@
+import datetime
+import json
 import unittest
 from unittest.mock import patch
 
@@ -8,6 +10,12 @@ from taiga.requestmaker import RequestMaker
 
 from .tools import MockResponse, create_mock_json
 
+
+def bulk_response(uri, endpoint, payload):
+    subjects = next(value for key, value in payload.items() if key.startswith("bulk_")).split("\n")
+    return MockResponse(200, json.dumps([{"id": index, "subject": subject} for index, subject in enumerate(subjects)]))
+
+
 import_open = "builtins.open"
 
 
@@ -48,6 +56,74 @@ class TestUserStories(unittest.TestCase):
         api.user_stories.list(pagination=False, page=2, page_size=3)
         mock_requestmaker_get.assert_called_with("userstories", query={}, paginate=False)
 
+    @patch("taiga.requestmaker.RequestMaker.get")
+    def test_list_userstories_lookups(self, mock_requestmaker_get):
+        mock_requestmaker_get.return_value = MockResponse(
+            200, create_mock_json("tests/resources/userstories_list_success.json")
+        )
+        api = TaigaAPI(token="f4k3")
+        modified = datetime.datetime(2015, 1, 1, tzinfo=datetime.timezone.utc)
+        stories = api.user_stories.list(
+            pagination=False,
+            project=1,
+            status__in=[116330, 2],
+            tags__contains=["a", "b"],
+            modified_date__gte=modified,
+            milestone__isnull=True,
+            subject__icontains="test",
+        )
+        mock_requestmaker_get.assert_called_with(
+            "userstories",
+            query={
+                "project": 1,
+                "status": "116330,2",
+                "tags": "a,b",
+                "modified_date__gte": "2015-01-01T00:00:00+00:00",
+                "milestone__isnull": "true",
+            },
+            paginate=False,
+        )
+        self.assertEqual(len(stories), 1)
+        self.assertEqual(len(api.user_stories.list(pagination=False, subject__icontains="nothing")), 0)
+        mock_requestmaker_get.assert_called_with("userstories", query={}, paginate=False)
+        stories = api.user_stories.list(pagination=False, finish_date__gte="2020-01-01", assigned_to__isnull=False)
+        mock_requestmaker_get.assert_called_with(
+            "userstories", query={"finish_date__gte": "2020-01-01"}, paginate=False
+        )
+        self.assertEqual(len(stories), 0)
+
+    @patch("taiga.requestmaker.RequestMaker.post")
+    def test_bulk_create_userstories(self, mock_requestmaker_post):
+        mock_requestmaker_post.side_effect = bulk_response
+        api = TaigaAPI(token="f4k3")
+        subjects = ["Story {}".format(index) for index in range(5)]
+        stories = api.user_stories.bulk_create(1, subjects, status=2, chunk_size=2, milestone_id=3)
+        self.assertEqual([story.subject for story in stories], subjects)
+        self.assertTrue(all(isinstance(story, UserStory) for story in stories))
+        self.assertEqual(mock_requestmaker_post.call_count, 3)
+        mock_requestmaker_post.assert_any_call(
+            "/{endpoint}/bulk_create",
+            endpoint="userstories",
+            payload={"project_id": 1, "status_id": 2, "milestone_id": 3, "bulk_stories": "Story 0\nStory 1"},
+        )
+        mock_requestmaker_post.assert_called_with(
+            "/{endpoint}/bulk_create",
+            endpoint="userstories",
+            payload={"project_id": 1, "status_id": 2, "milestone_id": 3, "bulk_stories": "Story 4"},
+        )
+
+        mock_requestmaker_post.reset_mock()
+        subjects = ["Story {}".format(index) for index in range(250)]
+        stories = api.user_stories.bulk_create(1, subjects, max_workers=4)
+        self.assertEqual([story.subject for story in stories], subjects)
+        self.assertEqual(mock_requestmaker_post.call_count, 3)
+        self.assertEqual(len(api.user_stories.bulk_create(1, [])), 0)
+
+    def test_bulk_create_userstories_invalid_subjects(self):
+        api = TaigaAPI(token="f4k3")
+        for subject in ("Two\nlines", " ", None):
+            self.assertRaises(ValueError, api.user_stories.bulk_create, 1, ["Story", subject])
+
     @patch("taiga.requestmaker.RequestMaker.get")
     def test_single_userstory_parsing(self, mock_requestmaker_get):
         mock_requestmaker_get.return_value = MockResponse(
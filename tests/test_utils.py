@@ -0,0 +1,55 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from taiga import utils
+from taiga.requestmaker import CachedResponse
+
+from .tools import MockResponse
+
+
+class TestUtils(unittest.TestCase):
+    def test_urljoin(self):
+        self.assertEqual(utils.urljoin("http://host/", "/api/v1/", "/projects"), "http://host/api/v1/projects")
+
+    def test_copy_json(self):
+        value = {"a": [{"b": 1}]}
+        copy = utils.copy_json(value)
+        self.assertEqual(copy, value)
+        self.assertIsNot(copy["a"][0], value["a"][0])
+
+    def test_json_codec(self):
+        value = {"subject": "àè", "tags": [["a", None]], 1: True}
+        for orjson in (utils.orjson, None):
+            with patch("taiga.utils.orjson", orjson):
+                data = utils.json_dumps(value)
+                self.assertIsInstance(data, bytes)
+                self.assertEqual(json.loads(data), {"subject": "àè", "tags": [["a", None]], "1": True})
+                self.assertEqual(utils.json_loads(data), json.loads(data))
+                self.assertEqual(utils.json_loads(data.decode("utf-8")), json.loads(data))
+                self.assertRaises(ValueError, utils.json_loads, "Not allowed")
+
+    def test_json_response(self):
+        self.assertEqual(utils.json_response(MockResponse(200, '[{"id": 1}]')), [{"id": 1}])
+        self.assertEqual(utils.json_response(CachedResponse(200, {}, {"id": 1})), {"id": 1})
+
+    def test_iter_json_array(self):
+        value = [{"id": 1, "subject": 'à "]" è'}, [1, 2.5, None], 12345, "x"]
+        data = json.dumps(value).encode("utf-8")
+        for size in (1, 3, 64):
+            chunks = [data[start : start + size] for start in range(0, len(data), size)]
+            self.assertEqual(list(utils.iter_json_array(chunks)), value)
+        self.assertEqual(list(utils.iter_json_array([" [ ", "] "])), [])
+        self.assertEqual(list(utils.iter_json_array([b"[1.", b"5]"])), [1.5])
+        self.assertEqual(list(utils.iter_json_array([b"[1, 2e", b"-", b"3, -", b"4]"])), [1, 2e-3, -4])
+        self.assertEqual(list(utils.iter_json_array([b"[12 ", b"]"])), [12])
+        for chunks in ([b'{"id": 1}'], [b"[1, 2"], [b'[{"id":']):
+            with self.assertRaises(ValueError):
+                list(utils.iter_json_array(chunks))
+
+    def test_json_array_decoder(self):
+        decoder = utils.JSONArrayDecoder()
+        self.assertEqual(decoder.feed(b'[{"id": 1}, {"id"'), [{"id": 1}])
+        self.assertEqual(decoder.feed(b": 2}, 3"), [{"id": 2}])
+        self.assertEqual(decoder.feed(b"4]"), [34])
+        self.assertEqual(decoder.feed(b"", final=True), [])
@@ -9,9 +9,34 @@ class MockResponse:
         self.text = text
         self.headers = headers
 
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
     def json(self):
         return json.loads(self.text)
 
+    def iter_content(self, chunk_size=1):
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+
+    async def aiter_bytes(self, chunk_size=1):
+        for chunk in self.iter_content(chunk_size):
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
 
 def create_mock_json(path):
     with open(path) as f: